@@ -1,4 +1,5 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 
 from configs.env import settings_config
@@ -18,3 +19,23 @@ SessionLocal = sessionmaker(
     autoflush=False,
     bind=engine,
 )
+
+# ===== Async stack (opt-in: DB_ASYNC_ENABLED=true) =====
+# Chỉ tạo engine khi bật => không bắt buộc cài asyncpg
+async_engine: AsyncEngine | None = None
+AsyncSessionLocal: async_sessionmaker[AsyncSession] | None = None
+
+if settings.db_async_enabled:
+    async_engine = create_async_engine(
+        settings.async_database_url,
+        echo=False,
+        pool_pre_ping=True,
+        pool_size=settings.pool_size,
+        max_overflow=settings.max_overflow,
+    )
+
+    AsyncSessionLocal = async_sessionmaker(
+        bind=async_engine,
+        autoflush=False,
+        expire_on_commit=False,  # tránh lazy-load ngầm (IO) sau commit trong async
+    )
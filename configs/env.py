@@ -4,9 +4,11 @@ from typing import Any
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field, SecretStr
 
+from configs.settings.audit import AuditWriterMode, AuditWriterSettings
 from configs.settings.cors import CorsSettings
 from configs.settings.security import SecuritySettings, SameSite, JwtSettings, JwtAlgorithm, RefreshCookieSettings, \
-    RefreshSessionSettings, CsrfSettings
+    RefreshSessionSettings, CsrfSettings, AuthzCacheSettings, AuthzInvalidationSettings, AuthzInvalidationBackend, \
+    PasswordHashingSettings, Argon2Settings, Argon2Profile, ARGON2_PROFILES, LoginRateLimitSettings
 from core.audit.audit_mode import AuditMode
 
 
@@ -22,13 +24,23 @@ class Settings(BaseSettings):
     csrf_trusted_origins_raw: str | None = Field(default=None, validation_alias="CSRF_TRUSTED_ORIGINS")
 
     jwt_algorithm: JwtAlgorithm = Field(default="HS256", validation_alias="JWT_ALGORITHM")
-    jwt_secret_key: SecretStr = Field(..., validation_alias="JWT_SECRET_KEY")
+    jwt_secret_key: SecretStr | None = Field(default=None, validation_alias="JWT_SECRET_KEY")
+    jwt_keys_dir: str | None = Field(default=None, validation_alias="JWT_KEYS_DIR")
+    jwks_max_age_seconds: int = Field(default=300, validation_alias="JWKS_MAX_AGE_SECONDS")
     jwt_issuer: str = Field(..., validation_alias="JWT_ISSUER")
     jwt_audience: str = Field(..., validation_alias="JWT_AUDIENCE")
+    jwt_key_id: str | None = Field(default=None, validation_alias="JWT_KEY_ID")
+    # "kid1=key1,kid2=key2" - key cũ chỉ dùng để verify trong thời gian rotate
+    jwt_previous_keys_raw: SecretStr | None = Field(default=None, validation_alias="JWT_PREVIOUS_KEYS")
+    jwt_verify_cache_size: int = Field(default=10_000, validation_alias="JWT_VERIFY_CACHE_SIZE")
+    jwt_embed_authz: bool = Field(default=False, validation_alias="JWT_EMBED_AUTHZ")
+    # Tăng khi đổi role -> permission mapping: access token mang epoch cũ => guards đọc lại DB
+    rbac_epoch: int = Field(default=1, validation_alias="RBAC_EPOCH")
     access_token_expired_minutes: int = Field(default=15, validation_alias="ACCESS_TOKEN_EXPIRED_MINUTES")
     refresh_token_expired_minutes: int = Field(default=20160, validation_alias="REFRESH_SESSION_TTL_MINUTES")
     refresh_token_absolute_expired_minutes: int = Field(default=43200,
                                                         validation_alias="REFRESH_SESSION_ABSOLUTE_TTL_MINUTES")
+    refresh_reuse_history_size: int = Field(default=8, validation_alias="REFRESH_REUSE_HISTORY_SIZE")
     refresh_cookie_secure: bool | None = Field(default=None, validation_alias="REFRESH_COOKIE_SECURE")
     refresh_cookie_samesite: SameSite | None = Field(default=None, validation_alias="REFRESH_COOKIE_SAMESITE")
     refresh_cookie_path: str | None = Field(default=None, validation_alias="REFRESH_COOKIE_PATH")
@@ -36,6 +48,38 @@ class Settings(BaseSettings):
 
     security_audit_mode: AuditMode = Field(default=AuditMode.ON, validation_alias="SECURITY_AUDIT_MODE")
 
+    audit_writer_mode: AuditWriterMode = Field(default="immediate", validation_alias="AUDIT_WRITER_MODE")
+    audit_queue_max_size: int = Field(default=10_000, validation_alias="AUDIT_QUEUE_MAX_SIZE")
+    audit_batch_size: int = Field(default=500, validation_alias="AUDIT_BATCH_SIZE")
+    audit_flush_interval_ms: int = Field(default=200, validation_alias="AUDIT_FLUSH_INTERVAL_MS")
+    audit_writer: AuditWriterSettings | None = Field(default=None)
+
+    authz_cache_enabled: bool = Field(default=True, validation_alias="AUTHZ_CACHE_ENABLED")
+    authz_cache_ttl_seconds: int = Field(default=30, validation_alias="AUTHZ_CACHE_TTL_SECONDS")
+    authz_cache_max_size: int = Field(default=10_000, validation_alias="AUTHZ_CACHE_MAX_SIZE")
+    authz_invalidation_backend: AuthzInvalidationBackend = Field(
+        default="none", validation_alias="AUTHZ_INVALIDATION_BACKEND")
+    authz_invalidation_socket_dir: str | None = Field(default=None, validation_alias="AUTHZ_INVALIDATION_SOCKET_DIR")
+    authz_invalidation_pg_channel: str | None = Field(default=None, validation_alias="AUTHZ_INVALIDATION_PG_CHANNEL")
+    # Khai báo chạy đúng 1 worker process => invalidation local (none / memory) là đủ cho JWT_EMBED_AUTHZ
+    single_worker: bool = Field(default=False, validation_alias="SINGLE_WORKER")
+
+    password_hash_max_concurrency: int = Field(default=4, validation_alias="PASSWORD_HASH_MAX_CONCURRENCY")
+    password_hash_queue_max_size: int = Field(default=32, validation_alias="PASSWORD_HASH_QUEUE_MAX_SIZE")
+    password_hash_wait_timeout_seconds: float = Field(
+        default=5.0, validation_alias="PASSWORD_HASH_WAIT_TIMEOUT_SECONDS")
+    argon2_profile: Argon2Profile = Field(default="default", validation_alias="ARGON2_PROFILE")
+    argon2_time_cost: int | None = Field(default=None, validation_alias="ARGON2_TIME_COST")
+    argon2_memory_cost_kib: int | None = Field(default=None, validation_alias="ARGON2_MEMORY_COST_KIB")
+    argon2_parallelism: int | None = Field(default=None, validation_alias="ARGON2_PARALLELISM")
+    argon2_rehash_on_login: bool = Field(default=True, validation_alias="ARGON2_REHASH_ON_LOGIN")
+
+    login_rate_limit_enabled: bool = Field(default=True, validation_alias="LOGIN_RATE_LIMIT_ENABLED")
+    login_rate_limit_window_seconds: int = Field(default=300, validation_alias="LOGIN_RATE_LIMIT_WINDOW_SECONDS")
+    login_rate_limit_max_per_ip: int = Field(default=50, validation_alias="LOGIN_RATE_LIMIT_MAX_PER_IP")
+    login_rate_limit_max_failures_per_email: int = Field(
+        default=10, validation_alias="LOGIN_RATE_LIMIT_MAX_FAILURES_PER_EMAIL")
+
     security: SecuritySettings | None = Field(default=None)
 
     tz: str = Field(default="UTC", validation_alias="TZ")
@@ -43,6 +87,10 @@ class Settings(BaseSettings):
     pool_size: int = Field(default=10, validation_alias="DB_POOL_SIZE")
     max_overflow: int = Field(default=20, validation_alias="DB_MAX_OVERFLOW")
 
+    # Opt-in async stack (AsyncEngine + async read paths)
+    db_async_enabled: bool = Field(default=False, validation_alias="DB_ASYNC_ENABLED")
+    async_database_url: str | None = Field(default=None, validation_alias="ASYNC_DATABASE_URL")
+
     # Pydantic hook để mapping CORS origins, JWT, refresh session TTL, refresh cookie settings
     def model_post_init(self, __context):
         # Validate & normalize api_prefix
@@ -55,12 +103,23 @@ class Settings(BaseSettings):
         if not self.refresh_cookie_path:
             self.refresh_cookie_path = f"{self.api_prefix}/auth"
 
+        # Derive async driver URL from DATABASE_URL if not provided
+        if self.db_async_enabled:
+            self.async_database_url = self._build_async_database_url()
+
+        # Build audit writer settings
+        self.audit_writer = self._build_audit_writer_settings()
+
         # Build security settings
         jwt_settings = self._build_jwt_settings()
         cors_settings = self._build_cors_settings()
         csrf_settings = self._build_csrf_settings()
         refresh_session_settings = self._build_refresh_session_settings()
         refresh_cookie_settings = self._build_refresh_cookie_settings()
+        authz_cache_settings = self._build_authz_cache_settings()
+        authz_invalidation_settings = self._build_authz_invalidation_settings()
+        password_hashing_settings = self._build_password_hashing_settings()
+        login_rate_limit_settings = self._build_login_rate_limit_settings()
 
         # Compose full SecuritySettings
         self.security = SecuritySettings(
@@ -70,6 +129,42 @@ class Settings(BaseSettings):
             refresh_session=refresh_session_settings,
             refresh_cookie=refresh_cookie_settings,
             audit_mode=self.security_audit_mode,
+            authz_cache=authz_cache_settings,
+            authz_invalidation=authz_invalidation_settings,
+            password_hashing=password_hashing_settings,
+            login_rate_limit=login_rate_limit_settings,
+        )
+
+    def _build_async_database_url(self) -> str:
+        if self.async_database_url:
+            return self.async_database_url.strip()
+
+        url = self.database_url.strip()
+        scheme, sep, rest = url.partition("://")
+        if not sep:
+            raise ValueError(">>>>> Invalid async DB config: DATABASE_URL is not a valid URL")
+
+        dialect = scheme.split("+", 1)[0]
+        if dialect == "postgresql":
+            return f"postgresql+asyncpg://{rest}"
+
+        raise ValueError(
+            ">>>>> Invalid async DB config: cannot derive async driver, set ASYNC_DATABASE_URL explicitly"
+        )
+
+    def _build_audit_writer_settings(self) -> AuditWriterSettings:
+        if self.audit_queue_max_size <= 0:
+            raise ValueError(">>>>> Invalid audit writer config: AUDIT_QUEUE_MAX_SIZE must be > 0")
+        if self.audit_batch_size <= 0:
+            raise ValueError(">>>>> Invalid audit writer config: AUDIT_BATCH_SIZE must be > 0")
+        if self.audit_flush_interval_ms <= 0:
+            raise ValueError(">>>>> Invalid audit writer config: AUDIT_FLUSH_INTERVAL_MS must be > 0")
+
+        return AuditWriterSettings(
+            mode=self.audit_writer_mode,
+            queue_max_size=self.audit_queue_max_size,
+            batch_size=self.audit_batch_size,
+            flush_interval_ms=self.audit_flush_interval_ms,
         )
 
     def _build_cors_settings(self) -> CorsSettings:
@@ -101,25 +196,61 @@ class Settings(BaseSettings):
     def _build_jwt_settings(self) -> JwtSettings:
         issuer = (self.jwt_issuer or "").strip()
         audience = (self.jwt_audience or "").strip()
-        secret = self.jwt_secret_key.get_secret_value().strip()
+        secret = self.jwt_secret_key.get_secret_value().strip() if self.jwt_secret_key else ""
+        keys_dir = (self.jwt_keys_dir or "").strip() or None
 
         if not issuer:
             raise ValueError(">>>>> Invalid JWT config: JWT_ISSUER must not be empty")
         if not audience:
             raise ValueError(">>>>> Invalid JWT config: JWT_AUDIENCE must not be empty")
-        if not secret:
-            raise ValueError(">>>>> Invalid JWT config: JWT_SECRET_KEY must not be empty")
+        if self.jwt_algorithm == "HS256" and keys_dir:
+            raise ValueError(">>>>> Invalid JWT config: JWT_KEYS_DIR requires JWT_ALGORITHM=RS256 or EdDSA")
+        if not secret and not keys_dir:
+            raise ValueError(">>>>> Invalid JWT config: JWT_SECRET_KEY must not be empty (or set JWT_KEYS_DIR)")
+        if self.jwks_max_age_seconds < 0:
+            raise ValueError(">>>>> Invalid JWT config: JWKS_MAX_AGE_SECONDS must be >= 0")
         if self.access_token_expired_minutes <= 0:
             raise ValueError(">>>>> Invalid JWT config: ACCESS_TOKEN_EXPIRED_MINUTES must be > 0")
+        if self.jwt_verify_cache_size < 0:
+            raise ValueError(">>>>> Invalid JWT config: JWT_VERIFY_CACHE_SIZE must be >= 0")
+        if self.rbac_epoch < 1:
+            raise ValueError(">>>>> Invalid JWT config: RBAC_EPOCH must be >= 1")
+
+        key_id = (self.jwt_key_id or "").strip() or None
+        previous_keys = self._parse_jwt_previous_keys()
+        if key_id is not None and key_id in previous_keys:
+            raise ValueError(">>>>> Invalid JWT config: JWT_PREVIOUS_KEYS must not contain JWT_KEY_ID")
 
         return JwtSettings(
             algorithm=self.jwt_algorithm,
-            secret_key=self.jwt_secret_key,
+            secret_key=self.jwt_secret_key if secret else None,
+            keys_dir=keys_dir,
             issuer=issuer,
             audience=audience,
             access_token_ttl_minutes=self.access_token_expired_minutes,
+            key_id=key_id,
+            previous_keys=previous_keys,
+            verify_cache_max_size=self.jwt_verify_cache_size,
+            jwks_max_age_seconds=self.jwks_max_age_seconds,
+            embed_authz=self.jwt_embed_authz,
+            rbac_epoch=self.rbac_epoch,
         )
 
+    def _parse_jwt_previous_keys(self) -> dict[str, SecretStr]:
+        if self.jwt_previous_keys_raw is None:
+            return {}
+
+        keys: dict[str, SecretStr] = {}
+        for item in self.jwt_previous_keys_raw.get_secret_value().split(","):
+            if not item.strip():
+                continue
+            kid, sep, key = item.partition("=")
+            kid, key = kid.strip(), key.strip()
+            if not sep or not kid or not key:
+                raise ValueError(">>>>> Invalid JWT config: JWT_PREVIOUS_KEYS must be 'kid=key,kid=key'")
+            keys[kid] = SecretStr(key)
+        return keys
+
     def _build_refresh_session_settings(self) -> RefreshSessionSettings:
         if self.refresh_token_expired_minutes <= 0:
             raise ValueError(">>>>> Invalid refresh session config: REFRESH_SESSION_TTL_MINUTES must be > 0")
@@ -127,12 +258,15 @@ class Settings(BaseSettings):
             raise ValueError(">>>>> Invalid refresh session config: REFRESH_SESSION_ABSOLUTE_TTL_MINUTES must be > 0")
         if self.refresh_token_absolute_expired_minutes < self.refresh_token_expired_minutes:
             raise ValueError(">>>>> Invalid refresh session config: ABSOLUTE_TTL must be >= TTL (idle timeout)")
+        if self.refresh_reuse_history_size < 0:
+            raise ValueError(">>>>> Invalid refresh session config: REFRESH_REUSE_HISTORY_SIZE must be >= 0")
 
         base = RefreshSessionSettings()
         return base.model_copy(
             update={
                 "ttl_minutes": self.refresh_token_expired_minutes,
                 "absolute_ttl_minutes": self.refresh_token_absolute_expired_minutes,
+                "reuse_history_size": self.refresh_reuse_history_size,
             }
         )
 
@@ -159,6 +293,104 @@ class Settings(BaseSettings):
 
         return cookie
 
+    def _build_authz_cache_settings(self) -> AuthzCacheSettings:
+        if self.authz_cache_ttl_seconds <= 0:
+            raise ValueError(">>>>> Invalid authz cache config: AUTHZ_CACHE_TTL_SECONDS must be > 0")
+        if self.authz_cache_max_size <= 0:
+            raise ValueError(">>>>> Invalid authz cache config: AUTHZ_CACHE_MAX_SIZE must be > 0")
+
+        return AuthzCacheSettings(
+            enabled=self.authz_cache_enabled,
+            ttl_seconds=self.authz_cache_ttl_seconds,
+            max_size=self.authz_cache_max_size,
+        )
+
+    def _build_password_hashing_settings(self) -> PasswordHashingSettings:
+        if self.password_hash_max_concurrency <= 0:
+            raise ValueError(">>>>> Invalid password hashing config: PASSWORD_HASH_MAX_CONCURRENCY must be > 0")
+        if self.password_hash_queue_max_size < 0:
+            raise ValueError(">>>>> Invalid password hashing config: PASSWORD_HASH_QUEUE_MAX_SIZE must be >= 0")
+        if self.password_hash_wait_timeout_seconds <= 0:
+            raise ValueError(">>>>> Invalid password hashing config: PASSWORD_HASH_WAIT_TIMEOUT_SECONDS must be > 0")
+
+        return PasswordHashingSettings(
+            max_concurrency=self.password_hash_max_concurrency,
+            queue_max_size=self.password_hash_queue_max_size,
+            wait_timeout_seconds=self.password_hash_wait_timeout_seconds,
+            argon2=self._build_argon2_settings(),
+        )
+
+    def _build_argon2_settings(self) -> Argon2Settings:
+        time_cost, memory_cost_kib, parallelism = ARGON2_PROFILES.get(self.argon2_profile, (None, None, None))
+
+        # Explicit env override preset
+        if self.argon2_time_cost is not None:
+            time_cost = self.argon2_time_cost
+        if self.argon2_memory_cost_kib is not None:
+            memory_cost_kib = self.argon2_memory_cost_kib
+        if self.argon2_parallelism is not None:
+            parallelism = self.argon2_parallelism
+
+        if self.argon2_profile == "custom" and None in (time_cost, memory_cost_kib, parallelism):
+            raise ValueError(
+                ">>>>> Invalid argon2 config: ARGON2_PROFILE=custom requires "
+                "ARGON2_TIME_COST, ARGON2_MEMORY_COST_KIB, ARGON2_PARALLELISM"
+            )
+        if time_cost is not None and time_cost < 1:
+            raise ValueError(">>>>> Invalid argon2 config: ARGON2_TIME_COST must be >= 1")
+        if parallelism is not None and parallelism < 1:
+            raise ValueError(">>>>> Invalid argon2 config: ARGON2_PARALLELISM must be >= 1")
+        # RFC 9106: memory >= 8 * parallelism KiB
+        if memory_cost_kib is not None and memory_cost_kib < 8 * (parallelism or 4):
+            raise ValueError(">>>>> Invalid argon2 config: ARGON2_MEMORY_COST_KIB must be >= 8 * parallelism")
+
+        return Argon2Settings(
+            profile=self.argon2_profile,
+            time_cost=time_cost,
+            memory_cost_kib=memory_cost_kib,
+            parallelism=parallelism,
+            rehash_on_login=self.argon2_rehash_on_login,
+        )
+
+    def _build_login_rate_limit_settings(self) -> LoginRateLimitSettings:
+        if self.login_rate_limit_window_seconds <= 0:
+            raise ValueError(">>>>> Invalid login rate limit config: LOGIN_RATE_LIMIT_WINDOW_SECONDS must be > 0")
+        if self.login_rate_limit_max_per_ip <= 0:
+            raise ValueError(">>>>> Invalid login rate limit config: LOGIN_RATE_LIMIT_MAX_PER_IP must be > 0")
+        if self.login_rate_limit_max_failures_per_email <= 0:
+            raise ValueError(
+                ">>>>> Invalid login rate limit config: LOGIN_RATE_LIMIT_MAX_FAILURES_PER_EMAIL must be > 0"
+            )
+
+        return LoginRateLimitSettings(
+            enabled=self.login_rate_limit_enabled,
+            window_seconds=self.login_rate_limit_window_seconds,
+            max_attempts_per_ip=self.login_rate_limit_max_per_ip,
+            max_failures_per_email=self.login_rate_limit_max_failures_per_email,
+        )
+
+    def _build_authz_invalidation_settings(self) -> AuthzInvalidationSettings:
+        base = AuthzInvalidationSettings()
+
+        updates: dict[str, Any] = {"backend": self.authz_invalidation_backend}
+        if self.authz_invalidation_socket_dir:
+            updates["socket_dir"] = self.authz_invalidation_socket_dir.strip()
+        if self.authz_invalidation_pg_channel:
+            updates["pg_channel"] = self.authz_invalidation_pg_channel.strip()
+
+        settings = base.model_copy(update=updates)
+        if settings.backend == "postgres" and not self.database_url.startswith("postgresql"):
+            raise ValueError(">>>>> Invalid authz invalidation config: backend=postgres requires a PostgreSQL DATABASE_URL")
+
+        # Embedded authz bỏ qua DB (token_version / is_active) => revoke chỉ đến worker khác qua invalidation channel
+        if self.jwt_embed_authz and settings.backend in ("none", "memory") and not self.single_worker:
+            raise ValueError(
+                ">>>>> Invalid authz config: JWT_EMBED_AUTHZ=true requires a cross-process "
+                "AUTHZ_INVALIDATION_BACKEND (unix_socket | postgres), or SINGLE_WORKER=true"
+            )
+
+        return settings
+
 
 @lru_cache
 def settings_config() -> Settings:
@@ -0,0 +1,21 @@
+from typing import Literal
+from pydantic import BaseModel, ConfigDict, Field
+
+AuditWriterMode = Literal["immediate", "buffered", "background"]
+
+
+class AuditWriterSettings(BaseModel):
+    """
+    Audit writer policy:
+    - immediate: INSERT từng event ngay (add + flush), hành vi cũ
+    - buffered: gom event trong request, 1 multi-row INSERT lúc commit
+    - background: sau commit đẩy event vào bounded queue, worker ghi theo batch (executemany)
+      queue đầy => fallback ghi trong transaction của request (backpressure, không mất event)
+    """
+    model_config = ConfigDict(frozen=True)
+
+    mode: AuditWriterMode = Field(default="immediate")
+    queue_max_size: int = Field(default=10_000)
+    batch_size: int = Field(default=500)
+    flush_interval_ms: int = Field(default=200)
+    shutdown_timeout_seconds: float = Field(default=10.0)
@@ -5,36 +5,62 @@ from configs.settings.cors import CorsSettings
 from core.audit.audit_mode import AuditMode
 
 SameSite = Literal["lax", "strict", "none"]
-JwtAlgorithm = Literal["HS256", "RS256"]
+JwtAlgorithm = Literal["HS256", "RS256", "EdDSA"]
+AuthzInvalidationBackend = Literal["none", "memory", "unix_socket", "postgres"]
+Argon2Profile = Literal["default", "owasp_min", "rfc9106_low_memory", "custom"]
 
 
 class JwtSettings(BaseModel):
     """
     JWT policy:
     - HS256: dùng secret key (internal)
-    - RS256: dùng private/public key (SSO/microservices)
+    - RS256 / EdDSA: dùng private/public key (SSO/microservices), public keys publish qua JWKS
+      - keys_dir: key ring có lịch rotate (keyring.json, xem scripts/generate_jwt_key.py)
+      - không có keys_dir: secret_key là private key PEM
     """
     model_config = ConfigDict(frozen=True)
 
     algorithm: JwtAlgorithm = Field(default="HS256")
-    secret_key: SecretStr = Field(...)
+    secret_key: SecretStr | None = Field(default=None)
+    keys_dir: str | None = Field(default=None)
     issuer: str = Field(...)
     audience: str = Field(...)
 
     access_token_ttl_minutes: int = Field(default=15)
 
+    # Key rotation: token mới ký với key_id (header "kid"), token cũ verify bằng previous_keys[kid]
+    key_id: str | None = Field(default=None)
+    previous_keys: dict[str, SecretStr] = Field(default_factory=dict)
+
+    # LRU token đã verify (key = digest của token, sống tới exp); 0 => tắt
+    verify_cache_max_size: int = Field(default=10_000)
+
+    # Cache-Control max-age của /.well-known/jwks.json (key mới phải publish sớm hơn khoảng này trước activate_at)
+    jwks_max_age_seconds: int = Field(default=300)
+
+    # Nhúng roles + permission bitset vào access token => require_permissions / require_roles không chạm DB
+    # Trade-off: guard tin claims, KHÔNG check token_version / is_active trong DB. Disable user, logout-all,
+    # đổi role chỉ có hiệu lực ở worker khác qua authz invalidation channel (còn lại: tới khi access token hết hạn)
+    # => settings bắt buộc backend cross-process (unix_socket | postgres) trừ khi khai báo SINGLE_WORKER=true
+    # rbac_epoch: tăng khi đổi role -> permission mapping (token epoch cũ => fallback DB snapshot)
+    embed_authz: bool = Field(default=False)
+    rbac_epoch: int = Field(default=1)
+
 
 class RefreshSessionSettings(BaseModel):
     """
     Refresh session policy:
     - TTL tính theo minutes (đồng bộ với env)
     - rotate_on_refresh: luôn rotate để chống replay
+    - reuse_history_size: số token_hash đã rotate giữ lại / session (token family);
+      hash cũ bị dùng lại => revoke cả family. 0 => tắt reuse detection
     """
     model_config = ConfigDict(frozen=True)
 
     ttl_minutes: int = Field(default=60 * 24 * 14)
     absolute_ttl_minutes: int = Field(default=60 * 24 * 30)
     rotate_on_refresh: bool = Field(default=True)
+    reuse_history_size: int = Field(default=8)
 
 
 class RefreshCookieSettings(BaseModel):
@@ -67,6 +93,90 @@ class CsrfSettings(BaseModel):
     trusted_origins: list[str] = Field(default_factory=list)
 
 
+class AuthzCacheSettings(BaseModel):
+    """
+    In-process authz snapshot cache (require_current_user_verified):
+    - ttl_seconds: độ stale tối đa của roles/permissions khi không có invalidation
+    - max_size: số user snapshot tối đa giữ trong RAM (LRU)
+    """
+    model_config = ConfigDict(frozen=True)
+
+    enabled: bool = Field(default=True)
+    ttl_seconds: int = Field(default=30)
+    max_size: int = Field(default=10_000)
+
+
+class AuthzInvalidationSettings(BaseModel):
+    """
+    Cross-process invalidation cho authz cache (multi-worker):
+    - none: 1 worker, chỉ invalidate local
+    - memory: in-process (tests)
+    - unix_socket: nhiều worker trên cùng host (tests / local), qua socket_dir
+    - postgres: LISTEN/NOTIFY trên pg_channel (production)
+    """
+    model_config = ConfigDict(frozen=True)
+
+    backend: AuthzInvalidationBackend = Field(default="none")
+    socket_dir: str = Field(default="/tmp/authz-invalidation")
+    pg_channel: str = Field(default="authz_invalidation")
+
+
+class Argon2Settings(BaseModel):
+    """
+    Argon2id cost parameters (None => default của argon2-cffi: t=3, m=64MiB, p=4):
+    - profile: preset (xem ARGON2_PROFILES), các field explicit override preset
+    - Hash cũ khác params => needs_rehash => tự upgrade khi user login thành công
+    """
+    model_config = ConfigDict(frozen=True)
+
+    profile: Argon2Profile = Field(default="default")
+    time_cost: int | None = Field(default=None)
+    memory_cost_kib: int | None = Field(default=None)
+    parallelism: int | None = Field(default=None)
+    rehash_on_login: bool = Field(default=True)
+
+
+# (time_cost, memory_cost_kib, parallelism)
+ARGON2_PROFILES: dict[str, tuple[int, int, int]] = {
+    # OWASP Password Storage Cheat Sheet - cấu hình tối thiểu (CPU rẻ, RAM thấp)
+    "owasp_min": (2, 19 * 1024, 1),
+    # RFC 9106 - "second recommended option" (memory-constrained)
+    "rfc9106_low_memory": (3, 64 * 1024, 4),
+}
+
+
+class PasswordHashingSettings(BaseModel):
+    """
+    Dedicated executor cho argon2 hash/verify (CPU + RAM nặng, argon2-cffi nhả GIL):
+    - max_concurrency: số hash chạy song song tối đa (~ số core dành cho hashing)
+    - queue_max_size: số request được phép chờ; vượt quá => 429 ngay (load-shedding)
+    - wait_timeout_seconds: chờ lâu hơn => 429 thay vì giữ request thread
+    """
+    model_config = ConfigDict(frozen=True)
+
+    max_concurrency: int = Field(default=4)
+    queue_max_size: int = Field(default=32)
+    wait_timeout_seconds: float = Field(default=5.0)
+
+    argon2: Argon2Settings = Field(default_factory=Argon2Settings)
+
+
+class LoginRateLimitSettings(BaseModel):
+    """
+    Login attempt limiter (sliding window, chặn TRƯỚC khi chạm DB / argon2):
+    - max_attempts_per_ip: mọi attempt từ 1 IP trong window
+    - max_failures_per_email: attempt sai của 1 email (key = sha256(email)), login đúng => reset
+    - max_keys: giới hạn RAM của in-memory store (LRU)
+    """
+    model_config = ConfigDict(frozen=True)
+
+    enabled: bool = Field(default=True)
+    window_seconds: int = Field(default=300)
+    max_attempts_per_ip: int = Field(default=50)
+    max_failures_per_email: int = Field(default=10)
+    max_keys: int = Field(default=100_000)
+
+
 class SecuritySettings(BaseModel):
     """
     Nhóm cấu hình security, có thể mở rộng thêm:
@@ -82,3 +192,7 @@ class SecuritySettings(BaseModel):
     cors: CorsSettings = Field(default_factory=CorsSettings)
     csrf: CsrfSettings = Field(default_factory=CsrfSettings)
     audit_mode: AuditMode = Field(default=AuditMode.ON)
+    authz_cache: AuthzCacheSettings = Field(default_factory=AuthzCacheSettings)
+    authz_invalidation: AuthzInvalidationSettings = Field(default_factory=AuthzInvalidationSettings)
+    password_hashing: PasswordHashingSettings = Field(default_factory=PasswordHashingSettings)
+    login_rate_limit: LoginRateLimitSettings = Field(default_factory=LoginRateLimitSettings)
@@ -0,0 +1,74 @@
+import uuid
+from fastapi import APIRouter, Depends, Security
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.openapi_responses import UNAUTHORIZED_401, NOT_FOUND_404, INTERNAL_500, \
+    BAD_REQUEST_400, FORBIDDEN_403
+from core.responses import success_response
+from core.security.permissions import Permissions
+from dependencies.db import get_async_db
+from dependencies.providers import get_async_user_service
+from schemas.request.user_schema import UserSearchParams
+from schemas.response.base import SuccessResponse
+from schemas.response.user_out_schema import UserOut, UserListOut
+from security.guards import require_permissions_async
+from security.principals import CurrentUser
+from security.schemes import bearer_scheme
+from services.async_user_service import AsyncUserService
+
+# Async read routes (DB_ASYNC_ENABLED=true): include TRƯỚC user_router để match trước route sync cùng path
+async_user_router = APIRouter(
+    dependencies=[Security(bearer_scheme)]
+)
+
+
+@async_user_router.get(
+    "",
+    response_model=SuccessResponse[UserListOut],
+    responses={
+        400: BAD_REQUEST_400,
+        401: UNAUTHORIZED_401,
+        403: FORBIDDEN_403,
+        500: INTERNAL_500,
+    },
+)
+async def search_users(
+        params: UserSearchParams = Depends(),
+        db: AsyncSession = Depends(get_async_db),
+        svc: AsyncUserService = Depends(get_async_user_service),
+        _: CurrentUser = Depends(require_permissions_async(Permissions.USER_READ)),
+) -> SuccessResponse[UserListOut]:
+    """Search users with paging/sort (alive-only, async)"""
+    items, total, meta = await svc.search_users(db, params=params)
+
+    data = UserListOut(
+        items=[UserOut.model_validate(u) for u in items],
+        total=total,
+        page=meta.page,
+        page_size=meta.page_size,
+        total_mode=meta.total_mode,
+        has_next=meta.has_next,
+        next_cursor=meta.next_cursor,
+    )
+    return success_response(data)
+
+
+@async_user_router.get(
+    "/{user_id:uuid}",
+    response_model=SuccessResponse[UserOut],
+    responses={
+        401: UNAUTHORIZED_401,
+        403: FORBIDDEN_403,
+        404: NOT_FOUND_404,
+        500: INTERNAL_500,
+    },
+)
+async def get_user_detail(
+        user_id: uuid.UUID,
+        db: AsyncSession = Depends(get_async_db),
+        svc: AsyncUserService = Depends(get_async_user_service),
+        _: CurrentUser = Depends(require_permissions_async(Permissions.USER_READ)),
+) -> SuccessResponse[UserOut]:
+    """Get active user by id (async)."""
+    u = await svc.get_user_or_404(db, user_id=user_id)
+    return success_response(UserOut.model_validate(u))
@@ -0,0 +1,64 @@
+from fastapi import APIRouter, Depends, Request, Security
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from core.http.export import accepts_gzip, export_response
+from core.openapi_responses import UNAUTHORIZED_401, INTERNAL_500, BAD_REQUEST_400, FORBIDDEN_403, EXPORT_200
+from core.responses import success_response
+from core.security.roles import Roles
+from dependencies.db import get_db
+from dependencies.providers import get_audit_log_service
+from schemas.request.audit_log_schema import AuditLogExportParams, AuditLogSearchParams
+from schemas.response.audit_log_out_schema import AuditLogListOut
+from schemas.response.base import SuccessResponse
+from security.guards import require_roles
+from security.principals import CurrentUser
+from security.schemes import bearer_scheme
+from services.audit_log_service import AuditLogService
+
+audit_log_router = APIRouter(
+    dependencies=[Security(bearer_scheme)]
+)
+
+
+@audit_log_router.get(
+    "",
+    response_model=SuccessResponse[AuditLogListOut],
+    responses={
+        400: BAD_REQUEST_400,
+        401: UNAUTHORIZED_401,
+        403: FORBIDDEN_403,
+        500: INTERNAL_500,
+    },
+)
+def search_audit_logs(
+        params: AuditLogSearchParams = Depends(),
+        db: Session = Depends(get_db),
+        svc: AuditLogService = Depends(get_audit_log_service),
+        _: CurrentUser = Depends(require_roles(Roles.ADMIN)),
+) -> SuccessResponse[AuditLogListOut]:
+    """Search audit logs with paging/sort (ADMIN only)"""
+    return success_response(svc.search(db, params=params))
+
+
+@audit_log_router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={
+        200: EXPORT_200,
+        400: BAD_REQUEST_400,
+        401: UNAUTHORIZED_401,
+        403: FORBIDDEN_403,
+        500: INTERNAL_500,
+    },
+)
+def export_audit_logs(
+        request: Request,
+        params: AuditLogExportParams = Depends(),
+        db: Session = Depends(get_db),
+        svc: AuditLogService = Depends(get_audit_log_service),
+        _: CurrentUser = Depends(require_roles(Roles.ADMIN)),
+) -> StreamingResponse:
+    """Stream audit logs as NDJSON / CSV (ADMIN only) - server-side cursor, RAM không phụ thuộc số row"""
+    export = svc.export(db, params=params)
+    return export_response(export, fmt=params.format, filename="audit-logs", gzip=accepts_gzip(request))
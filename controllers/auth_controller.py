@@ -4,7 +4,7 @@ from sqlalchemy.orm import Session
 
 from core.context.deps import get_request_context
 from core.context.request_context import RequestContext
-from core.openapi_responses import AUTH_COMMON_RESPONSES, AUTHZ_COMMON_RESPONSES
+from core.openapi_responses import AUTH_COMMON_RESPONSES, AUTHZ_COMMON_RESPONSES, TOO_MANY_REQUESTS_429
 from core.responses import success_response
 from dependencies.db import get_db
 from schemas.auth.login_out_schema import LoginResponse
@@ -17,7 +17,7 @@ from security.schemes import bearer_scheme
 from services.auth_service import AuthService, TokenPairOut
 from security.providers import get_auth_service
 from security.principals import CurrentUser
-from security.guards import require_current_user_verified
+from security.guards import require_current_user_fresh
 
 auth_router = APIRouter()
 
@@ -35,7 +35,7 @@ def _to_response(out: TokenPairOut) -> SuccessResponse[LoginResponse]:
 @auth_router.post(
     "/login",
     response_model=SuccessResponse[LoginResponse],
-    responses=AUTH_COMMON_RESPONSES,
+    responses={**AUTH_COMMON_RESPONSES, 429: TOO_MANY_REQUESTS_429},
 )
 def login(
         payload: LoginRequest,
@@ -128,12 +128,12 @@ def logout_all(
         response: Response,
         db: Session = Depends(get_db),
         ctx: RequestContext = Depends(get_request_context),
-        user: CurrentUser = Depends(require_current_user_verified),
+        user: CurrentUser = Depends(require_current_user_fresh),
         svc: AuthService = Depends(get_auth_service),
 ) -> SuccessResponse[LogoutAllResult]:
     """
     Logout all devices:
-    - require verified current user (token_version valid)
+    - require fresh current user (token_version valid, không cần roles/permissions)
     - revoke all refresh sessions for this user
     - clear refresh cookie
     """
@@ -1,8 +1,11 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from core.context.deps import get_request_context
 from core.context.request_context import RequestContext
 from core.utils.datetime_utils import utcnow
+from configs.env import settings_config
 from schemas.common import HealthResponse
+from security.jwt_service import JwtService
+from security.providers import get_jwt_service
 
 health_router = APIRouter()
 
@@ -15,3 +18,33 @@ def health(ctx: RequestContext = Depends(get_request_context)) -> HealthResponse
         request_id=ctx.request_id,
         trace_id=ctx.trace_id,
     )
+
+
+@health_router.get(
+    "/.well-known/jwks.json",
+    response_class=Response,
+    responses={200: {"content": {"application/jwk-set+json": {}}}, 304: {"description": "Not modified"}},
+)
+def jwks(request: Request, jwt_service: JwtService = Depends(get_jwt_service)) -> Response:
+    """
+    Public keys (RS256 / EdDSA) để service khác verify access token local (không cần introspection).
+    - Body + ETag render sẵn theo key set (JwtKeyRing.jwks())
+    - If-None-Match khớp => 304
+    """
+    document = jwt_service.key_ring.jwks()
+    max_age = settings_config().security.jwt.jwks_max_age_seconds
+    headers = {
+        "Cache-Control": f"public, max-age={max_age}, stale-while-revalidate={max_age}",
+        "ETag": document.etag,
+    }
+
+    if _etag_matches(request.headers.get("If-None-Match"), document.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=document.body, media_type="application/jwk-set+json", headers=headers)
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [c.strip().removeprefix("W/") for c in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
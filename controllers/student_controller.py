@@ -1,15 +1,19 @@
-from fastapi import APIRouter, Depends, Request, Response, status
+from fastapi import APIRouter, Depends, File, Query, Request, Response, UploadFile, status
 from fastapi.params import Security
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
-from core.openapi_responses import UNAUTHORIZED_401, INTERNAL_500, AUTH_COMMON_RESPONSES, NOT_FOUND_404, \
-    BAD_REQUEST_400, AUTHZ_COMMON_RESPONSES, CONFLICT_409, FORBIDDEN_403
+from core.http.export import accepts_gzip, export_response
+from core.openapi_responses import UNAUTHORIZED_401, INTERNAL_500, NOT_FOUND_404, \
+    BAD_REQUEST_400, AUTHZ_COMMON_RESPONSES, CONFLICT_409, FORBIDDEN_403, EXPORT_200
+from core.security.permissions import Permissions
+from core.utils.record_readers import RecordFormat
 from core.responses import success_response
 from dependencies.db import get_db
 from schemas.common import EmptyData
-from schemas.request.student_schema import StudentCreate, StudentUpdate
+from schemas.request.student_schema import StudentCreate, StudentExportParams, StudentSearchParams, StudentUpdate
 from schemas.response.base import SuccessResponse
-from schemas.response.student_out_schema import StudentOut
+from schemas.response.student_out_schema import StudentImportOut, StudentListOut, StudentOut
 from security.dependencies import require_current_user
 from security.guards import require_roles, require_permissions
 from security.principals import CurrentUser
@@ -22,20 +26,35 @@ student_router = APIRouter(
 service = StudentService()
 
 
+def _search(db: Session, params: StudentSearchParams) -> StudentListOut:
+    items, total, meta = service.search_students(db, params=params)
+    return StudentListOut(
+        items=[StudentOut.model_validate(s) for s in items],
+        total=total,
+        page=meta.page,
+        page_size=meta.page_size,
+        total_mode=meta.total_mode,
+        has_next=meta.has_next,
+        next_cursor=meta.next_cursor,
+    )
+
+
 @student_router.get(
     "",
-    response_model=SuccessResponse[list[StudentOut]],
-    responses=AUTH_COMMON_RESPONSES,
+    response_model=SuccessResponse[StudentListOut],
+    responses={
+        400: BAD_REQUEST_400,
+        401: UNAUTHORIZED_401,
+        500: INTERNAL_500,
+    },
 )
 def list_students(
-        offset: int = 0,
-        limit: int = 100,
+        params: StudentSearchParams = Depends(),
         db: Session = Depends(get_db),
         _: CurrentUser = Depends(require_current_user),
-) -> SuccessResponse[list[StudentOut]]:
-    students = service.list_students(db, offset=offset, limit=limit)
-    data = [StudentOut.model_validate(student) for student in students]
-    return success_response(data=data)
+) -> SuccessResponse[StudentListOut]:
+    """List students with paging/sort (cùng pipeline với /search)"""
+    return success_response(_search(db, params))
 
 
 @student_router.get(
@@ -58,7 +77,7 @@ def get_student(
 
 @student_router.get(
     "/search",
-    response_model=SuccessResponse[list[StudentOut]],
+    response_model=SuccessResponse[StudentListOut],
     responses={
         400: BAD_REQUEST_400,
         401: UNAUTHORIZED_401,
@@ -66,24 +85,34 @@ def get_student(
     }
 )
 def search_students(
-        keyword: str | None = None,
-        min_age: int | None = None,
-        max_age: int | None = None,
-        offset: int = 0,
-        limit: int = 100,
+        params: StudentSearchParams = Depends(),
         db: Session = Depends(get_db),
         _: CurrentUser = Depends(require_current_user),
-) -> SuccessResponse[list[StudentOut]]:
-    students = service.search_students(
-        db,
-        keyword=keyword,
-        min_age=min_age,
-        max_age=max_age,
-        offset=offset,
-        limit=limit,
-    )
-    data = [StudentOut.model_validate(s) for s in students]
-    return success_response(data)
+) -> SuccessResponse[StudentListOut]:
+    """Search students (keyword / age range) with paging/sort"""
+    return success_response(_search(db, params))
+
+
+@student_router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={
+        200: EXPORT_200,
+        400: BAD_REQUEST_400,
+        401: UNAUTHORIZED_401,
+        403: FORBIDDEN_403,
+        500: INTERNAL_500,
+    }
+)
+def export_students(
+        request: Request,
+        params: StudentExportParams = Depends(),
+        db: Session = Depends(get_db),
+        _: CurrentUser = Depends(require_permissions(Permissions.STUDENT_READ)),
+) -> StreamingResponse:
+    """Stream students as NDJSON / CSV - server-side cursor, RAM không phụ thuộc số row"""
+    export = service.export_students(db, params=params)
+    return export_response(export, fmt=params.format, filename="students", gzip=accepts_gzip(request))
 
 
 @student_router.post(
@@ -117,6 +146,38 @@ def create_student(
     )
 
 
+@student_router.post(
+    "/import",
+    response_model=SuccessResponse[StudentImportOut],
+    responses={
+        400: BAD_REQUEST_400,
+        401: UNAUTHORIZED_401,
+        403: FORBIDDEN_403,
+        500: INTERNAL_500,
+    },
+)
+def import_students(
+        file: UploadFile = File(..., description="CSV (header: full_name,age,email) hoặc NDJSON (1 object / dòng)"),
+        format: RecordFormat | None = Query(default=None, description="Mặc định: theo đuôi file / content-type"),
+        dry_run: bool = Query(default=False, description="Chỉ validate + kiểm tra trùng email, không insert"),
+        db: Session = Depends(get_db),
+        _: CurrentUser = Depends(require_permissions(Permissions.STUDENT_WRITE)),
+) -> SuccessResponse[StudentImportOut]:
+    """Bulk import students - row lỗi không chặn row hợp lệ, trả report lỗi theo dòng"""
+    report = service.import_students(
+        db,
+        file.file,
+        fmt=format,
+        filename=file.filename,
+        content_type=file.content_type,
+        dry_run=dry_run,
+    )
+    return success_response(
+        report,
+        message=f"Imported {report.inserted}/{report.total_rows} students",
+    )
+
+
 @student_router.patch(
     "/{student_id}",
     response_model=SuccessResponse[StudentOut],
@@ -155,3 +216,4 @@ def delete_student(
 ) -> SuccessResponse[EmptyData]:
     service.delete_student(db, student_id)
     return success_response(EmptyData(), message="Student deleted")
+
@@ -1,21 +1,24 @@
 import uuid
-from fastapi import APIRouter, Depends, status, Security
+from fastapi import APIRouter, Depends, Request, status, Security
 from fastapi.params import Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from core.context.deps import get_request_context
 from core.context.request_context import RequestContext
+from core.exceptions.auth_exceptions import ForbiddenException
+from core.http.export import accepts_gzip, export_response
 from core.openapi_responses import UNAUTHORIZED_401, NOT_FOUND_404, INTERNAL_500, \
-    BAD_REQUEST_400, FORBIDDEN_403, CONFLICT_409
+    BAD_REQUEST_400, FORBIDDEN_403, CONFLICT_409, TOO_MANY_REQUESTS_429, EXPORT_200
 from core.responses import success_response
 from core.security.permissions import Permissions
 from core.security.roles import Roles
 from dependencies.db import get_db
 from dependencies.providers import get_user_service
 from schemas.common import EmptyData
-from schemas.request.user_schema import UserCreate, UserSearchParams, UserUpdate
+from schemas.request.user_schema import UserBatchCreate, UserCreate, UserExportParams, UserSearchParams, UserUpdate
 from schemas.response.base import SuccessResponse
-from schemas.response.user_out_schema import UserOut, UserListOut
+from schemas.response.user_out_schema import UserBatchOut, UserOut, UserListOut
 from security.guards import require_permissions, require_roles
 from security.principals import CurrentUser
 from security.schemes import bearer_scheme
@@ -50,12 +53,38 @@ def search_users(
         total=total,
         page=getattr(meta, "page", getattr(params, "page", 1)),
         page_size=getattr(meta, "page_size", getattr(params, "page_size", 20)),
+        total_mode=getattr(meta, "total_mode", "exact"),
+        has_next=getattr(meta, "has_next", None),
+        next_cursor=getattr(meta, "next_cursor", None),
     )
     return success_response(data)
 
 
 @user_router.get(
-    "/{user_id}",
+    "/export",
+    response_class=StreamingResponse,
+    responses={
+        200: EXPORT_200,
+        400: BAD_REQUEST_400,
+        401: UNAUTHORIZED_401,
+        403: FORBIDDEN_403,
+        500: INTERNAL_500,
+    },
+)
+def export_users(
+        request: Request,
+        params: UserExportParams = Depends(),
+        db: Session = Depends(get_db),
+        svc: UserService = Depends(get_user_service),
+        _: CurrentUser = Depends(require_permissions(Permissions.USER_READ)),
+) -> StreamingResponse:
+    """Stream users (alive-only) as NDJSON / CSV - server-side cursor, RAM không phụ thuộc số row"""
+    export = svc.export_users(db, params=params)
+    return export_response(export, fmt=params.format, filename="users", gzip=accepts_gzip(request))
+
+
+@user_router.get(
+    "/{user_id:uuid}",
     response_model=SuccessResponse[UserOut],
     responses={
         401: UNAUTHORIZED_401,
@@ -84,6 +113,7 @@ def get_user_detail(
         401: UNAUTHORIZED_401,
         403: FORBIDDEN_403,
         409: CONFLICT_409,
+        429: TOO_MANY_REQUESTS_429,
         500: INTERNAL_500,
     },
 )
@@ -103,8 +133,39 @@ def create_user(
     )
 
 
+@user_router.post(
+    ":batch",
+    response_model=SuccessResponse[UserBatchOut],
+    responses={
+        400: BAD_REQUEST_400,
+        401: UNAUTHORIZED_401,
+        403: FORBIDDEN_403,
+        429: TOO_MANY_REQUESTS_429,
+        500: INTERNAL_500,
+    },
+)
+def create_users_batch(
+        data: UserBatchCreate,
+        ctx: RequestContext = Depends(get_request_context),
+        db: Session = Depends(get_db),
+        svc: UserService = Depends(get_user_service),
+        _: CurrentUser = Depends(require_roles(Roles.ADMIN, Roles.HR_MANAGER)),
+        principal: CurrentUser = Depends(require_permissions(Permissions.USER_WRITE)),
+) -> SuccessResponse[UserBatchOut]:
+    """
+    Bulk create users (tối đa UserBatchCreate.MAX_ITEMS item, audited logging):
+    - item lỗi (email trùng / đã tồn tại, role không tồn tại) không chặn item khác => errors theo index
+    - gán roles cần thêm permission user:assign_role
+    """
+    if any(item.roles for item in data.items) and Permissions.USER_ASSIGN_ROLE not in principal.permissions:
+        raise ForbiddenException(required=[Permissions.USER_ASSIGN_ROLE.value])
+
+    result = svc.create_users_batch(db, data=data, ctx=ctx)
+    return success_response(result, message="Users provisioned")
+
+
 @user_router.patch(
-    "/{user_id}",
+    "/{user_id:uuid}",
     response_model=SuccessResponse[UserOut],
     responses={
         400: BAD_REQUEST_400,
@@ -112,6 +173,7 @@ def create_user(
         403: FORBIDDEN_403,
         404: NOT_FOUND_404,
         409: CONFLICT_409,
+        429: TOO_MANY_REQUESTS_429,
         500: INTERNAL_500,
     },
 )
@@ -140,7 +202,7 @@ def update_user(
 
 
 @user_router.delete(
-    "/{user_id}",
+    "/{user_id:uuid}",
     response_model=SuccessResponse[EmptyData],
     responses={
         400: BAD_REQUEST_400,
@@ -14,6 +14,7 @@ class AuditAction(StrEnum):
     AUTH_LOGIN_FAILED = "AUTH_LOGIN_FAILED"
     AUTH_LOGOUT = "AUTH_LOGOUT"
     AUTH_REFRESH_FAILED = "AUTH_REFRESH_FAILED"
+    AUTH_REFRESH_TOKEN_REUSE = "AUTH_REFRESH_TOKEN_REUSE"
     AUTH_REVOKE_ALL_SESSIONS = "AUTH_REVOKE_ALL_SESSIONS"
     AUTH_ROTATE_REFRESH = "AUTH_ROTATE_REFRESH"
 
@@ -0,0 +1,265 @@
+import logging
+import queue
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, sessionmaker
+
+from configs.settings.audit import AuditWriterSettings
+from core.utils.session_utils import mark_session_written
+from models.audit_log import AuditLog
+from repositories.audit_log_repository import AuditLogRepository
+
+logger = logging.getLogger(__name__)
+
+# Column values của 1 audit event (đã sanitize) - insert thẳng, không qua ORM object
+AuditRow = dict[str, Any]
+
+
+class AuditWriter(ABC):
+    """
+    Chiến lược ghi audit event (AuditLogService quyết định ghi gì, writer quyết định ghi thế nào).
+    Mọi writer đều gắn với transaction của request: rollback => không ghi event.
+    """
+
+    def start(self) -> None:
+        return None
+
+    def stop(self) -> None:
+        return None
+
+    @abstractmethod
+    def write(self, db: Session, row: AuditRow) -> AuditLog | None:
+        raise NotImplementedError
+
+    def write_many(self, db: Session, rows: list[AuditRow]) -> int:
+        # Mặc định: từng event; writer có thể gộp thành 1 multi-row INSERT
+        for row in rows:
+            self.write(db, row)
+        return len(rows)
+
+
+class ImmediateAuditWriter(AuditWriter):
+    """
+    Hành vi cũ: add + flush + refresh từng event (trả về AuditLog đã có id)
+    """
+
+    def __init__(self, repo: AuditLogRepository):
+        self.repo = repo
+
+    def write(self, db: Session, row: AuditRow) -> AuditLog | None:
+        return self.repo.create_event(db, event=AuditLog(**row))
+
+    def write_many(self, db: Session, rows: list[AuditRow]) -> int:
+        # Batch: 1 executemany, không refresh từng row
+        return self.repo.insert_many(db, rows=rows)
+
+
+class BufferedAuditWriter(AuditWriter):
+    """
+    Gom event trong session.info, ghi 1 multi-row INSERT ở before_commit:
+    - N event / request => 1 round-trip (thay vì 2N: INSERT + SELECT refresh)
+    - rollback => buffer bị bỏ
+    """
+
+    _BUFFER_KEY = "audit_buffer"
+    _LISTENING_KEY = "audit_buffer_listening"
+
+    def __init__(self, repo: AuditLogRepository):
+        self.repo = repo
+
+    def write(self, db: Session, row: AuditRow) -> AuditLog | None:
+        self._ensure_listeners(db)
+        db.info.setdefault(self._BUFFER_KEY, []).append(row)
+        # Request có thể read-only ngoài audit => đảm bảo middleware COMMIT
+        mark_session_written(db)
+        return None
+
+    def write_many(self, db: Session, rows: list[AuditRow]) -> int:
+        if not rows:
+            return 0
+        self._ensure_listeners(db)
+        db.info.setdefault(self._BUFFER_KEY, []).extend(rows)
+        mark_session_written(db)
+        return len(rows)
+
+    def flush(self, db: Session) -> int:
+        rows = db.info.pop(self._BUFFER_KEY, None)
+        if not rows:
+            return 0
+        return self.repo.insert_many(db, rows=rows)
+
+    def _ensure_listeners(self, db: Session) -> None:
+        if db.info.get(self._LISTENING_KEY):
+            return
+        event.listen(db, "before_commit", self.flush)
+        event.listen(db, "after_rollback", lambda s: s.info.pop(self._BUFFER_KEY, None))
+        db.info[self._LISTENING_KEY] = True
+
+
+@dataclass
+class AuditWriterMetrics:
+    enqueued: int = 0
+    written: int = 0
+    batches: int = 0
+    # backpressure: queue đầy => ghi đồng bộ trong request
+    fallback_in_request: int = 0
+    # queue đầy ngay sau commit => ghi đồng bộ bằng connection riêng
+    fallback_after_commit: int = 0
+    failed: int = 0
+    queue_high_water: int = 0
+
+
+class BackgroundAuditWriter(AuditWriter):
+    """
+    Batch audit event giữa nhiều request:
+    - write(): giữ event trong session.info, chỉ enqueue SAU khi commit thành công
+    - worker thread: gom tối đa batch_size event / flush_interval, 1 executemany / batch
+    - Backpressure: queue gần đầy => fallback ghi trong transaction request (BufferedAuditWriter)
+    - stop(): drain queue trước khi tắt (flush-on-shutdown)
+
+    Lưu ý: event đã enqueue nhưng process bị kill (SIGKILL) trước khi flush sẽ mất.
+    Dùng mode buffered nếu cần durability tuyệt đối cùng transaction.
+    """
+
+    _PENDING_KEY = "audit_pending"
+    _LISTENING_KEY = "audit_pending_listening"
+    _MAX_RETRIES = 3
+
+    def __init__(
+            self,
+            *,
+            repo: AuditLogRepository,
+            session_factory: sessionmaker,
+            settings: AuditWriterSettings,
+    ):
+        self.repo = repo
+        self.session_factory = session_factory
+        self.settings = settings
+        self.metrics = AuditWriterMetrics()
+
+        self._queue: queue.Queue[AuditRow] = queue.Queue(maxsize=settings.queue_max_size)
+        self._fallback = BufferedAuditWriter(repo)
+        self._metrics_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._stopping = threading.Event()
+
+    # ===== Lifecycle =====
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stopping.set()
+        self._thread.join(timeout=self.settings.shutdown_timeout_seconds)
+        self._thread = None
+
+        # Worker không kịp drain => ghi nốt đồng bộ
+        remaining = self._drain(self.settings.queue_max_size)
+        if remaining:
+            self._write_batch(remaining)
+        logger.info("audit_writer.stopped", extra={"metrics": asdict(self.metrics)})
+
+    # ===== Write =====
+    def write(self, db: Session, row: AuditRow) -> AuditLog | None:
+        if self._thread is None or self._queue.qsize() >= self.settings.queue_max_size:
+            self._incr("fallback_in_request")
+            return self._fallback.write(db, row)
+
+        self._ensure_listeners(db)
+        db.info.setdefault(self._PENDING_KEY, []).append(row)
+        # Cần COMMIT thật để after_commit bắn (request có thể read-only ngoài audit)
+        mark_session_written(db)
+        return None
+
+    def write_many(self, db: Session, rows: list[AuditRow]) -> int:
+        if not rows:
+            return 0
+        # Batch lớn không vừa queue => ghi cả batch trong transaction request (không tách đôi)
+        if self._thread is None or self._queue.qsize() + len(rows) > self.settings.queue_max_size:
+            self._incr("fallback_in_request", len(rows))
+            return self._fallback.write_many(db, rows)
+
+        self._ensure_listeners(db)
+        db.info.setdefault(self._PENDING_KEY, []).extend(rows)
+        mark_session_written(db)
+        return len(rows)
+
+    def _ensure_listeners(self, db: Session) -> None:
+        if db.info.get(self._LISTENING_KEY):
+            return
+        event.listen(db, "after_commit", self._enqueue_committed)
+        event.listen(db, "after_rollback", lambda s: s.info.pop(self._PENDING_KEY, None))
+        db.info[self._LISTENING_KEY] = True
+
+    def _enqueue_committed(self, db: Session) -> None:
+        rows = db.info.pop(self._PENDING_KEY, None)
+        if not rows:
+            return
+
+        overflow: list[AuditRow] = []
+        for row in rows:
+            try:
+                self._queue.put_nowait(row)
+            except queue.Full:
+                overflow.append(row)
+
+        with self._metrics_lock:
+            self.metrics.enqueued += len(rows) - len(overflow)
+            self.metrics.queue_high_water = max(self.metrics.queue_high_water, self._queue.qsize())
+
+        if overflow:
+            # Transaction request đã commit => ghi bằng session riêng, không được làm mất event
+            self._incr("fallback_after_commit", len(overflow))
+            logger.warning("audit_writer.queue_full", extra={"overflow": len(overflow)})
+            self._write_batch(overflow)
+
+    # ===== Worker =====
+    def _run(self) -> None:
+        interval = self.settings.flush_interval_ms / 1000.0
+        while not self._stopping.is_set() or not self._queue.empty():
+            try:
+                first = self._queue.get(timeout=interval)
+            except queue.Empty:
+                continue
+
+            batch = [first, *self._drain(self.settings.batch_size - 1)]
+            self._write_batch(batch)
+
+    def _drain(self, limit: int) -> list[AuditRow]:
+        rows: list[AuditRow] = []
+        while len(rows) < limit:
+            try:
+                rows.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return rows
+
+    def _write_batch(self, rows: list[AuditRow]) -> None:
+        for attempt in range(1, self._MAX_RETRIES + 1):
+            try:
+                with self.session_factory() as db:
+                    self.repo.insert_many(db, rows=rows)
+                    db.commit()
+                with self._metrics_lock:
+                    self.metrics.written += len(rows)
+                    self.metrics.batches += 1
+                return
+            except Exception:
+                logger.exception("audit_writer.batch_failed", extra={"attempt": attempt, "size": len(rows)})
+                time.sleep(min(0.1 * (2 ** attempt), 2.0))
+
+        self._incr("failed", len(rows))
+
+    def _incr(self, name: str, n: int = 1) -> None:
+        with self._metrics_lock:
+            setattr(self.metrics, name, getattr(self.metrics, name) + n)
@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, Mapping
 from models.user import User
 from core.utils.json_utils import to_json_safe
 
@@ -20,11 +20,18 @@ USER_AUDIT_FIELDS = (
 )
 
 def snapshot_user(user: User) -> dict[str, Any]:
+    return snapshot_user_values({f: getattr(user, f) for f in USER_AUDIT_FIELDS if hasattr(user, f)})
+
+
+def snapshot_user_values(values: Mapping[str, Any]) -> dict[str, Any]:
+    """
+    Snapshot từ column values (bulk insert, không có ORM object) - cùng allowlist với snapshot_user
+    """
     data: dict[str, Any] = {}
 
     for f in USER_AUDIT_FIELDS:
-        if hasattr(user, f):
-            data[f] = to_json_safe(getattr(user, f))
+        if f in values:
+            data[f] = to_json_safe(values[f])
 
     # normalize id to str
     if "id" in data and data["id"] is not None:
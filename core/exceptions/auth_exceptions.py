@@ -77,3 +77,33 @@ class ForbiddenException(BusinessException):
             status_code=HTTPStatus.FORBIDDEN,
             extra={"required_permissions": required or []},
         )
+
+
+class PasswordHashingBusyException(BusinessException):
+    """
+    429 - Password hashing executor đã đầy (load-shedding), client retry sau.
+    """
+
+    def __init__(self, *, retry_after_seconds: int = 1):
+        super().__init__(
+            message="Too many concurrent authentication requests, please retry later",
+            error_code="AUTH_PASSWORD_HASHING_BUSY",
+            status_code=HTTPStatus.TOO_MANY_REQUESTS,
+            extra={"retry_after_seconds": retry_after_seconds},
+            headers={"Retry-After": str(retry_after_seconds)},
+        )
+
+
+class LoginRateLimitedException(BusinessException):
+    """
+    429 - Quá nhiều login attempt (theo IP hoặc email) trong sliding window.
+    """
+
+    def __init__(self, *, scope: str, retry_after_seconds: int):
+        super().__init__(
+            message="Too many login attempts, please retry later",
+            error_code="AUTH_LOGIN_RATE_LIMITED",
+            status_code=HTTPStatus.TOO_MANY_REQUESTS,
+            extra={"scope": scope, "retry_after_seconds": retry_after_seconds},
+            headers={"Retry-After": str(retry_after_seconds)},
+        )
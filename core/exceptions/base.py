@@ -10,9 +10,12 @@ class BusinessException(Exception):
         error_code: str,
         status_code: int = 400,
         extra: dict | None = None,
+        headers: dict[str, str] | None = None,
     ):
         self.message = message
         self.error_code = error_code
         self.status_code = status_code
         self.extra = extra or {}
+        # Response headers bổ sung (vd: Retry-After cho 429)
+        self.headers = headers
         super().__init__(message)
@@ -27,6 +27,7 @@ def business_exception_handler(
     return JSONResponse(
         status_code=exc.status_code,
         content=body.model_dump(mode="json"),
+        headers=exc.headers,
     )
 
 
@@ -0,0 +1,47 @@
+from http import HTTPStatus
+
+from core.exceptions.base import BusinessException
+
+
+class InvalidCursorException(BusinessException):
+    """
+    400 - Cursor không decode được hoặc không khớp sort hiện tại.
+    """
+
+    def __init__(self, *, reason: str):
+        super().__init__(
+            message="Invalid pagination cursor",
+            error_code="INVALID_CURSOR",
+            status_code=HTTPStatus.BAD_REQUEST,
+            extra={"reason": reason},
+        )
+
+
+class InvalidPageSizeException(BusinessException):
+    """
+    400 - page_size vượt giới hạn của endpoint.
+    """
+
+    def __init__(self, *, page_size: int, max_page_size: int):
+        super().__init__(
+            message=f"page_size must be <= {max_page_size}",
+            error_code="INVALID_PAGE_SIZE",
+            status_code=HTTPStatus.BAD_REQUEST,
+            extra={"page_size": page_size, "max_page_size": max_page_size},
+        )
+
+
+class InvalidSortException(BusinessException):
+    """
+    400 - Sort spec hợp lệ về cú pháp nhưng không dùng được với params hiện tại
+    (vd: sort=relevance thiếu keyword / cursor paging).
+    Raise trong validator của Depends() model => không bị wrap thành ValidationError (500).
+    """
+
+    def __init__(self, *, reason: str):
+        super().__init__(
+            message="Invalid sort",
+            error_code="INVALID_SORT",
+            status_code=HTTPStatus.BAD_REQUEST,
+            extra={"reason": reason},
+        )
@@ -44,3 +44,13 @@ class InvalidStudentAgeException(BusinessException):
             status_code=HTTPStatus.BAD_REQUEST,
             extra={"age": age},
         )
+
+
+class InvalidStudentImportFileException(BusinessException):
+    def __init__(self, reason: str):
+        super().__init__(
+            message=f"Invalid import file: {reason}",
+            error_code="INVALID_STUDENT_IMPORT_FILE",
+            status_code=HTTPStatus.BAD_REQUEST,
+            extra={"reason": reason},
+        )
@@ -61,3 +61,13 @@ class UserUpdateSelfForbiddenException(BusinessException):
             status_code=403,
             extra={"user_id": str(user_id)} if user_id is not None else None,
         )
+
+
+class RoleNotFoundException(BusinessException):
+    def __init__(self, *, roles: list[str]):
+        super().__init__(
+            error_code="ROLE_NOT_FOUND",
+            message=f"Role not found: {', '.join(roles)}",
+            status_code=404,
+            extra={"roles": roles},
+        )
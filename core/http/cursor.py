@@ -0,0 +1,92 @@
+import base64
+import binascii
+import json
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Sequence
+
+from core.exceptions.pagination_exceptions import InvalidCursorException
+
+# Giới hạn kích thước cursor từ client (tránh payload lớn)
+MAX_CURSOR_LENGTH = 1024
+
+
+def sort_signature(keys: Sequence[tuple[str, bool]]) -> str:
+    """
+    Chữ ký của sort key: "created_at:d,id:d"
+    => cursor tạo với sort khác sẽ bị từ chối thay vì trả kết quả sai
+    """
+    return ",".join(f"{field}:{'d' if desc else 'a'}" for field, desc in keys)
+
+
+def encode_cursor(*, signature: str, values: Sequence[Any]) -> str:
+    """
+    Encode sort key tuple của row cuối thành token opaque (base64url JSON).
+    Opaque nhưng KHÔNG bí mật: client sửa cursor chỉ đổi điểm bắt đầu, filters vẫn áp dụng.
+    """
+    payload = {"s": signature, "v": [_encode_value(v) for v in values]}
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(token: str, *, signature: str) -> list[Any]:
+    if len(token) > MAX_CURSOR_LENGTH:
+        raise InvalidCursorException(reason="too_long")
+
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        values = [_decode_value(v) for v in payload["v"]]
+        token_signature = payload["s"]
+    except (binascii.Error, UnicodeError, ValueError, TypeError, KeyError, ArithmeticError):
+        raise InvalidCursorException(reason="malformed")
+
+    if token_signature != signature:
+        raise InvalidCursorException(reason="sort_mismatch")
+    return values
+
+
+# ===== Private helpers =====
+def _encode_value(v: Any) -> list[Any]:
+    # Tag kiểu để decode lại đúng type khi so sánh với column
+    if v is None:
+        return ["n", None]
+    if isinstance(v, bool):
+        return ["b", v]
+    if isinstance(v, int):
+        return ["i", v]
+    if isinstance(v, float):
+        return ["f", v]
+    if isinstance(v, Decimal):
+        return ["dec", str(v)]
+    if isinstance(v, datetime):
+        return ["dt", v.isoformat()]
+    if isinstance(v, date):
+        return ["d", v.isoformat()]
+    if isinstance(v, uuid.UUID):
+        return ["u", str(v)]
+    return ["s", str(v)]
+
+
+def _decode_value(item: Any) -> Any:
+    tag, raw = item
+    if tag == "n":
+        return None
+    if tag == "b":
+        return bool(raw)
+    if tag == "i":
+        return int(raw)
+    if tag == "f":
+        return float(raw)
+    if tag == "dec":
+        return Decimal(raw)
+    if tag == "dt":
+        return datetime.fromisoformat(raw)
+    if tag == "d":
+        return date.fromisoformat(raw)
+    if tag == "u":
+        return uuid.UUID(raw)
+    if tag == "s":
+        return str(raw)
+    raise ValueError(f"unknown cursor value tag: {tag!r}")
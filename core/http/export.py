@@ -0,0 +1,159 @@
+import csv
+import io
+import json
+import logging
+import zlib
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from typing import Any, Iterable, Iterator, Literal, Mapping, Sequence
+
+from starlette.requests import Request
+from starlette.responses import StreamingResponse
+
+from core.utils.json_utils import to_json_safe
+
+logger = logging.getLogger(__name__)
+
+ExportFormat = Literal["ndjson", "csv"]
+
+# Số row / lần fetch từ server-side cursor (RAM ~ batch, không phụ thuộc tổng số row)
+EXPORT_BATCH_SIZE = 1000
+
+# Gom output thành chunk ~64KB trước khi gửi (tránh 1 ASGI message / row)
+_CHUNK_BYTES = 64 * 1024
+
+_MEDIA_TYPES: dict[str, str] = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+@dataclass(frozen=True)
+class ExportRows:
+    """
+    Kết quả export của repository:
+    - columns: thứ tự cột (CSV header / key NDJSON)
+    - rows: iterator lazy (chưa chạm DB tới khi response bắt đầu stream)
+    """
+    columns: tuple[str, ...]
+    rows: Iterator[Mapping[str, Any]]
+
+
+def encode_ndjson(rows: Iterable[Mapping[str, Any]], columns: Sequence[str]) -> Iterator[bytes]:
+    dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), default=to_json_safe).encode
+    for row in rows:
+        yield (dumps({c: row[c] for c in columns}) + "\n").encode("utf-8")
+
+
+def encode_csv(rows: Iterable[Mapping[str, Any]], columns: Sequence[str]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+
+    def _flush() -> bytes:
+        data = buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate(0)
+        return data
+
+    writer.writerow(columns)
+    yield _flush()
+    for row in rows:
+        writer.writerow([_csv_value(row[c]) for c in columns])
+        yield _flush()
+
+
+def gzip_stream(chunks: Iterable[bytes], *, level: int = 6) -> Iterator[bytes]:
+    # wbits=31 => gzip container (header + crc32), nén incremental theo chunk
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def accepts_gzip(request: Request) -> bool:
+    """
+    Accept-Encoding có gzip (và không phải gzip;q=0)
+    """
+    for part in request.headers.get("accept-encoding", "").split(","):
+        token, _, params = part.strip().partition(";")
+        if token.strip().lower() not in ("gzip", "*"):
+            continue
+        q = params.strip().lower()
+        if q.startswith("q="):
+            try:
+                return float(q[2:]) > 0
+            except ValueError:
+                return False
+        return True
+    return False
+
+
+def export_response(
+        export: ExportRows,
+        *,
+        fmt: ExportFormat,
+        filename: str,
+        gzip: bool = False,
+) -> StreamingResponse:
+    """
+    StreamingResponse NDJSON / CSV (+ Content-Encoding: gzip nếu client chấp nhận)
+
+    Lỗi DB giữa chừng: header đã gửi => response bị cắt (client thấy body không hoàn chỉnh), lỗi được log
+    """
+    encode = encode_csv if fmt == "csv" else encode_ndjson
+    body = _chunked(_logged(encode(export.rows, export.columns), filename=filename))
+    if gzip:
+        body = gzip_stream(body)
+
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    headers = {
+        "content-disposition": f'attachment; filename="{filename}-{stamp}.{fmt}"',
+        "cache-control": "no-store",
+        "vary": "Accept-Encoding",
+    }
+    if gzip:
+        headers["content-encoding"] = "gzip"
+
+    return StreamingResponse(body, media_type=_MEDIA_TYPES[fmt], headers=headers)
+
+
+# ===== Internal helpers =====
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return json.dumps(to_json_safe(value), ensure_ascii=False, separators=(",", ":"))
+    return str(value)
+
+
+def _chunked(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    pending: list[bytes] = []
+    size = 0
+    for chunk in chunks:
+        pending.append(chunk)
+        size += len(chunk)
+        if size >= _CHUNK_BYTES:
+            yield b"".join(pending)
+            pending.clear()
+            size = 0
+    if pending:
+        yield b"".join(pending)
+
+
+def _logged(lines: Iterator[bytes], *, filename: str) -> Iterator[bytes]:
+    # encoder yield 1 dòng / lần (CSV: thêm 1 dòng header)
+    count = 0
+    try:
+        for line in lines:
+            count += 1
+            yield line
+    except Exception:
+        logger.exception("export.failed", extra={"export": filename, "lines": count})
+        raise
+    logger.info("export.done", extra={"export": filename, "lines": count})
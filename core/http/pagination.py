@@ -1,13 +1,26 @@
+from typing import Literal
+
 from pydantic import BaseModel, Field, model_validator
 from math import ceil
 
+# offset: page/page_size + total (COUNT)
+# cursor: keyset theo sort key của row cuối, không COUNT => latency không phụ thuộc độ sâu trang
+PagingMode = Literal["offset", "cursor"]
+
+# exact: COUNT(*) | estimate: planner estimate (Postgres) | none: không tính total
+TotalMode = Literal["exact", "estimate", "none"]
+
+# Giới hạn page_size chung cho offset / cursor paging (search schemas không được vượt quá)
+MAX_PAGE_SIZE = 100
+
 
 class PageParams(BaseModel):
     """
     Paging input từ query params
     """
     page: int = Field(default=1, ge=1, description="Page number (1-based)")
-    page_size: int = Field(default=20, ge=1, le=100, description="Items per page")
+    page_size: int = Field(default=20, ge=1, le=MAX_PAGE_SIZE, description="Items per page")
+    total_mode: TotalMode = Field(default="exact", description="exact | estimate | none")
 
     @model_validator(mode="after")
     def _validate_page(self) -> "PageParams":
@@ -25,33 +38,86 @@ class PageParams(BaseModel):
     def limit(self) -> int:
         return self.page_size
 
+    @property
+    def needs_probe_row(self) -> bool:
+        """
+        total không chính xác (estimate/none) => fetch limit + 1 để biết has_next
+        """
+        return self.total_mode != "exact"
+
+
+class CursorParams(BaseModel):
+    """
+    Keyset paging input: cursor=None => trang đầu
+    """
+    page_size: int = Field(default=20, ge=1, le=MAX_PAGE_SIZE, description="Items per page")
+    cursor: str | None = Field(default=None, description="Opaque cursor (PageMeta.next_cursor)")
+
+    @property
+    def limit(self) -> int:
+        return self.page_size
+
 
 class PageMeta(BaseModel):
     """
     Metadata trả về cho client
+    - offset mode: total/page/total_pages (total_mode: exact | estimate | none)
+    - cursor mode: total/page/total_pages = None, next_cursor cho trang kế tiếp
     """
-    total: int
-    page: int
+    total: int | None
+    page: int | None
     page_size: int
-    total_pages: int
+    total_pages: int | None
     has_next: bool
     has_prev: bool
+    mode: PagingMode = "offset"
+    total_mode: TotalMode = "exact"
+    next_cursor: str | None = None
 
     @classmethod
     def from_total(
         cls,
         *,
-        total: int,
+        total: int | None,
         page: int,
         page_size: int,
+        total_mode: TotalMode = "exact",
+        has_next: bool | None = None,
     ) -> "PageMeta":
-        total_pages = ceil(total / page_size) if page_size > 0 else 0
+        total_pages = None
+        if total is not None:
+            total_pages = ceil(total / page_size) if page_size > 0 else 0
+
+        # has_next: ưu tiên kết quả probe (limit + 1) khi total không chính xác
+        if has_next is None:
+            has_next = page < (total_pages or 0)
 
         return cls(
             total=total,
             page=page,
             page_size=page_size,
             total_pages=total_pages,
-            has_next=page < total_pages,
+            has_next=has_next,
             has_prev=page > 1,
+            total_mode=total_mode,
+        )
+
+    @classmethod
+    def from_cursor(
+        cls,
+        *,
+        page_size: int,
+        next_cursor: str | None,
+        has_prev: bool,
+    ) -> "PageMeta":
+        return cls(
+            total=None,
+            page=None,
+            page_size=page_size,
+            total_pages=None,
+            has_next=next_cursor is not None,
+            has_prev=has_prev,
+            mode="cursor",
+            total_mode="none",
+            next_cursor=next_cursor,
         )
@@ -1,5 +1,6 @@
 class RequestStateKeys:
     DB = "db"
+    DB_PROVIDER = "db_provider"
     REQUEST_ID = "request_id"
     TRACE_ID = "trace_id"
     TOKEN_CLAIMS = "token_claims"
@@ -0,0 +1,34 @@
+import logging
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
+
+from configs.database import async_engine
+from dependencies.providers import get_audit_writer, get_authz_invalidator, get_password_hasher
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def app_lifespan(_: FastAPI):
+    """
+    Vòng đời process-level resources:
+    - startup: start authz invalidation listener (multi-worker cache coherence), audit writer
+    - shutdown: stop theo thứ tự ngược lại (audit writer drain queue), password hashing pool,
+      dispose async engine (nếu bật)
+    """
+    authz_invalidator = get_authz_invalidator()
+    authz_invalidator.start()
+    audit_writer = get_audit_writer()
+    audit_writer.start()
+    logger.info("app.startup")
+
+    try:
+        yield
+    finally:
+        audit_writer.stop()
+        authz_invalidator.stop()
+        get_password_hasher().stop()
+        if async_engine is not None:
+            await async_engine.dispose()
+        logger.info("app.shutdown")
@@ -1,22 +1,48 @@
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
-from sqlalchemy.orm import Session
-from starlette.responses import Response
+from sqlalchemy.orm import sessionmaker
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from configs.database import SessionLocal
+from core.http.request_state_keys import RequestStateKeys
+from core.utils.session_utils import LazySession, enable_write_tracking, session_has_writes
 
 
-class DBSessionMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next) -> Response:
-        db: Session = SessionLocal()
-        request.state.db = db
+class DBSessionMiddleware:
+    """
+    Pure ASGI middleware - tối đa 1 DB session / request (lazy):
+    - Session chỉ được tạo khi get_db được gọi lần đầu
+    - Commit ngay trước khi gửi http.response.start, CHỈ khi session có write
+      (commit lỗi => 500, không trả "success" giả)
+    - Read-only => không COMMIT, close() trả connection về pool
+    - Exception => rollback (nếu session đã được tạo)
+    """
+
+    def __init__(self, app: ASGIApp, session_factory: sessionmaker = SessionLocal):
+        self.app = app
+        self.session_factory = session_factory
+        enable_write_tracking(session_factory)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        state = scope.setdefault("state", {})
+        lazy_db = LazySession(self.session_factory, state)
+        state[RequestStateKeys.DB_PROVIDER] = lazy_db
+
+        async def send_after_commit(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                db = lazy_db.session
+                if db is not None and session_has_writes(db):
+                    db.commit()
+            await send(message)
 
         try:
-            response = await call_next(request)
-            db.commit()
-            return response
+            await self.app(scope, receive, send_after_commit)
         except Exception:
-            db.rollback()
+            if lazy_db.session is not None:
+                lazy_db.session.rollback()
             raise
         finally:
-            db.close()
+            if lazy_db.session is not None:
+                lazy_db.session.close()
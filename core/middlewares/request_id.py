@@ -1,12 +1,14 @@
 import uuid
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.types import ASGIApp
-from starlette.responses import Response
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from core.http.request_state_keys import RequestStateKeys
 
-class RequestIdMiddleware(BaseHTTPMiddleware):
+
+class RequestIdMiddleware:
     """
+    Pure ASGI middleware.
+
     Execute:
     - Prefer client-provided X-Request-Id if present (gateway / frontend / upstream)
     - Otherwise generate a new UUID4 hex
@@ -14,16 +16,24 @@ class RequestIdMiddleware(BaseHTTPMiddleware):
     """
 
     def __init__(self, app: ASGIApp, header_name: str = "X-Request-Id"):
-        super().__init__(app)
+        self.app = app
         self.header_name = header_name
 
-    async def dispatch(self, request: Request, call_next) -> Response:
-        request_id = request.headers.get(self.header_name)
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = Headers(scope=scope).get(self.header_name)
         if not request_id:
             request_id = uuid.uuid4().hex
 
-        request.state.request_id = request_id
+        # request.state được Starlette map vào scope["state"]
+        scope.setdefault("state", {})[RequestStateKeys.REQUEST_ID] = request_id
+
+        async def send_with_header(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)[self.header_name] = request_id
+            await send(message)
 
-        response: Response = await call_next(request)
-        response.headers[self.header_name] = request_id
-        return response
+        await self.app(scope, receive, send_with_header)
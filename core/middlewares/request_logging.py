@@ -4,10 +4,8 @@ import uuid
 from dataclasses import dataclass
 from typing import Any
 
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
-from starlette.responses import Response
-from starlette.types import ASGIApp
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from core.http.request_state_keys import RequestStateKeys
 from security.principals import CurrentUser
@@ -35,9 +33,14 @@ class RequestLogConfig:
     log_exception: bool = True
 
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
+class RequestLoggingMiddleware:
+    """
+    Pure ASGI middleware: log http.request.start / http.request.end
+    - status_code lấy từ message http.response.start (không bọc lại Response)
+    """
+
     def __init__(self, app: ASGIApp, config: RequestLogConfig | None = None):
-        super().__init__(app)
+        self.app = app
         self.cfg = config or RequestLogConfig(include_query_string=True)
 
     def _should_skip(self, path: str) -> bool:
@@ -130,14 +133,13 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
             *,
             base_extra: dict[str, Any],
             start_perf: float,
-            response: Response | None,
+            status_code: int,
             exc: BaseException | None,
     ) -> None:
         if not self.cfg.log_end:
             return
 
         duration_ms = (time.perf_counter() - start_perf) * 1000.0
-        status_code = getattr(response, "status_code", 500)
 
         end_extra: dict[str, Any] = {
             **base_extra,
@@ -158,7 +160,12 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
             },
         )
 
-    async def dispatch(self, request: Request, call_next) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
         path = request.url.path
         skip = self._should_skip(path)
 
@@ -168,22 +175,27 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
         if not skip:
             self._log_start(base_extra)
 
-        response: Response | None = None
+        # Chưa gửi http.response.start (exception trước khi có response) => 500
+        status_code = 500
         exc: BaseException | None = None
 
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
         try:
-            response = await call_next(request)
-            return response
+            await self.app(scope, receive, send_with_status)
         except BaseException as e:
             exc = e
             raise
         finally:
-            status_code = getattr(response, "status_code", 500)
             should_log_end = (not skip) or exc is not None or status_code >= 400
             if should_log_end:
                 self._log_end(
                     base_extra=base_extra,
                     start_perf=start_perf,
-                    response=response,
+                    status_code=status_code,
                     exc=exc,
                 )
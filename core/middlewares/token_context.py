@@ -1,13 +1,14 @@
 from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
 
+from core.http.request_state_keys import RequestStateKeys
 from security.principals import CurrentUser
 from security.providers import get_jwt_service
 
 
-class TokenContextMiddleware(BaseHTTPMiddleware):
+class TokenContextMiddleware:
     """
-    Parse token nhẹ:
+    Pure ASGI middleware - parse token nhẹ:
     - Nếu có token: verify + decode claims -> request.state.token_claims
     - Nếu token lỗi: request.state.token_error = "expired" | "invalid"
     - Nếu token OK: build claims-based principal -> request.state.current_user
@@ -15,25 +16,33 @@ class TokenContextMiddleware(BaseHTTPMiddleware):
     - Không query DB
     """
 
-    async def dispatch(self, request: Request, call_next):
-        request.state.token_claims = None
-        request.state.token_error = None
-        request.state.current_user = None
+    def __init__(self, app: ASGIApp):
+        self.app = app
 
-        token = _extract_token(request)
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        state = scope.setdefault("state", {})
+        state[RequestStateKeys.TOKEN_CLAIMS] = None
+        state[RequestStateKeys.TOKEN_ERROR] = None
+        state[RequestStateKeys.CURRENT_USER] = None
+
+        token = _extract_token(Request(scope))
         if token:
             jwt_service = get_jwt_service()
             claims, err = jwt_service.decode_access_token(token)
-            request.state.token_claims = claims
-            request.state.token_error = err  # None | "expired" | "invalid"
+            state[RequestStateKeys.TOKEN_CLAIMS] = claims
+            state[RequestStateKeys.TOKEN_ERROR] = err  # None | "expired" | "invalid"
 
             # Attach principal for logging/observability only (NOT verified)
             if claims and err is None:
                 # Defensive: only build if dict
                 if isinstance(claims, dict):
-                    request.state.current_user = CurrentUser.from_claims(claims)
+                    state[RequestStateKeys.CURRENT_USER] = CurrentUser.from_claims(claims)
 
-        return await call_next(request)
+        await self.app(scope, receive, send)
 
 
 def _extract_token(request: Request) -> str | None:
@@ -1,14 +1,15 @@
 import uuid
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
-from starlette.types import ASGIApp
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from core.http.request_state_keys import RequestStateKeys
 from core.trace import trace_id_ctx
 
 
-class TraceIdMiddleware(BaseHTTPMiddleware):
+class TraceIdMiddleware:
     """
+    Pure ASGI middleware.
+
     Execute:
     - Prefer upstream X-Trace-Id (gateway / service mesh / tracing system)
     - Otherwise generate a new trace id
@@ -17,26 +18,32 @@ class TraceIdMiddleware(BaseHTTPMiddleware):
     """
 
     def __init__(self, app: ASGIApp, header_name: str = "X-Trace-Id"):
-        super().__init__(app)
+        self.app = app
         self.header_name = header_name
 
-    async def dispatch(self, request: Request, call_next) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         # Nếu clien ko gửi => tự generate trace_id mới cho mỗi request
-        trace_id = request.headers.get(self.header_name)
+        trace_id = Headers(scope=scope).get(self.header_name)
         if not trace_id:
             trace_id = uuid.uuid4().hex
 
         # Gắn vào request.state để controller/service dùng
-        request.state.trace_id = trace_id
+        scope.setdefault("state", {})[RequestStateKeys.TRACE_ID] = trace_id
+
+        async def send_with_header(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # Trả trace_id cho client qua header
+                MutableHeaders(scope=message)[self.header_name] = trace_id
+            await send(message)
 
         # Gắn vào contextvar để logging tự động lấy được
         token = trace_id_ctx.set(trace_id)
         try:
-            response = await call_next(request)
-
-            # Trả trace_id cho client qua header
-            response.headers[self.header_name] = trace_id
-            return response
+            await self.app(scope, receive, send_with_header)
         finally:
             # Reset context để tránh leak sang request khác
             trace_id_ctx.reset(token)
@@ -21,10 +21,21 @@ CONFLICT_409 = {
     "model": ErrorResponse,
     "description": "Resource conflict (already exists or unique constraint violation)",
 }
+TOO_MANY_REQUESTS_429 = {
+    "model": ErrorResponse,
+    "description": "Too many requests (server busy or rate limited), retry after Retry-After seconds",
+}
 INTERNAL_500 = {
     "model": ErrorResponse,
     "description": "Internal server error",
 }
+EXPORT_200 = {
+    "description": "Streamed export (NDJSON / CSV, Content-Encoding: gzip nếu Accept-Encoding có gzip)",
+    "content": {
+        "application/x-ndjson": {"schema": {"type": "string"}},
+        "text/csv": {"schema": {"type": "string"}},
+    },
+}
 
 AUTH_COMMON_RESPONSES = {
     401: UNAUTHORIZED_401,
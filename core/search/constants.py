@@ -1 +1,4 @@
 MAX_KEYWORD_LENGTH = 200
+
+# Sort field ảo: mức độ khớp keyword (chỉ hợp lệ khi có keyword, offset paging)
+RELEVANCE_SORT_FIELD = "relevance"
@@ -0,0 +1,32 @@
+from typing import Any
+
+from sqlalchemy import Float, func
+
+_LIKE_ESCAPE = "\\"
+
+
+def escape_like(value: str) -> str:
+    """
+    Escape ký tự đặc biệt của LIKE (%, _, \\) => keyword được so khớp nguyên văn
+    """
+    return (
+        value.replace(_LIKE_ESCAPE, _LIKE_ESCAPE * 2)
+        .replace("%", _LIKE_ESCAPE + "%")
+        .replace("_", _LIKE_ESCAPE + "_")
+    )
+
+
+def keyword_filter(column: Any, keyword: str) -> Any:
+    """
+    column ILIKE '%keyword%' (contains, không phân biệt hoa thường)
+
+    Postgres: dùng được GIN index gin_trgm_ops (pg_trgm) thay vì seq scan khi keyword >= 3 ký tự
+    """
+    return column.ilike(f"%{escape_like(keyword)}%", escape=_LIKE_ESCAPE)
+
+
+def keyword_similarity(column: Any, keyword: str) -> Any:
+    """
+    Điểm relevance của column so với keyword: similarity(column, keyword) của pg_trgm (0..1, càng lớn càng khớp)
+    """
+    return func.similarity(column, keyword, type_=Float())
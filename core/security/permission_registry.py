@@ -0,0 +1,62 @@
+import base64
+import binascii
+import hashlib
+from functools import lru_cache
+from typing import Iterable, Sequence
+
+from core.security.permissions import Permissions
+
+
+class PermissionRegistry:
+    """
+    Map permission code <-> bit index (thứ tự khai báo trong Permissions):
+    - encode(): set[str] -> bitset base64url (vài byte thay vì list string trong access token)
+    - version: digest của danh sách code theo thứ tự => thêm / đổi thứ tự permission
+      => version mới, token encode theo registry cũ tự fallback DB
+    - Permission không có trong registry (chỉ tồn tại trong DB) => encode trả None (không nhúng)
+    """
+
+    def __init__(self, codes: Sequence[str]):
+        if len(set(codes)) != len(codes):
+            raise ValueError(">>>>> Invalid permission registry: duplicate permission code")
+
+        self._codes = tuple(codes)
+        self._index = {code: i for i, code in enumerate(self._codes)}
+        self._version = hashlib.sha256("\n".join(self._codes).encode("utf-8")).hexdigest()[:8]
+        # Nhiều user chung 1 tập permission => decode mỗi bitset 1 lần
+        self._decode_cached = lru_cache(maxsize=1024)(self._decode)
+
+    @property
+    def version(self) -> str:
+        return self._version
+
+    def encode(self, permissions: Iterable[str]) -> str | None:
+        bits = 0
+        for code in permissions:
+            index = self._index.get(code)
+            if index is None:
+                return None
+            bits |= 1 << index
+
+        raw = bits.to_bytes((len(self._codes) + 7) // 8, "little")
+        return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+    def decode(self, value: str) -> frozenset[str] | None:
+        """
+        :return: None nếu bitset sai format / có bit ngoài registry
+        """
+        return self._decode_cached(value)
+
+    def _decode(self, value: str) -> frozenset[str] | None:
+        try:
+            raw = base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+        except (binascii.Error, ValueError):
+            return None
+
+        bits = int.from_bytes(raw, "little")
+        if bits >> len(self._codes):
+            return None
+        return frozenset(code for i, code in enumerate(self._codes) if bits >> i & 1)
+
+
+PERMISSION_REGISTRY = PermissionRegistry([p.value for p in Permissions])
@@ -0,0 +1,64 @@
+import json
+from typing import Any
+
+from sqlalchemy import Select, text
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+
+class _ExplainJson(Executable, ClauseElement):
+    """
+    EXPLAIN (FORMAT JSON) <stmt> - bind params đi qua type processors của dialect như statement thường
+    """
+    inherit_cache = False
+
+    def __init__(self, stmt: Select):
+        self.statement = stmt
+
+
+@compiles(_ExplainJson, "postgresql")
+def _compile_explain_pg(element: _ExplainJson, compiler, **kw) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+def estimate_row_count(db: Session, stmt: Select) -> int | None:
+    """
+    Ước lượng số row của stmt KHÔNG scan dữ liệu (Postgres only):
+    - Không filter (1 bảng): pg_class.reltuples (cập nhật bởi ANALYZE / autovacuum)
+    - Có filter: planner estimate từ EXPLAIN (FORMAT JSON) -> Plan Rows
+
+    :return: None nếu dialect không hỗ trợ / chưa có statistics (caller tự fallback)
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return None
+
+    if stmt.whereclause is None:
+        estimate = _reltuples(db, stmt)
+        if estimate is not None:
+            return estimate
+
+    # Connection.execute: read-only, không bị write-tracking của Session coi là write
+    raw: Any = db.connection().execute(_ExplainJson(stmt)).scalar()
+    plan = json.loads(raw) if isinstance(raw, str) else raw
+    try:
+        return max(0, int(plan[0]["Plan"]["Plan Rows"]))
+    except (LookupError, TypeError, ValueError):
+        return None
+
+
+# ===== Private helpers =====
+def _reltuples(db: Session, stmt: Select) -> int | None:
+    froms = stmt.get_final_froms()
+    if len(froms) != 1 or not hasattr(froms[0], "fullname"):
+        return None
+
+    value = db.connection().execute(
+        text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:name)"),
+        {"name": froms[0].fullname},
+    ).scalar()
+
+    # reltuples = -1: bảng chưa từng được ANALYZE (PG14+)
+    if value is None or int(value) < 0:
+        return None
+    return int(value)
@@ -0,0 +1,125 @@
+import csv
+import json
+from dataclasses import dataclass
+from typing import Any, Collection, Iterable, Iterator, Literal
+
+RecordFormat = Literal["ndjson", "csv"]
+
+# Byte không decode được UTF-8 => thay bằng U+FFFD, row chứa ký tự này bị báo lỗi (không insert dữ liệu hỏng)
+REPLACEMENT_CHAR = "\ufffd"
+
+_EXTENSIONS: dict[str, RecordFormat] = {
+    ".csv": "csv",
+    ".ndjson": "ndjson",
+    ".jsonl": "ndjson",
+}
+_CONTENT_TYPES: dict[str, RecordFormat] = {
+    "text/csv": "csv",
+    "application/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+}
+
+
+class RecordFormatError(ValueError):
+    """
+    Lỗi cấp file (không phải từng row): header CSV thiếu cột bắt buộc, ...
+    """
+
+
+@dataclass(frozen=True)
+class SourceRecord:
+    """
+    1 record đọc từ file upload:
+    - line: số dòng trong file (1-based, CSV: dòng bắt đầu record) => báo lỗi theo dòng
+    - data: dict field -> value (None nếu không parse được)
+    - error: lý do parse lỗi
+    """
+    line: int
+    data: dict[str, Any] | None
+    error: str | None = None
+
+
+def detect_format(filename: str | None, content_type: str | None) -> RecordFormat | None:
+    name = (filename or "").lower()
+    for ext, fmt in _EXTENSIONS.items():
+        if name.endswith(ext):
+            return fmt
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    return _CONTENT_TYPES.get(media_type)
+
+
+def iter_records(
+        lines: Iterable[bytes],
+        *,
+        fmt: RecordFormat,
+        required_columns: Collection[str] = (),
+) -> Iterator[SourceRecord]:
+    """
+    Đọc record streaming từ file nhị phân (iterate theo dòng) - RAM không phụ thuộc kích thước file
+
+    :raise RecordFormatError: CSV header thiếu cột bắt buộc (raise ở lần next() đầu tiên)
+    """
+    text_lines = _decode_lines(lines)
+    if fmt == "csv":
+        return _iter_csv(text_lines, required_columns=required_columns)
+    return _iter_ndjson(text_lines)
+
+
+# ===== Internal helpers =====
+def _decode_lines(lines: Iterable[bytes]) -> Iterator[str]:
+    first = True
+    for raw in lines:
+        line = raw.decode("utf-8", errors="replace")
+        if first:
+            line = line.removeprefix("\ufeff")  # UTF-8 BOM (Excel)
+            first = False
+        yield line
+
+
+def _iter_csv(lines: Iterator[str], *, required_columns: Collection[str]) -> Iterator[SourceRecord]:
+    reader = csv.reader(lines)
+    try:
+        header = [h.strip() for h in next(reader)]
+    except StopIteration:
+        return
+
+    missing = [c for c in required_columns if c not in header]
+    if missing:
+        raise RecordFormatError(f"missing CSV columns: {', '.join(missing)}")
+
+    line = reader.line_num + 1
+    try:
+        for values in reader:
+            if not any(v.strip() for v in values):
+                line = reader.line_num + 1
+                continue
+            if len(values) != len(header):
+                yield SourceRecord(line=line, data=None, error=f"expected {len(header)} columns, got {len(values)}")
+            elif any(REPLACEMENT_CHAR in v for v in values):
+                yield SourceRecord(line=line, data=None, error="invalid UTF-8")
+            else:
+                # Ô trống => None (không nhận '' như giá trị hợp lệ)
+                yield SourceRecord(line=line, data={h: (v if v != "" else None) for h, v in zip(header, values)})
+            line = reader.line_num + 1
+    except csv.Error as ex:
+        yield SourceRecord(line=line, data=None, error=f"invalid CSV: {ex}")
+
+
+def _iter_ndjson(lines: Iterator[str]) -> Iterator[SourceRecord]:
+    for line_no, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        if REPLACEMENT_CHAR in line:
+            yield SourceRecord(line=line_no, data=None, error="invalid UTF-8")
+            continue
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError as ex:
+            yield SourceRecord(line=line_no, data=None, error=f"invalid JSON: {ex.msg}")
+            continue
+        if not isinstance(data, dict):
+            yield SourceRecord(line=line_no, data=None, error="expected a JSON object")
+            continue
+        yield SourceRecord(line=line_no, data=data)
@@ -0,0 +1,76 @@
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.orm import ORMExecuteState, Session, sessionmaker
+
+from core.http.request_state_keys import RequestStateKeys
+
+_HAS_WRITES_KEY = "has_writes"
+
+
+class LazySession:
+    """
+    Session per request, tạo lazily ở lần get_db đầu tiên:
+    - Request không đụng DB (/health, /docs, 401 từ guard trước khi query) => không mở session
+    - Sau khi tạo: gắn vào request.state.db (giữ contract cũ)
+    """
+
+    __slots__ = ("_factory", "_state", "session")
+
+    def __init__(self, factory: sessionmaker, state: dict[str, Any]):
+        self._factory = factory
+        self._state = state
+        self.session: Session | None = None
+
+    def get(self) -> Session:
+        if self.session is None:
+            self.session = self._factory()
+            self._state[RequestStateKeys.DB] = self.session
+        return self.session
+
+
+def mark_session_written(db: Session) -> None:
+    """
+    Đánh dấu session có write => DBSessionMiddleware sẽ COMMIT.
+    Dùng khi ghi qua đường không đi qua Session.execute / flush (vd: db.connection().execute(...)).
+    """
+    db.info[_HAS_WRITES_KEY] = True
+
+
+def session_has_writes(db: Session) -> bool:
+    """
+    True nếu transaction hiện tại có thể đã ghi dữ liệu:
+    - đã flush / execute statement không phải SELECT (tracking events)
+    - hoặc còn object pending (new / dirty / deleted) chưa flush
+    """
+    if db.info.get(_HAS_WRITES_KEY):
+        return True
+    return bool(db.new or db.dirty or db.deleted)
+
+
+def enable_write_tracking(target: Session | sessionmaker | type[Session]) -> None:
+    """
+    Gắn listeners theo dõi write lên Session / sessionmaker (idempotent).
+    """
+    if event.contains(target, "after_flush", _on_after_flush):
+        return
+
+    event.listen(target, "after_flush", _on_after_flush)
+    event.listen(target, "do_orm_execute", _on_do_orm_execute)
+    event.listen(target, "after_commit", _reset_writes)
+    event.listen(target, "after_rollback", _reset_writes)
+
+
+# ===== Private helpers =====
+def _on_after_flush(session: Session, _flush_context) -> None:
+    mark_session_written(session)
+
+
+def _on_do_orm_execute(state: ORMExecuteState) -> None:
+    # INSERT / UPDATE / DELETE / text(...) (vd: pg_notify) => coi là write
+    if not state.is_select:
+        mark_session_written(state.session)
+
+
+def _reset_writes(session: Session) -> None:
+    session.info.pop(_HAS_WRITES_KEY, None)
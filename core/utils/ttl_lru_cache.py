@@ -0,0 +1,89 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TtlLruCache(Generic[K, V]):
+    """
+    In-process cache (thread-safe) kết hợp:
+    - LRU: giới hạn số entry (max_size), evict entry ít dùng nhất
+    - TTL: mỗi entry chỉ sống tối đa ttl_seconds (hoặc expires_at riêng)
+
+    Dùng cho các snapshot nhỏ, đọc nhiều (authz, token_version, ...).
+    Không dùng để cache dữ liệu lớn.
+    """
+
+    def __init__(
+            self,
+            *,
+            max_size: int,
+            ttl_seconds: float,
+            clock: Callable[[], float] = time.monotonic,
+    ):
+        if max_size <= 0:
+            raise ValueError(">>>>> max_size must be > 0")
+        if ttl_seconds <= 0:
+            raise ValueError(">>>>> ttl_seconds must be > 0")
+
+        self._max_size = max_size
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: K) -> V | None:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+
+            expires_at, value = item
+            if expires_at <= self._clock():
+                # expired -> drop ngay
+                del self._data[key]
+                self.misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: K, value: V, *, ttl_seconds: float | None = None) -> None:
+        ttl = self._ttl_seconds if ttl_seconds is None else min(ttl_seconds, self._ttl_seconds)
+        if ttl <= 0:
+            return
+
+        with self._lock:
+            self._data[key] = (self._clock() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self._max_size:
+                self._data.popitem(last=False)
+
+    def pop(self, key: K) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def pop_where(self, predicate: Callable[[K], bool]) -> int:
+        """
+        Xóa mọi entry có key thỏa predicate. Return: số entry bị xóa
+        """
+        with self._lock:
+            keys = [k for k in self._data if predicate(k)]
+            for k in keys:
+                del self._data[k]
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
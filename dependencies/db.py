@@ -1,11 +1,31 @@
+from typing import AsyncIterator
+
 from fastapi import Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from configs.database import AsyncSessionLocal
 from core.http.request_state_keys import RequestStateKeys
 
 
 def get_db(request: Request) -> Session:
-    db = getattr(request.state, RequestStateKeys.DB, None)
-    if db is None:
+    lazy_db = getattr(request.state, RequestStateKeys.DB_PROVIDER, None)
+    if lazy_db is None:
         raise RuntimeError("DB session is not available on request.state. Check DBSessionMiddleware order.")
-    return db
+    return lazy_db.get()
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """
+    AsyncSession per request (DB_ASYNC_ENABLED=true) - dành cho async read paths:
+    - Không commit (write paths vẫn đi qua DBSessionMiddleware / get_db)
+    - Luôn close => trả connection về pool
+    """
+    if AsyncSessionLocal is None:
+        raise RuntimeError("Async DB stack is disabled. Set DB_ASYNC_ENABLED=true.")
+
+    db = AsyncSessionLocal()
+    try:
+        yield db
+    finally:
+        await db.close()
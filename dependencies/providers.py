@@ -1,11 +1,44 @@
 from functools import lru_cache
 
+from configs.database import SessionLocal
 from configs.env import settings_config
+from core.audit.audit_writer import (
+    AuditWriter,
+    BackgroundAuditWriter,
+    BufferedAuditWriter,
+    ImmediateAuditWriter,
+)
 from repositories.audit_log_repository import AuditLogRepository
 from repositories.refresh_session_repository import RefreshSessionRepository
+from services.async_user_service import AsyncUserService
 from services.user_service import UserService
 from services.audit_log_service import AuditLogService
 from repositories.user_repository import UserRepository
+from repositories.async_user_repository import AsyncUserRepository
+from security.authz_cache import AuthzSnapshotCache, TokenVersionCache
+from security.authz_claims import ClaimsAuthzPolicy
+from security.password_hasher import PasswordHasherPool
+from security.authz_invalidation import (
+    AuthzInvalidationChannel,
+    AuthzInvalidator,
+    InMemoryInvalidationChannel,
+    NoopInvalidationChannel,
+    PostgresNotifyInvalidationChannel,
+    UnixSocketInvalidationChannel,
+)
+
+
+@lru_cache
+def get_audit_writer() -> AuditWriter:
+    # Singleton: background writer giữ queue + worker thread (start/stop trong lifespan)
+    settings = settings_config().audit_writer
+    repo = AuditLogRepository()
+
+    if settings.mode == "buffered":
+        return BufferedAuditWriter(repo)
+    if settings.mode == "background":
+        return BackgroundAuditWriter(repo=repo, session_factory=SessionLocal, settings=settings)
+    return ImmediateAuditWriter(repo)
 
 
 @lru_cache
@@ -17,9 +50,60 @@ def get_audit_log_service() -> AuditLogService:
     return AuditLogService(
         audit_log_repo=AuditLogRepository(),
         audit_mode=mode,
+        audit_writer=get_audit_writer(),
     )
 
 
+@lru_cache
+def get_authz_snapshot_cache() -> AuthzSnapshotCache:
+    # Singleton per process: guards đọc, services invalidate
+    settings = settings_config()
+    return AuthzSnapshotCache(settings.security.authz_cache)
+
+
+@lru_cache
+def get_token_version_cache() -> TokenVersionCache:
+    # Singleton per process: require_current_user_fresh đọc, AuthzInvalidator invalidate
+    settings = settings_config()
+    return TokenVersionCache(settings.security.authz_cache)
+
+
+@lru_cache
+def get_claims_authz_policy() -> ClaimsAuthzPolicy:
+    # Singleton per process: JwtService encode, guards đọc, AuthzInvalidator revoke
+    settings = settings_config()
+    return ClaimsAuthzPolicy(settings.security.jwt)
+
+
+@lru_cache
+def get_authz_invalidation_channel() -> AuthzInvalidationChannel:
+    settings = settings_config()
+    cfg = settings.security.authz_invalidation
+
+    if cfg.backend == "postgres":
+        return PostgresNotifyInvalidationChannel(settings.database_url, channel=cfg.pg_channel)
+    if cfg.backend == "unix_socket":
+        return UnixSocketInvalidationChannel(cfg.socket_dir)
+    if cfg.backend == "memory":
+        return InMemoryInvalidationChannel()
+    return NoopInvalidationChannel()
+
+
+@lru_cache
+def get_authz_invalidator() -> AuthzInvalidator:
+    # Start/stop trong app lifespan (core/lifespan.py)
+    return AuthzInvalidator(
+        caches=[get_authz_snapshot_cache(), get_token_version_cache(), get_claims_authz_policy()],
+        channel=get_authz_invalidation_channel(),
+    )
+
+
+@lru_cache
+def get_password_hasher() -> PasswordHasherPool:
+    # Singleton: 1 executor / process (stop trong lifespan)
+    return PasswordHasherPool(settings_config().security.password_hashing)
+
+
 @lru_cache
 def get_user_service() -> UserService:
     # Điều kiện: UserService phải là stateless => cache OK
@@ -27,4 +111,12 @@ def get_user_service() -> UserService:
         user_repo=UserRepository(),
         refresh_session_repo=RefreshSessionRepository(),
         audit_log_service=get_audit_log_service(),
+        authz_invalidator=get_authz_invalidator(),
+        password_hasher=get_password_hasher(),
     )
+
+
+@lru_cache
+def get_async_user_service() -> AsyncUserService:
+    # Async read paths (DB_ASYNC_ENABLED=true), stateless => cache OK
+    return AsyncUserService(user_repo=AsyncUserRepository())
@@ -2,6 +2,8 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from configs.env import settings_config
+from controllers.async_user_controller import async_user_router
+from controllers.audit_log_controller import audit_log_router
 from controllers.auth_controller import auth_router
 from controllers.health_controller import health_router
 from controllers.student_controller import student_router
@@ -9,6 +11,7 @@ from controllers.user_controller import user_router
 from core.app_logging import setup_logging
 from core.exceptions.base import BusinessException
 from core.exceptions.exception_handlers import business_exception_handler, unhandled_exception_handler
+from core.lifespan import app_lifespan
 from core.middlewares.db_session import DBSessionMiddleware
 from core.middlewares.request_id import RequestIdMiddleware
 from core.middlewares.request_logging import RequestLoggingMiddleware
@@ -16,6 +19,7 @@ from core.middlewares.token_context import TokenContextMiddleware
 from core.middlewares.trace_id import TraceIdMiddleware
 
 app = FastAPI(
+    lifespan=app_lifespan,
     swagger_ui_parameters={"persistAuthorization": True}
 )
 
@@ -26,10 +30,16 @@ setup_logging(sql_echo=(settings.environment == "DEV"))
 app.include_router(health_router, tags=["Health"])
 app.include_router(
     auth_router, prefix=f"{settings.api_prefix}/auth", tags=["Auth"])
+if settings.db_async_enabled:
+    # Async read routes phải đăng ký TRƯỚC user_router (match theo thứ tự)
+    app.include_router(
+        async_user_router, prefix=f"{settings.api_prefix}/users", tags=["Users"])
 app.include_router(
     user_router, prefix=f"{settings.api_prefix}/users", tags=["Users"])
 app.include_router(
     student_router, prefix=f"{settings.api_prefix}/students", tags=["Students"])
+app.include_router(
+    audit_log_router, prefix=f"{settings.api_prefix}/audit-logs", tags=["Audit Logs"])
 
 # Đăng ký Exception Handler => thứ tự bắt buộc
 app.add_exception_handler(BusinessException, business_exception_handler)
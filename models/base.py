@@ -5,4 +5,7 @@ class Base(DeclarativeBase):
     # Base hiện tại chưa cần thêm logic
     # nhưng bắt buộc phải tồn tại như một lớp con
     # để SQLAlchemy sử dụng
-    pass
\ No newline at end of file
+
+    # Server-generated values (id, created_at, is_deleted, onupdate=func.now(), ...)
+    # được lấy về bằng RETURNING ngay trong INSERT/UPDATE => không cần refresh() (thêm 1 SELECT)
+    __mapper_args__ = {"eager_defaults": True}
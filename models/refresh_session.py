@@ -7,7 +7,9 @@ from sqlalchemy import (
     DateTime,
     Index,
     UniqueConstraint,
+    text,
 )
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from models.base import Base
@@ -36,11 +38,22 @@ class RefreshSession(TimeMixin, Base):
         comment="Hashed refresh token (never store plain token)",
     )
 
+    # ---- Token family (reuse detection) ----
+    # Row = 1 family (rotate update-in-place). Ring các token_hash đã rotate gần nhất (mới nhất trước):
+    # hash cũ bị dùng lại => token bị lộ => revoke cả family
+    previous_token_hashes: Mapped[list[str]] = mapped_column(
+        ARRAY(String(255)),
+        nullable=False,
+        server_default=text("'{}'"),
+    )
+
     # ---- Lifecycle ----
     # Nếu user không refresh trong expires_at phút -> hết session -> login lại
+    # index: purge job (DELETE theo batch WHERE expires_at <= now)
     expires_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
+        index=True,
     )
 
     # Dù refresh liên tục, sau absolute_expires_at ngày kể từ login -> hết session
@@ -70,4 +83,6 @@ class RefreshSession(TimeMixin, Base):
     __table_args__ = (
         UniqueConstraint("token_hash", name="uq_refresh_sessions_token_hash"),
         Index("ix_refresh_sessions_user_active", "user_id", "revoked_at"),
+        # GIN: previous_token_hashes @> ARRAY[:hash] (reuse lookup) không scan bảng
+        Index("ix_refresh_sessions_previous_token_hashes", "previous_token_hashes", postgresql_using="gin"),
     )
@@ -1,4 +1,4 @@
-from sqlalchemy import String
+from sqlalchemy import Index, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from models.base import Base
@@ -14,3 +14,13 @@ class Student(TimeMixin, Base):
     age: Mapped[int] = mapped_column(nullable=False)
     email: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)
     phone_number: Mapped[str | None] = mapped_column(String(20))
+
+    __table_args__ = (
+        # pg_trgm: full_name ILIKE '%keyword%' dùng index thay vì seq scan
+        Index(
+            "ix_students_full_name_trgm",
+            "full_name",
+            postgresql_using="gin",
+            postgresql_ops={"full_name": "gin_trgm_ops"},
+        ),
+    )
@@ -1,6 +1,6 @@
 import uuid
 from typing import TYPE_CHECKING
-from sqlalchemy import String
+from sqlalchemy import Index, String
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -32,3 +32,8 @@ class User(TimeMixin, AuditMixin, Base):
         back_populates="users",
         lazy="selectin",
     )
+
+    __table_args__ = (
+        # pg_trgm: email ILIKE '%q%' (search q) dùng index thay vì seq scan
+        Index("ix_users_email_trgm", "email", postgresql_using="gin", postgresql_ops={"email": "gin_trgm_ops"}),
+    )
@@ -0,0 +1,34 @@
+import uuid
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.user import User
+from repositories.auth_repository import AuthRepository
+
+
+class AsyncAuthRepository:
+    """
+    Async variant của AuthRepository (cùng SQL, cùng snapshot contract)
+    """
+
+    async def get_user_credentials_by_email(self, db: AsyncSession, email: str) -> User | None:
+        stmt = select(User).where(User.email == email)
+        return (await db.execute(stmt)).scalars().first()
+
+    async def get_authz_snapshot(
+            self, db: AsyncSession, user_id: uuid.UUID
+    ) -> tuple[list[str], list[str], int]:
+        """
+        Build authz snapshot in ONE query - xem AuthRepository.get_authz_snapshot
+        """
+        stmt = AuthRepository._authz_snapshot_stmt(user_id)
+        row = (await db.execute(stmt)).one_or_none()
+        return AuthRepository._to_authz_snapshot(row)
+
+    async def get_token_version(self, db: AsyncSession, user_id: uuid.UUID) -> int:
+        """
+        Single-column lookup qua PK - xem AuthRepository.get_token_version
+        """
+        row = (await db.execute(AuthRepository._token_version_stmt(user_id))).one_or_none()
+        return AuthRepository._to_token_version(row)
@@ -0,0 +1,109 @@
+from typing import Any, List, Mapping, Sequence, Type, cast
+
+from sqlalchemy import select, func, Select, ColumnElement
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.http.pagination import CursorParams, PageParams, PageMeta, TotalMode
+from core.http.sorting import SortSpec
+from core.utils.query_estimate import estimate_row_count
+from repositories.base_repository import ModelType, RepositoryQueryMixin
+
+
+class AsyncBaseRepository(RepositoryQueryMixin[ModelType]):
+    """
+    Async variant của BaseRepository (read paths) cho AsyncSession:
+    - Dùng chung statement builders (sort allowlist, paging, alive filter) với bản sync
+    - Không có lazy-load ngầm: caller chỉ dùng column đã load
+    """
+
+    def __init__(self, model: Type[ModelType]):
+        self.model = model
+
+    # -------- READ --------
+    async def get_by_id(
+            self, db: AsyncSession, entity_id: Any
+    ) -> ModelType | None:
+        stmt = select(self.model).where(self.model.id == entity_id)  # type: ignore[attr-defined]
+        return (await db.execute(stmt)).scalars().first()
+
+    async def get_alive_by_id(
+            self, db: AsyncSession, entity_id: Any
+    ) -> ModelType | None:
+        stmt = select(self.model).where(self.model.id == entity_id)  # type: ignore[attr-defined]
+        stmt = self._apply_alive_filter(stmt)
+        return (await db.execute(stmt)).scalars().first()
+
+    async def list_active(
+            self, db: AsyncSession, *, offset: int = 0, limit: int = 100
+    ) -> Sequence[ModelType]:
+        stmt = select(self.model)
+        stmt = self._apply_alive_filter(stmt)
+        stmt = stmt.offset(offset).limit(limit)
+        return list((await db.execute(stmt)).scalars().all())
+
+    async def exists_active_by_id(self, db: AsyncSession, entity_id: Any) -> bool:
+        stmt = select(func.count()).select_from(self.model).where(
+            self.model.id == entity_id  # type: ignore[attr-defined]
+        )
+        stmt = self._apply_alive_filter(stmt)
+        return ((await db.execute(stmt)).scalar_one() or 0) > 0
+
+    # -------- COUNT (for search) --------
+    async def count(self, db: AsyncSession, stmt: Select) -> int:
+        # count(*) trên subquery để giữ đúng filter/join
+        count_stmt = select(func.count()).select_from(stmt.subquery())
+        return int((await db.execute(count_stmt)).scalar() or 0)
+
+    async def resolve_total(self, db: AsyncSession, stmt: Select, *, mode: TotalMode) -> int | None:
+        """
+        Async variant của BaseRepository.resolve_total
+        """
+        if mode == "none":
+            return None
+        if mode == "estimate":
+            estimate = await db.run_sync(estimate_row_count, stmt)
+            if estimate is not None:
+                return estimate
+        return await self.count(db, stmt)
+
+    # ===== Common search pipeline =====
+    async def _execute_search(
+            self,
+            *,
+            db: AsyncSession,
+            stmt: Select,
+            total: int | None,
+            page: PageParams | CursorParams,
+            sort_specs: Sequence[SortSpec] | None,
+            allowed_sort_fields: Mapping[str, ColumnElement[Any]],
+            default_sorts: Sequence[SortSpec],
+    ) -> tuple[List[ModelType], int | None, PageMeta]:
+        """
+        Execute common search pipeline (async) - cùng contract với BaseRepository._execute_search
+
+        :return: tuple[items, total, meta]
+        """
+        if isinstance(page, CursorParams):
+            stmt, keys, signature = self._prepare_keyset(
+                stmt,
+                page=page,
+                sorts=sort_specs,
+                allowed_sort_fields=allowed_sort_fields,
+                default_sorts=default_sorts,
+            )
+            rows = cast(list[ModelType], (await db.execute(stmt)).scalars().all())
+            items, meta = self._build_keyset_page(rows, page=page, keys=keys, signature=signature)
+            return items, None, meta
+
+        stmt = self.apply_sort(
+            stmt,
+            sorts=sort_specs,
+            allowed_sort_fields=allowed_sort_fields,
+            default_sorts=default_sorts,
+        )
+
+        stmt = self._apply_offset_page(stmt, page=page)
+
+        rows = cast(list[ModelType], (await db.execute(stmt)).scalars().all())
+        items, meta = self._build_offset_page(rows, total=total, page=page)
+        return items, total, meta
@@ -0,0 +1,52 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.http.pagination import PageMeta
+from core.http.sorting import SortSpec, parse_sort
+from models.user import User
+from repositories.async_base_repository import AsyncBaseRepository
+from repositories.user_repository import UserRepository
+from schemas.request.user_schema import UserSearchParams
+
+
+class AsyncUserRepository(AsyncBaseRepository[User]):
+    # Dùng chung whitelist sort với bản sync
+    _SORT_FIELDS = UserRepository._SORT_FIELDS
+
+    def __init__(self):
+        super().__init__(User)
+
+    async def get_by_email(self, db: AsyncSession, *, email: str) -> User | None:
+        stmt = select(User).where(User.email == email)
+        stmt = self._apply_alive_filter(stmt)  # exclude soft-deleted
+        return (await db.execute(stmt)).scalars().first()
+
+    async def search(
+            self,
+            db: AsyncSession,
+            *,
+            params: UserSearchParams,
+    ) -> tuple[list[User], int | None, PageMeta]:
+        """
+        Async variant của UserRepository.search (cùng filters / sort / paging)
+
+        :return: tuple[items, total, meta]
+        """
+        stmt = select(User)
+        stmt = self._apply_alive_filter(stmt)
+        stmt = UserRepository._apply_filters(stmt, params)
+
+        total = None if params.is_cursor_mode else await self.resolve_total(db, stmt, mode=params.total_mode)
+
+        page_params = params.to_page_params()
+        sort_specs = parse_sort(params.sort) if params.sort else None
+
+        return await self._execute_search(
+            db=db,
+            stmt=stmt,
+            total=total,
+            page=page_params,
+            sort_specs=sort_specs,
+            allowed_sort_fields=UserRepository._sort_fields(params),
+            default_sorts=[SortSpec(field="created_at", direction="desc")],
+        )
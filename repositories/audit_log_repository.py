@@ -1,12 +1,13 @@
-from typing import Any
-from sqlalchemy import select
+from typing import Any, Sequence
+from sqlalchemy import Connection, insert, select
 from sqlalchemy.orm import Session
 
-from core.http.pagination import PageMeta, PageParams
+from core.http.export import ExportRows
+from core.http.pagination import PageMeta
 from core.http.sorting import SortSpec, parse_sort
 from models.audit_log import AuditLog
 from repositories.base_repository import BaseRepository
-from schemas.request.audit_log_schema import AuditLogSearchParams
+from schemas.request.audit_log_schema import AuditLogExportParams, AuditLogFilterParams, AuditLogSearchParams
 
 
 class AuditLogRepository(BaseRepository[AuditLog]):
@@ -14,7 +15,9 @@ class AuditLogRepository(BaseRepository[AuditLog]):
     Enterprise audit log repository (append-only).
 
     - create_event(): insert new audit event
+    - insert_many(): batch insert (buffered / background audit writer)
     - search(): query audit events by AuditLogSearchParams (filters + paging + sort)
+    - export(): stream audit events by AuditLogExportParams (filters + sort, server-side cursor)
     """
 
     _SORT_FIELDS: dict[str, Any] = {
@@ -28,6 +31,22 @@ class AuditLogRepository(BaseRepository[AuditLog]):
         "trace_id": AuditLog.trace_id,
     }
 
+    _EXPORT_COLUMNS = (
+        AuditLog.id,
+        AuditLog.created_at,
+        AuditLog.actor_user_id,
+        AuditLog.action,
+        AuditLog.entity_type,
+        AuditLog.entity_id,
+        AuditLog.request_id,
+        AuditLog.trace_id,
+        AuditLog.ip,
+        AuditLog.user_agent,
+        AuditLog.before,
+        AuditLog.after,
+        AuditLog.message,
+    )
+
     def __init__(self):
         super().__init__(AuditLog)
 
@@ -35,8 +54,18 @@ class AuditLogRepository(BaseRepository[AuditLog]):
     def create_event(self, db: Session, *, event: AuditLog) -> AuditLog:
         return self.create(db, event)
 
+    def insert_many(self, db: Session | Connection, *, rows: Sequence[dict[str, Any]]) -> int:
+        """
+        Batch insert (không hydrate ORM, không RETURNING):
+        executemany => SQLAlchemy "insertmanyvalues" gộp thành multi-row INSERT
+        """
+        if not rows:
+            return 0
+        db.execute(insert(AuditLog), list(rows))
+        return len(rows)
+
     # ===== READ =====
-    def search(self, db: Session, *, params: AuditLogSearchParams) -> tuple[list[AuditLog], int, PageMeta]:
+    def search(self, db: Session, *, params: AuditLogSearchParams) -> tuple[list[AuditLog], int | None, PageMeta]:
         """
         Search audit logs by AuditLogSearchParams.
 
@@ -45,9 +74,9 @@ class AuditLogRepository(BaseRepository[AuditLog]):
         stmt = select(AuditLog)
         stmt = self._apply_filters(stmt, params=params)
 
-        total = self.count(db, stmt)
+        total = None if params.is_cursor_mode else self.resolve_total(db, stmt, mode=params.total_mode)
 
-        page_params = PageParams(page=params.page, page_size=params.page_size)
+        page_params = params.to_page_params()
 
         sort_specs: list[SortSpec] | None = None
         if params.sort:
@@ -64,8 +93,24 @@ class AuditLogRepository(BaseRepository[AuditLog]):
             default_sorts=[SortSpec(field="created_at", direction="desc")],
         )
 
+    def export(self, db: Session, *, params: AuditLogExportParams) -> ExportRows:
+        """
+        Stream audit events by AuditLogExportParams (same filters / sort allowlist as search).
+        """
+        stmt = select(*self._EXPORT_COLUMNS)
+        stmt = self._apply_filters(stmt, params=params)
+
+        return self._execute_export(
+            db=db,
+            stmt=stmt,
+            columns=self._EXPORT_COLUMNS,
+            sort_specs=parse_sort(params.sort) if params.sort else None,
+            allowed_sort_fields=self._SORT_FIELDS,
+            default_sorts=[SortSpec(field="created_at", direction="desc")],
+        )
+
     # ===== Internal helpers =====
-    def _apply_filters(self, stmt, *, params: AuditLogSearchParams):
+    def _apply_filters(self, stmt, *, params: AuditLogFilterParams):
         if params.actor_user_id is not None:
             stmt = stmt.where(AuditLog.actor_user_id == params.actor_user_id)
 
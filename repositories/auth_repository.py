@@ -1,7 +1,9 @@
 import uuid
-from sqlalchemy.orm import Session, selectinload
-from sqlalchemy import select
+from sqlalchemy.orm import Session
+from sqlalchemy import select, func, distinct, update
 
+from models.associations import user_roles, role_permissions
+from models.permission import Permission
 from models.user import User
 from models.role import Role
 
@@ -11,49 +13,104 @@ class AuthRepository:
         stmt = select(User).where(User.email == email)
         return db.execute(stmt).scalars().first()
 
+    def update_password_hash_if_unchanged(
+            self, db: Session, *, user_id: uuid.UUID, old_hash: str, new_hash: str
+    ) -> bool:
+        """
+        Compare-and-set hashed_password (rehash-on-login):
+        - chỉ ghi nếu hash vẫn là hash đã verify => không đè password vừa đổi bởi request khác
+
+        :return: True nếu đã update
+        """
+        stmt = (
+            update(User)
+            .where(User.id == user_id, User.hashed_password == old_hash)
+            .values(hashed_password=new_hash)
+            .execution_options(synchronize_session=False)
+        )
+        return db.execute(stmt).rowcount == 1
+
     def get_authz_snapshot(
             self, db: Session, user_id: uuid.UUID
     ) -> tuple[list[str], list[str], int]:
         """
-        Load user + authz relations, then build a snapshot:
-        - roles: list[str]
+        Build authz snapshot in ONE query (no ORM hydration / identity-map work):
+        users -> user_roles -> roles -> role_permissions -> permissions, aggregated per user
+
+        - roles: list[str] (sorted, unique)
         - permissions: list[str] (sorted, unique)
         - token_version: int (0: user not found/disabled/deleted, >=1: valid authentication state)
         """
-        stmt = (
-            select(User)
-            .where(User.id == user_id)
-            .options(
-                selectinload(User.roles).selectinload(Role.permissions)
+        stmt = self._authz_snapshot_stmt(user_id)
+        return self._to_authz_snapshot(db.execute(stmt).one_or_none())
+
+    def get_token_version(self, db: Session, user_id: uuid.UUID) -> int:
+        """
+        Chỉ đọc token_version + trạng thái user qua PK index (không join roles/permissions)
+
+        :return: 0 nếu user not found/disabled/deleted, >=1 nếu hợp lệ (cùng contract với snapshot)
+        """
+        return self._to_token_version(db.execute(self._token_version_stmt(user_id)).one_or_none())
+
+    # ===== Private helpers =====
+    @staticmethod
+    def _token_version_stmt(user_id: uuid.UUID):
+        return select(User.token_version, User.is_active, User.is_deleted).where(User.id == user_id)
+
+    @staticmethod
+    def _to_token_version(row) -> int:
+        if row is None:
+            return 0
+        token_version, is_active, is_deleted = row
+        if bool(is_deleted) or not bool(is_active):
+            return 0
+        return int(token_version or 1)
+
+    @classmethod
+    def _authz_snapshot_stmt(cls, user_id: uuid.UUID):
+        return (
+            select(
+                User.token_version,
+                User.is_active,
+                User.is_deleted,
+                cls._aggregate(Role.name),
+                cls._aggregate(Permission.code),
             )
+            .select_from(User)
+            .outerjoin(user_roles, user_roles.c.user_id == User.id)
+            .outerjoin(Role, Role.id == user_roles.c.role_id)
+            .outerjoin(role_permissions, role_permissions.c.role_id == Role.id)
+            .outerjoin(Permission, Permission.id == role_permissions.c.permission_id)
+            .where(User.id == user_id)
+            .group_by(User.id)
         )
-        user = db.execute(stmt).scalars().first()
 
-        # Single source of truth deciding authentication validity
-        is_deleted = bool(getattr(user, "is_deleted", False))
-        is_active = bool(getattr(user, "is_active", True))
-        if not user or is_deleted or not is_active:
+    @classmethod
+    def _to_authz_snapshot(cls, row) -> tuple[list[str], list[str], int]:
+        if row is None:
             # Service/guards layer decides what to raise
             return [], [], 0
 
-        roles, permissions = self._build_authz_snapshot(user)
-        token_version = getattr(user, "token_version", 1)
-
-        return roles, permissions, token_version
+        token_version, is_active, is_deleted, roles_agg, permissions_agg = row
 
-    # ===== Private helpers =====
-    def _build_authz_snapshot(self, user: User) -> tuple[list[str], list[str]]:
-        """
-        Build authz snapshot from ORM relationships (domain flattening)
-        """
-        roles_rel: list[Role] = user.roles
+        # Single source of truth deciding authentication validity
+        if bool(is_deleted) or not bool(is_active):
+            return [], [], 0
 
-        role_names: list[str] = [r.name for r in roles_rel]
+        roles = cls._flatten_aggregate(roles_agg)
+        permissions = cls._flatten_aggregate(permissions_agg)
+        return roles, permissions, int(token_version or 1)
 
-        permission_codes: set[str] = set()
-        for role in roles_rel:
-            for perm in role.permissions:
-                permission_codes.add(perm.code)
+    @staticmethod
+    def _aggregate(column):
+        # array_agg(DISTINCT col) -> text[] (NULL từ outer join bị filter)
+        return func.array_agg(distinct(column)).filter(column.is_not(None))
 
-        permission_list: list[str] = sorted(permission_codes)
-        return role_names, permission_list
+    @staticmethod
+    def _flatten_aggregate(value) -> list[str]:
+        """
+        Normalize aggregate result (list | None) -> sorted unique list
+        """
+        if not value:
+            return []
+        return sorted({str(v) for v in value if v})
@@ -1,15 +1,255 @@
-from typing import Any, Generic, Type, TypeVar, Mapping, Sequence, cast, List
-from sqlalchemy import select, func, Select, ColumnElement
+from typing import Any, Generic, Iterator, Type, TypeVar, Mapping, Sequence, cast, List
+from sqlalchemy import RowMapping, select, func, Select, ColumnElement, and_, or_, false, literal
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.orm import Session
 
-from core.http.pagination import PageParams, PageMeta
+from core.exceptions.pagination_exceptions import InvalidCursorException
+from core.http.cursor import decode_cursor, encode_cursor, sort_signature
+from core.http.export import EXPORT_BATCH_SIZE, ExportRows
+from core.http.pagination import CursorParams, PageParams, PageMeta, TotalMode
 from core.http.sorting import SortSpec
+from core.utils.query_estimate import estimate_row_count
 from models.base import Base
 
 ModelType = TypeVar("ModelType", bound=Base)
 
+# (field, column, is_desc) - sort key dùng cho keyset paging
+KeysetKey = tuple[str, Any, bool]
+
+
+class RepositoryQueryMixin(Generic[ModelType]):
+    """
+    Statement builders dùng chung cho sync / async repository (không chạm DB):
+    paging, sort allowlist, soft-delete filter, PageMeta
+    """
+    model: Type[ModelType]
+
+    # -------- GENERIC QUERY HELPERS (for search) --------
+    def apply_paging(self, stmt: Select, *, page: PageParams) -> Select:
+        return stmt.offset(page.offset).limit(page.limit)
+
+    def build_page_meta(
+            self, *, total: int | None, page: PageParams, has_next: bool | None = None
+    ) -> PageMeta:
+        return PageMeta.from_total(
+            total=total,
+            page=page.page,
+            page_size=page.page_size,
+            total_mode=page.total_mode,
+            has_next=has_next,
+        )
+
+    def _apply_offset_page(self, stmt: Select, *, page: PageParams) -> Select:
+        stmt = self.apply_paging(stmt, page=page)
+        if page.needs_probe_row:
+            # total không chính xác => thêm 1 row để xác định has_next
+            stmt = stmt.limit(page.limit + 1)
+        return stmt
+
+    def _build_offset_page(
+            self, rows: Sequence[ModelType], *, total: int | None, page: PageParams
+    ) -> tuple[List[ModelType], PageMeta]:
+        if not page.needs_probe_row:
+            return list(rows), self.build_page_meta(total=total, page=page)
+
+        items = list(rows[:page.limit])
+        meta = self.build_page_meta(total=total, page=page, has_next=len(rows) > page.limit)
+        return items, meta
+
+    def apply_sort(
+            self,
+            stmt: Select,
+            *,
+            sorts: Sequence[SortSpec] | None,
+            allowed_sort_fields: Mapping[str, ColumnElement[Any]],
+            default_sorts: Sequence[SortSpec] | None = None,
+    ) -> Select:
+
+        # 1) sort specs (new style)
+        if sorts:
+            stmt = self._apply_sort_specs(
+                stmt,
+                sorts=sorts,
+                allowed_sort_fields=allowed_sort_fields
+            )
+            return stmt
+
+        # 2) defaults
+        if default_sorts:
+            stmt = self._apply_sort_specs(
+                stmt,
+                sorts=default_sorts,
+                allowed_sort_fields=allowed_sort_fields
+            )
+            return stmt
+
+        # 3) safe fallback (only if field exists in allowlist)
+        fallback = SortSpec(field="created_at", direction="desc")
+        return self._apply_sort_specs(
+            stmt,
+            sorts=[fallback],
+            allowed_sort_fields=allowed_sort_fields
+        )
+
+    # -------- PROTECTED HELPERS --------
+
+    # ===== Soft-delete support (opt-in by model) =====
+    def _supports_soft_delete(self) -> bool:
+        return hasattr(self.model, "is_deleted")
+
+    def _apply_alive_filter(self, stmt: Select) -> Select:
+        if self._supports_soft_delete():
+            stmt = stmt.where(getattr(self.model, "is_deleted").is_(False))
+        return stmt
+
+    # ===== Sort =====
+    def _apply_sort_specs(
+            self,
+            stmt: Select,
+            *,
+            sorts: Sequence[SortSpec],
+            allowed_sort_fields: Mapping[str, ColumnElement[Any]],
+    ) -> Select:
+        for sp in sorts:
+            field = str(sp.field).strip()
+            if not field:
+                continue
+
+            col = allowed_sort_fields.get(field)
+            if col is None:
+                continue
+
+            stmt = stmt.order_by(col.desc() if sp.is_desc else col.asc())
+
+        return stmt
+
+    # ===== Keyset (cursor) paging =====
+    def _prepare_keyset(
+            self,
+            stmt: Select,
+            *,
+            page: CursorParams,
+            sorts: Sequence[SortSpec] | None,
+            allowed_sort_fields: Mapping[str, ColumnElement[Any]],
+            default_sorts: Sequence[SortSpec] | None,
+    ) -> tuple[Select, list[KeysetKey], str]:
+        """
+        Build keyset statement:
+        - sort key = sort specs hợp lệ (allowlist) + id tiebreaker (đảm bảo thứ tự toàn phần)
+        - cursor => WHERE (sort key) "sau" row cuối trang trước
+        - LIMIT page_size + 1 để biết còn trang sau (không COUNT)
+
+        :return: tuple[stmt, keys, signature]
+        """
+        keys = self._keyset_keys(
+            sorts=sorts, allowed_sort_fields=allowed_sort_fields, default_sorts=default_sorts,
+        )
+        signature = sort_signature([(field, desc) for field, _, desc in keys])
+
+        if page.cursor:
+            values = decode_cursor(page.cursor, signature=signature)
+            if len(values) != len(keys):
+                raise InvalidCursorException(reason="sort_mismatch")
+            stmt = stmt.where(self._keyset_predicate(keys, values))
+
+        for _, col, desc in keys:
+            stmt = stmt.order_by(self._keyset_order(col, desc))
+
+        return stmt.limit(page.limit + 1), keys, signature
+
+    def _build_keyset_page(
+            self,
+            rows: Sequence[ModelType],
+            *,
+            page: CursorParams,
+            keys: Sequence[KeysetKey],
+            signature: str,
+    ) -> tuple[List[ModelType], PageMeta]:
+        items = list(rows[:page.limit])
+        next_cursor: str | None = None
+        if len(rows) > page.limit and items:
+            last = items[-1]
+            next_cursor = encode_cursor(
+                signature=signature,
+                values=[getattr(last, col.key) for _, col, _ in keys],
+            )
+
+        meta = PageMeta.from_cursor(
+            page_size=page.page_size, next_cursor=next_cursor, has_prev=page.cursor is not None,
+        )
+        return items, meta
+
+    def _keyset_keys(
+            self,
+            *,
+            sorts: Sequence[SortSpec] | None,
+            allowed_sort_fields: Mapping[str, ColumnElement[Any]],
+            default_sorts: Sequence[SortSpec] | None,
+    ) -> list[KeysetKey]:
+        # Cùng thứ tự ưu tiên với apply_sort: sorts -> defaults -> created_at desc
+        specs = list(sorts or default_sorts or [SortSpec(field="created_at", direction="desc")])
+
+        keys: list[KeysetKey] = []
+        seen: set[str] = set()
+        for sp in specs:
+            field = str(sp.field).strip()
+            col = allowed_sort_fields.get(field)
+            if col is None or field in seen:
+                continue
+            keys.append((field, col, sp.is_desc))
+            seen.add(field)
+
+        if "id" not in seen:
+            # tiebreaker cùng chiều với key cuối để giữ index scan 1 chiều
+            keys.append(("id", getattr(self.model, "id"), keys[-1][2] if keys else False))
+        return keys
+
+    @staticmethod
+    def _keyset_order(col: Any, desc: bool) -> Any:
+        # Chuẩn hóa NULL ordering theo mặc định của Postgres (ASC: NULLS LAST, DESC: NULLS FIRST)
+        # => predicate keyset đúng trên mọi dialect
+        if not _is_nullable(col):
+            return col.desc() if desc else col.asc()
+        return col.desc().nulls_first() if desc else col.asc().nulls_last()
+
+    @staticmethod
+    def _keyset_predicate(keys: Sequence[KeysetKey], values: Sequence[Any]) -> Any:
+        """
+        (k1, k2, ..., id) > (v1, v2, ..., vid) theo từng chiều sort (hỗ trợ mixed asc/desc + NULL):
+        OR_i ( k1 = v1 AND ... AND k(i-1) = v(i-1) AND ki "after" vi )
+        """
+        branches = []
+        equals = []
+        for (_, col, desc), value in zip(keys, values):
+            if value is None:
+                # ASC nulls last: không có gì "sau" NULL ngoài các NULL khác (xử lý ở key tiếp theo)
+                after = col.is_not(None) if desc else None
+                equal = col.is_(None)
+            else:
+                # bind typed literal: cho phép so sánh >/< cả với Boolean column
+                bound = literal(value, type_=col.type)
+                after = col < bound if desc else col > bound
+                if not desc and _is_nullable(col):
+                    after = or_(after, col.is_(None))
+                equal = col == bound
+
+            if after is not None:
+                branches.append(and_(*equals, after))
+            equals.append(equal)
+
+        return or_(*branches) if branches else false()
+
+
+def _is_nullable(col: Any) -> bool:
+    expr = getattr(col, "expression", col)
+    return bool(getattr(expr, "nullable", True))
+
+
+class BaseRepository(RepositoryQueryMixin[ModelType]):
+    # Mặc định KHÔNG refresh sau write: server defaults đã về qua RETURNING (eager_defaults).
+    # Repo nào cần reload toàn bộ row (vd: trigger DB sửa cột khác) thì bật True.
+    refresh_after_write: bool = False
 
-class BaseRepository(Generic[ModelType]):
     def __init__(self, model: Type[ModelType]):
         self.model = model
 
@@ -54,10 +294,17 @@ class BaseRepository(Generic[ModelType]):
         return (db.execute(stmt).scalar_one() or 0) > 0
 
     # -------- WRITE --------
-    def create(self, db: Session, entity: ModelType) -> ModelType:
+    def create(
+            self,
+            db: Session,
+            entity: ModelType,
+            *,
+            refresh: bool | None = None,
+    ) -> ModelType:
         db.add(entity)
         db.flush()
-        db.refresh(entity)
+        if self._should_refresh(refresh):
+            db.refresh(entity)
         return entity
 
     def update(
@@ -66,7 +313,7 @@ class BaseRepository(Generic[ModelType]):
             entity: ModelType,
             data: dict[str, Any],
             *,
-            refresh: bool = True,
+            refresh: bool | None = None,
     ) -> ModelType:
         # Strict guard: do not update soft-deleted entity
         if hasattr(entity, "is_deleted") and bool(
@@ -77,7 +324,7 @@ class BaseRepository(Generic[ModelType]):
             setattr(entity, field, value)
 
         db.flush()
-        if refresh:
+        if self._should_refresh(refresh):
             db.refresh(entity)
         return entity
 
@@ -109,87 +356,36 @@ class BaseRepository(Generic[ModelType]):
         # fallback
         self.delete(db, entity)
 
-    # -------- GENERIC QUERY HELPERS (for search) --------
-    def apply_paging(self, stmt: Select, *, page: PageParams) -> Select:
-        return stmt.offset(page.offset).limit(page.limit)
+    def _insert_skip_conflict_stmt(self, *conflict_columns: Any) -> postgresql.Insert:
+        """
+        INSERT ... ON CONFLICT (conflict_columns) DO NOTHING cho bulk insert
+        (caller tự thêm .returning(...) và execute với list rows)
+        """
+        return postgresql.insert(self.model).on_conflict_do_nothing(index_elements=list(conflict_columns))
+
+    def _should_refresh(self, refresh: bool | None) -> bool:
+        return self.refresh_after_write if refresh is None else refresh
 
+    # -------- COUNT (for search) --------
     def count(self, db: Session, stmt: Select) -> int:
         # count(*) trên subquery để giữ đúng filter/join
         count_stmt = select(func.count()).select_from(stmt.subquery())
         return int(db.execute(count_stmt).scalar() or 0)
 
-    def build_page_meta(
-            self, *, total: int, page: PageParams
-    ) -> PageMeta:
-        return PageMeta.from_total(
-            total=total, page=page.page, page_size=page.page_size)
-
-    def apply_sort(
-            self,
-            stmt: Select,
-            *,
-            sorts: Sequence[SortSpec] | None,
-            allowed_sort_fields: Mapping[str, ColumnElement[Any]],
-            default_sorts: Sequence[SortSpec] | None = None,
-    ) -> Select:
-
-        # 1) sort specs (new style)
-        if sorts:
-            stmt = self._apply_sort_specs(
-                stmt,
-                sorts=sorts,
-                allowed_sort_fields=allowed_sort_fields
-            )
-            return stmt
-
-        # 2) defaults
-        if default_sorts:
-            stmt = self._apply_sort_specs(
-                stmt,
-                sorts=default_sorts,
-                allowed_sort_fields=allowed_sort_fields
-            )
-            return stmt
-
-        # 3) safe fallback (only if field exists in allowlist)
-        fallback = SortSpec(field="created_at", direction="desc")
-        return self._apply_sort_specs(
-            stmt,
-            sorts=[fallback],
-            allowed_sort_fields=allowed_sort_fields
-        )
-
-    # -------- PROTECTED HELPERS --------
-
-    # ===== Soft-delete support (opt-in by model) =====
-    def _supports_soft_delete(self) -> bool:
-        return hasattr(self.model, "is_deleted")
-
-    def _apply_alive_filter(self, stmt: Select) -> Select:
-        if self._supports_soft_delete():
-            stmt = stmt.where(getattr(self.model, "is_deleted").is_(False))
-        return stmt
-
-    # ===== Sort =====
-    def _apply_sort_specs(
-            self,
-            stmt: Select,
-            *,
-            sorts: Sequence[SortSpec],
-            allowed_sort_fields: Mapping[str, ColumnElement[Any]],
-    ) -> Select:
-        for sp in sorts:
-            field = str(sp.field).strip()
-            if not field:
-                continue
-
-            col = allowed_sort_fields.get(field)
-            if col is None:
-                continue
-
-            stmt = stmt.order_by(col.desc() if sp.is_desc else col.asc())
-
-        return stmt
+    def resolve_total(self, db: Session, stmt: Select, *, mode: TotalMode) -> int | None:
+        """
+        total theo total_mode:
+        - exact: COUNT(*) (chính xác, scan toàn bộ tập đã filter)
+        - estimate: planner estimate (Postgres), fallback COUNT nếu không ước lượng được
+        - none: không tính
+        """
+        if mode == "none":
+            return None
+        if mode == "estimate":
+            estimate = estimate_row_count(db, stmt)
+            if estimate is not None:
+                return estimate
+        return self.count(db, stmt)
 
     # ===== Common search pipeline =====
     def _execute_search(
@@ -197,21 +393,34 @@ class BaseRepository(Generic[ModelType]):
             *,
             db: Session,
             stmt: Select,
-            total: int,
-            page: PageParams,
+            total: int | None,
+            page: PageParams | CursorParams,
             sort_specs: Sequence[SortSpec] | None,
             allowed_sort_fields: Mapping[str, ColumnElement[Any]],
             default_sorts: Sequence[SortSpec],
-    ) -> tuple[List[ModelType], int, PageMeta]:
+    ) -> tuple[List[ModelType], int | None, PageMeta]:
         """
         Execute common search pipeline:
         - apply sort
-        - apply paging
+        - apply paging (offset, +1 probe row khi total_mode != exact)
+          hoặc keyset (CursorParams, total=None, không COUNT)
         - execute
         - build PageMeta
 
         :return: tuple[items, total, meta]
         """
+        if isinstance(page, CursorParams):
+            stmt, keys, signature = self._prepare_keyset(
+                stmt,
+                page=page,
+                sorts=sort_specs,
+                allowed_sort_fields=allowed_sort_fields,
+                default_sorts=default_sorts,
+            )
+            rows = cast(list[ModelType], db.execute(stmt).scalars().all())
+            items, meta = self._build_keyset_page(rows, page=page, keys=keys, signature=signature)
+            return items, None, meta
+
         stmt = self.apply_sort(
             stmt,
             sorts=sort_specs,
@@ -219,8 +428,46 @@ class BaseRepository(Generic[ModelType]):
             default_sorts=default_sorts,
         )
 
-        stmt = self.apply_paging(stmt, page=page)
+        stmt = self._apply_offset_page(stmt, page=page)
 
-        items = cast(list[ModelType], db.execute(stmt).scalars().all())
-        meta = self.build_page_meta(total=total, page=page)
+        rows = cast(list[ModelType], db.execute(stmt).scalars().all())
+        items, meta = self._build_offset_page(rows, total=total, page=page)
         return items, total, meta
+
+    # ===== Common export pipeline =====
+    def _execute_export(
+            self,
+            *,
+            db: Session,
+            stmt: Select,
+            columns: Sequence[Any],
+            sort_specs: Sequence[SortSpec] | None,
+            allowed_sort_fields: Mapping[str, ColumnElement[Any]],
+            default_sorts: Sequence[SortSpec],
+            batch_size: int = EXPORT_BATCH_SIZE,
+    ) -> ExportRows:
+        """
+        Stream toàn bộ kết quả đã filter (không paging / COUNT):
+        - stmt = select(*columns) + filters: Core rows, không hydrate ORM / identity map
+        - sort allowlist như search + id tiebreaker (thứ tự ổn định giữa các lần export)
+        - server-side cursor (stream_results + yield_per) => RAM ~ batch_size row
+
+        Rows lazy: statement chỉ chạy khi response bắt đầu stream (session request vẫn mở tới khi gửi xong)
+        """
+        keys = self._keyset_keys(
+            sorts=sort_specs, allowed_sort_fields=allowed_sort_fields, default_sorts=default_sorts,
+        )
+        for _, col, desc in keys:
+            stmt = stmt.order_by(col.desc() if desc else col.asc())
+
+        stmt = stmt.execution_options(stream_results=True, yield_per=batch_size)
+        return ExportRows(columns=tuple(col.key for col in columns), rows=self._stream_rows(db, stmt))
+
+    @staticmethod
+    def _stream_rows(db: Session, stmt: Select) -> Iterator[RowMapping]:
+        result = db.execute(stmt)
+        try:
+            for partition in result.mappings().partitions():
+                yield from partition
+        finally:
+            result.close()
@@ -1,12 +1,35 @@
 import uuid
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Final
 
-from sqlalchemy import delete, select, or_
+from sqlalchemy import String, case, delete, func, literal_column, select, update
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import Session
 
 from core.utils.datetime_utils import utcnow
 from models.refresh_session import RefreshSession
+from models.user import User
+
+
+@dataclass(frozen=True)
+class RotatedSession:
+    """
+    Kết quả rotate (1 statement):
+    - token_version: 0 nếu user disabled/deleted (cùng contract với AuthRepository.get_authz_snapshot)
+    """
+    session_id: uuid.UUID
+    user_id: uuid.UUID
+    token_version: int
+
+
+@dataclass(frozen=True)
+class ReusedTokenFamily:
+    """
+    Family (session) bị revoke vì token_hash đã rotate được dùng lại
+    """
+    session_id: uuid.UUID
+    user_id: uuid.UUID
 
 
 class RefreshSessionRepository:
@@ -83,38 +106,109 @@ class RefreshSessionRepository:
             old_token_hash: str,
             new_token_hash: str,
             new_expires_at: datetime,
+            history_size: int = 0,
             now: datetime | None = None,
-    ) -> RefreshSession | None:
+    ) -> RotatedSession | None:
         """
-        Rotate refresh token theo pattern enterprise:
-        - Lock row theo old_token_hash (FOR UPDATE) để tránh concurrent refresh
-        - Nếu session không còn active -> return None
-        - Update token_hash + expires_at + rotated_at + updated_at
+        Rotate refresh token trong 1 round-trip (atomic, không SELECT ... FOR UPDATE):
+            UPDATE refresh_sessions SET token_hash, expires_at = LEAST(new, absolute), rotated_at, updated_at
+            WHERE token_hash = old AND active
+            RETURNING id, user_id, (SELECT token_version | 0 nếu disabled FROM users WHERE id = user_id)
+
+        - token_version lấy qua correlated subquery theo PK (không cần UPDATE ... FROM users)
+        - history_size > 0: old_token_hash vào ring previous_token_hashes trong cùng statement
+          (reuse detection không tốn thêm round-trip ở path bình thường)
 
-        Lưu ý: rotate theo kiểu "update-in-place" (1 row)
+        - Concurrent refresh cùng token: row lock của UPDATE => chỉ 1 request match old_token_hash
+        - Session không còn active / không tồn tại -> return None
         Do token_hash unique, new_token_hash phải chưa tồn tại
         """
         now = now or utcnow()
 
-        # Lock & validate session
-        current = self.get_active_by_token_hash(
-            db,
-            token_hash=old_token_hash,
-            now=now,
-            for_update=True,
+        values: dict = {
+            "token_hash": new_token_hash,
+            # Gia hạn expires_at nhưng KHÔNG vượt quá absolute_expires_at
+            "expires_at": func.least(new_expires_at, RefreshSession.absolute_expires_at),
+            "rotated_at": now,
+            "updated_at": now,
+        }
+        if history_size > 0:
+            values["previous_token_hashes"] = self._push_previous_hash(old_token_hash, history_size=history_size)
+
+        stmt = (
+            update(RefreshSession)
+            .where(
+                RefreshSession.token_hash == old_token_hash,
+                RefreshSession.revoked_at.is_(None),
+                RefreshSession.expires_at > now,
+                RefreshSession.absolute_expires_at > now,
+            )
+            .values(values)
+            .returning(RefreshSession.id, RefreshSession.user_id, self._token_version_subquery())
+            .execution_options(synchronize_session=False)
         )
-        if not current:
+
+        row = db.execute(stmt).one_or_none()
+        if row is None:
             return None
 
-        # Update tại chỗ
-        current.token_hash = new_token_hash
-        current.rotated_at = now
-        current.updated_at = now
-        # Gia hạn expires_at nhưng KHÔNG vượt quá absolute_expires_at
-        current.expires_at = min(new_expires_at, current.absolute_expires_at)
+        session_id, user_id, token_version = row
+        return RotatedSession(session_id=session_id, user_id=user_id, token_version=int(token_version or 0))
 
-        db.flush()
-        return current
+    def revoke_family_by_reused_hash(
+            self,
+            db: Session,
+            *,
+            token_hash: str,
+            now: datetime | None = None,
+    ) -> ReusedTokenFamily | None:
+        """
+        Chỉ gọi khi rotate thất bại: token_hash nằm trong ring của 1 session => token đã rotate bị dùng lại
+        (attacker hoặc client hợp lệ giữ token cũ) => revoke cả family (session hiện tại của cả 2 bên).
+
+        1 statement, lookup qua GIN index (previous_token_hashes @> ARRAY[:hash]).
+        Session đã revoke trước đó vẫn match (giữ revoked_at cũ) để audit reuse.
+        """
+        now = now or utcnow()
+
+        stmt = (
+            update(RefreshSession)
+            .where(self._has_previous_hash(token_hash))
+            .values(
+                revoked_at=func.coalesce(RefreshSession.revoked_at, now),
+                updated_at=now,
+            )
+            .returning(RefreshSession.id, RefreshSession.user_id)
+            .execution_options(synchronize_session=False)
+        )
+        row = db.execute(stmt).first()
+        if row is None:
+            return None
+        return ReusedTokenFamily(session_id=row[0], user_id=row[1])
+
+    @staticmethod
+    def _push_previous_hash(token_hash: str, *, history_size: int):
+        # (array_prepend(:hash, previous_token_hashes))[1:N] - mới nhất trước, ring giới hạn N phần tử
+        column = RefreshSession.previous_token_hashes
+        return func.array_prepend(token_hash, column, type_=ARRAY(String(255)))[1:history_size]
+
+    @staticmethod
+    def _has_previous_hash(token_hash: str):
+        # previous_token_hashes @> ARRAY[:hash] (GIN index)
+        return RefreshSession.previous_token_hashes.contains([token_hash])
+
+    @staticmethod
+    def _token_version_subquery():
+        return (
+            select(
+                case(
+                    (User.is_active.is_(True) & User.is_deleted.is_(False), User.token_version),
+                    else_=0,
+                )
+            )
+            .where(User.id == RefreshSession.user_id)
+            .scalar_subquery()
+        )
 
     # Revoke
     def revoke_by_token_hash(
@@ -151,57 +245,51 @@ class RefreshSessionRepository:
             now: datetime | None = None,
     ) -> int:
         """
-        Revoke tất cả session của 1 user (logout all devices)
+        Revoke tất cả session của 1 user (logout all devices) - set-based, 1 statement
+        (không load từng row FOR UPDATE vào ORM)
         Return: số session bị revoke
         """
         now = now or utcnow()
 
         stmt = (
-            select(RefreshSession)
+            update(RefreshSession)
             .where(
                 RefreshSession.user_id == user_id,
                 RefreshSession.revoked_at.is_(None),
             )
-            .with_for_update()
+            .values(revoked_at=now, updated_at=now)
+            .execution_options(synchronize_session=False)
         )
-
-        sessions = db.execute(stmt).scalars().all()
-        if not sessions:
-            return 0
-
-        for s in sessions:
-            s.revoked_at = now
-            s.updated_at = now
-
-        db.flush()
-        return len(sessions)
+        return db.execute(stmt).rowcount
 
     # Cleanup
-    def delete_expired_sessions(
+    def delete_expired_batch(
             self,
             db: Session,
             *,
             before: datetime | None = None,
+            batch_size: int = 1000,
     ) -> int:
         """
-        Dọn dẹp session hết hạn (enterprise chạy cron/job)
+        Xóa tối đa batch_size session hết hạn (caller commit sau mỗi batch => lock ngắn, RAM phẳng).
+        Chạy lặp tới khi return < batch_size - xem scripts/purge_refresh_sessions.py
+
+        - expires_at luôn <= absolute_expires_at (create + rotate LEAST) => chỉ cần điều kiện expires_at
+          (dùng được ix_refresh_sessions_expires_at)
+        - DELETE ... WHERE ctid = ANY(ARRAY(SELECT ctid ... LIMIT n FOR UPDATE SKIP LOCKED))
+          (TID scan, bỏ qua row đang bị refresh/logout giữ lock)
         Return: số session bị xóa
         """
         before = before or utcnow()
 
-        # Lấy danh sách id cần xóa
-        id_stmt = select(RefreshSession.id).where(
-            or_(
-                RefreshSession.expires_at <= before,
-                RefreshSession.absolute_expires_at <= before
-            )
+        ctid = literal_column("ctid")
+        batch = (
+            select(ctid)
+            .select_from(RefreshSession)
+            .where(RefreshSession.expires_at <= before)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
         )
-        ids = db.execute(id_stmt).scalars().all()
-        if not ids:
-            return 0
-
-        # Xóa theo ids (an toàn, không phụ thuộc rowcount)
-        del_stmt = delete(RefreshSession).where(RefreshSession.id.in_(ids))
-        db.execute(del_stmt)
+        stmt = delete(RefreshSession).where(ctid == func.any(func.array(batch.scalar_subquery())))
 
-        return len(ids)
+        return db.execute(stmt.execution_options(synchronize_session=False)).rowcount
@@ -1,11 +1,38 @@
+from datetime import datetime
+from typing import Any, Collection, Mapping, Sequence
+
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from core.http.export import ExportRows
+from core.http.pagination import PageMeta
+from core.http.sorting import SortSpec, parse_sort
+from core.search.constants import RELEVANCE_SORT_FIELD
+from core.search.keyword import keyword_filter, keyword_similarity
 from models.student import Student
 from repositories.base_repository import BaseRepository
+from schemas.request.student_schema import StudentExportParams, StudentFilterParams, StudentSearchParams
 
 
 class StudentRepository(BaseRepository[Student]):
+    # Whitelist field cho sort (tránh sort injection)
+    _SORT_FIELDS: dict[str, Any] = {
+        "id": Student.id,
+        "full_name": Student.full_name,
+        "age": Student.age,
+        "email": Student.email,
+        "created_at": Student.created_at,
+        "updated_at": Student.updated_at,
+    }
+    _EXPORT_COLUMNS = (
+        Student.id,
+        Student.full_name,
+        Student.age,
+        Student.email,
+        Student.phone_number,
+        Student.created_at,
+        Student.updated_at,
+    )
 
     def __init__(self):
         super().__init__(Student)
@@ -14,26 +41,104 @@ class StudentRepository(BaseRepository[Student]):
         stmt = select(Student).where(Student.email == email)
         return db.execute(stmt).scalars().first()
 
+    def existing_emails(self, db: Session, emails: Collection[str]) -> set[str]:
+        """
+        1 query set-based cho cả batch (thay vì get_by_email từng row)
+        """
+        if not emails:
+            return set()
+        stmt = select(Student.email).where(Student.email.in_(list(emails)))
+        return set(db.execute(stmt).scalars().all())
+
+    def insert_many_skip_existing(self, db: Session, rows: Sequence[dict[str, Any]]) -> set[str]:
+        """
+        Bulk insert, bỏ qua row trùng email (race với request khác sau bước existing_emails):
+        INSERT ... ON CONFLICT (email) DO NOTHING RETURNING email
+        - executemany => SQLAlchemy "insertmanyvalues" gộp thành multi-row INSERT (chia page theo giới hạn bind)
+        - Không hydrate ORM object
+
+        :return: email của các row đã insert
+        """
+        if not rows:
+            return set()
+        stmt = self._insert_skip_conflict_stmt(Student.email).returning(Student.email)
+        return set(db.execute(stmt, list(rows)).scalars().all())
+
     def search(
             self,
             db: Session,
             *,
-            keyword: str | None = None,
-            min_age: int | None = None,
-            max_age: int | None = None,
-            offset: int = 0,
-            limit: int = 100,
-    ) -> list[Student]:
+            params: StudentSearchParams,
+    ) -> tuple[list[Student], int | None, PageMeta]:
+        """
+        Search students (keyword / age range / created range) với paging + sort allowlist
+
+        :return: tuple[items, total, meta]
+        """
         stmt = select(Student)
+        stmt = self._apply_filters(stmt, params)
+
+        total = None if params.is_cursor_mode else self.resolve_total(db, stmt, mode=params.total_mode)
+
+        # Build PageParams | CursorParams (cursor mode: keyset, không COUNT)
+        page_params = params.to_page_params()
+        sort_specs = parse_sort(params.sort) if params.sort else None
 
+        return self._execute_search(
+            db=db,
+            stmt=stmt,
+            total=total,
+            page=page_params,
+            sort_specs=sort_specs,
+            allowed_sort_fields=self._sort_fields(params),
+            default_sorts=[SortSpec(field="created_at", direction="desc")],
+        )
+
+    def export(self, db: Session, *, params: StudentExportParams) -> ExportRows:
+        """
+        Stream students theo cùng filters / sort allowlist với search
+        """
+        stmt = select(*self._EXPORT_COLUMNS)
+        stmt = self._apply_filters(stmt, params)
+
+        return self._execute_export(
+            db=db,
+            stmt=stmt,
+            columns=self._EXPORT_COLUMNS,
+            sort_specs=parse_sort(params.sort) if params.sort else None,
+            allowed_sort_fields=self._sort_fields(params),
+            default_sorts=[SortSpec(field="created_at", direction="desc")],
+        )
+
+    # ===== Internal helpers =====
+    @classmethod
+    def _sort_fields(cls, params: StudentFilterParams) -> Mapping[str, Any]:
+        # relevance chỉ có nghĩa khi có keyword (schema đã validate sort=relevance cần keyword)
+        keyword = getattr(params, "keyword", None)
+        if not keyword:
+            return cls._SORT_FIELDS
+        return {**cls._SORT_FIELDS, RELEVANCE_SORT_FIELD: keyword_similarity(Student.full_name, keyword)}
+
+    @staticmethod
+    def _apply_filters(stmt, params: StudentFilterParams):
+        # Keyword search - full_name contains (GIN trigram index ix_students_full_name_trgm trên Postgres)
+        keyword = getattr(params, "keyword", None)
         if keyword:
-            stmt = stmt.where(Student.full_name.ilike(f"%{keyword}%"))
+            stmt = stmt.where(keyword_filter(Student.full_name, keyword))
 
+        min_age: int | None = getattr(params, "min_age", None)
+        max_age: int | None = getattr(params, "max_age", None)
         if min_age is not None:
             stmt = stmt.where(Student.age >= min_age)
-
         if max_age is not None:
             stmt = stmt.where(Student.age <= max_age)
 
-        stmt = stmt.offset(offset).limit(limit)
-        return list(db.execute(stmt).scalars().all())
+        # created_at range
+        created_from: datetime | None = getattr(params, "created_from", None)
+        created_to: datetime | None = getattr(params, "created_to", None)
+        if created_from:
+            stmt = stmt.where(Student.created_at >= created_from)
+        if created_to:
+            stmt = stmt.where(Student.created_at <= created_to)
+
+        return stmt
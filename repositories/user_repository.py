@@ -1,14 +1,19 @@
 from datetime import datetime
-from typing import Any
+from typing import Any, Collection, Mapping, Sequence
 
-from sqlalchemy import select, or_
+from sqlalchemy import RowMapping, insert, select
 from sqlalchemy.orm import Session
 
-from core.http.pagination import PageMeta, PageParams
+from core.http.export import ExportRows
+from core.http.pagination import PageMeta
 from core.http.sorting import SortSpec, parse_sort
+from core.search.constants import RELEVANCE_SORT_FIELD
+from core.search.keyword import keyword_filter, keyword_similarity
+from models.associations import user_roles
+from models.role import Role
 from models.user import User
 from repositories.base_repository import BaseRepository
-from schemas.request.user_schema import UserSearchParams
+from schemas.request.user_schema import UserExportParams, UserFilterParams, UserSearchParams
 
 
 class UserRepository(BaseRepository[User]):
@@ -20,6 +25,8 @@ class UserRepository(BaseRepository[User]):
         "created_at": User.created_at,
         "updated_at": User.updated_at,
     }
+    # Cột export (không bao giờ export hashed_password)
+    _EXPORT_COLUMNS = (User.id, User.email, User.is_active, User.created_at, User.updated_at)
 
     def __init__(self):
         super().__init__(User)
@@ -34,12 +41,49 @@ class UserRepository(BaseRepository[User]):
         stmt = self._apply_alive_filter(stmt)  # exclude soft-deleted
         return db.execute(stmt.limit(1)).scalar_one_or_none() is not None
 
+    def existing_emails(self, db: Session, emails: Collection[str]) -> set[str]:
+        """
+        1 query set-based cho cả batch. Tính cả user đã soft-delete (unique constraint trên users.email)
+        """
+        if not emails:
+            return set()
+        stmt = select(User.email).where(User.email.in_(list(emails)))
+        return set(db.execute(stmt).scalars().all())
+
+    def role_ids_by_name(self, db: Session, names: Collection[str]) -> dict[str, int]:
+        if not names:
+            return {}
+        stmt = select(Role.name, Role.id).where(Role.name.in_(list(names)))
+        return {name: role_id for name, role_id in db.execute(stmt).all()}
+
+    def insert_many_skip_existing(self, db: Session, rows: Sequence[dict[str, Any]]) -> dict[str, RowMapping]:
+        """
+        Bulk insert users: INSERT ... ON CONFLICT (email) DO NOTHING RETURNING <cột UserOut>
+        - executemany => "insertmanyvalues" gộp thành multi-row INSERT
+        - Không hydrate ORM object (id: default uuid4 phía Python, timestamps: server default)
+
+        :return: email -> row đã insert (id, email, is_active, created_at, updated_at)
+        """
+        if not rows:
+            return {}
+        stmt = self._insert_skip_conflict_stmt(User.email).returning(*self._EXPORT_COLUMNS)
+        return {row["email"]: row for row in db.execute(stmt, list(rows)).mappings().all()}
+
+    def insert_role_assignments(self, db: Session, rows: Sequence[dict[str, Any]]) -> int:
+        """
+        Bulk insert user_roles (user_id, role_id) - 1 executemany
+        """
+        if not rows:
+            return 0
+        db.execute(insert(user_roles), list(rows))
+        return len(rows)
+
     def search(
             self,
             db: Session,
             *,
             params: UserSearchParams,
-    ) -> tuple[list[User], int, PageMeta]:
+    ) -> tuple[list[User], int | None, PageMeta]:
         """
         Searches for users based on the specified parameters, applying various filters,
         sorting, and pagination to the data.
@@ -57,10 +101,10 @@ class UserRepository(BaseRepository[User]):
         stmt = self._apply_alive_filter(stmt)
         stmt = self._apply_filters(stmt, params)
 
-        total = self.count(db, stmt)
+        total = None if params.is_cursor_mode else self.resolve_total(db, stmt, mode=params.total_mode)
 
-        # Build PageParams
-        page_params = PageParams(page=params.page, page_size=params.page_size)
+        # Build PageParams | CursorParams (cursor mode: keyset, không COUNT)
+        page_params = params.to_page_params()
 
         # Enterprise style sort string: sort="created_at,-email"
         sort_specs = parse_sort(params.sort) if params.sort else None
@@ -72,22 +116,47 @@ class UserRepository(BaseRepository[User]):
             total=total,
             page=page_params,
             sort_specs=sort_specs,
-            allowed_sort_fields=self._SORT_FIELDS,
+            allowed_sort_fields=self._sort_fields(params),
+            default_sorts=[SortSpec(field="created_at", direction="desc")],
+        )
+
+    def export(self, db: Session, *, params: UserExportParams) -> ExportRows:
+        """
+        Stream users (alive-only) theo cùng filters / sort allowlist với search
+        """
+        stmt = select(*self._EXPORT_COLUMNS)
+        stmt = self._apply_alive_filter(stmt)
+        stmt = self._apply_filters(stmt, params)
+
+        return self._execute_export(
+            db=db,
+            stmt=stmt,
+            columns=self._EXPORT_COLUMNS,
+            sort_specs=parse_sort(params.sort) if params.sort else None,
+            allowed_sort_fields=self._sort_fields(params),
             default_sorts=[SortSpec(field="created_at", direction="desc")],
         )
 
     # ===== Internal helpers =====
-    def _apply_filters(self, stmt, params: UserSearchParams):
+    @classmethod
+    def _sort_fields(cls, params: UserFilterParams) -> Mapping[str, Any]:
+        # relevance chỉ có nghĩa khi có keyword (schema đã validate sort=relevance cần q)
+        q = getattr(params, "q", None)
+        if not q:
+            return cls._SORT_FIELDS
+        return {**cls._SORT_FIELDS, RELEVANCE_SORT_FIELD: keyword_similarity(User.email, str(q).strip())}
+
+    @staticmethod
+    def _apply_filters(stmt, params: UserFilterParams):
         # Filter exact email
         email = getattr(params, "email", None)
         if email:
             stmt = stmt.where(User.email == email)
 
-        # Keyword search (q) - search email
+        # Keyword search (q) - email contains (GIN trigram index ix_users_email_trgm trên Postgres)
         q = getattr(params, "q", None)
         if q:
-            like = f"%{str(q).strip()}%"
-            stmt = stmt.where(or_(User.email.ilike(like)))
+            stmt = stmt.where(keyword_filter(User.email, str(q).strip()))
 
         is_active = getattr(params, "is_active", None)
         if is_active is not None:
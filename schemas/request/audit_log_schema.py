@@ -2,16 +2,15 @@ import uuid
 from typing import Any, ClassVar
 from pydantic import Field, field_validator
 
-from schemas.request.search_common import PagedSortParams, CreatedRangeParams, StrictSortParams
+from schemas.request.search_common import ExportParams, PagedSortParams, CreatedRangeParams, StrictSortParams
 
 
-class AuditLogSearchParams(PagedSortParams, StrictSortParams, CreatedRangeParams):
+class AuditLogFilterParams(CreatedRangeParams):
     """
-    Search params for audit logs.
-    Mirrors AuditLogRepository.search() filters + paging/sort.
+    Filters + sort allowlist for audit logs.
+    Mirrors AuditLogRepository._apply_filters() (shared by search / export).
     """
 
-    MAX_PAGE_SIZE: ClassVar[int] = 100
     ALLOWED_SORT_FIELDS: ClassVar[set[str]] = {
         "id",
         "created_at",
@@ -45,3 +44,18 @@ class AuditLogSearchParams(PagedSortParams, StrictSortParams, CreatedRangeParams
             return None
         s = str(v).strip()
         return s or None
+
+
+class AuditLogSearchParams(AuditLogFilterParams, PagedSortParams, StrictSortParams):
+    """
+    Search params for audit logs.
+    Mirrors AuditLogRepository.search() filters + paging/sort.
+    """
+
+    MAX_PAGE_SIZE: ClassVar[int] = 100
+
+
+class AuditLogExportParams(AuditLogFilterParams, ExportParams, StrictSortParams):
+    """
+    Export params for audit logs (stream NDJSON / CSV, same filters + sort, no paging).
+    """
@@ -2,6 +2,11 @@ from datetime import datetime
 from typing import Any, ClassVar
 from pydantic import BaseModel, Field, field_validator, model_validator
 
+from core.exceptions.pagination_exceptions import InvalidPageSizeException, InvalidSortException
+from core.http.export import ExportFormat
+from core.http.pagination import MAX_PAGE_SIZE as PAGE_SIZE_LIMIT, CursorParams, PageParams, PagingMode, TotalMode
+from core.search.constants import RELEVANCE_SORT_FIELD
+
 
 def _parse_dt(v: Any) -> datetime | None:
     """
@@ -35,8 +40,30 @@ class PagedSortParams(BaseModel):
         default=None,
         description='Sort spec, e.g. "created_at,-id" (comma-separated)',
     )
+    paging_mode: PagingMode = Field(
+        default="offset",
+        description='"offset" (page + total) | "cursor" (keyset, no total; dùng meta.next_cursor)',
+    )
+    cursor: str | None = Field(
+        default=None,
+        description="Opaque cursor from previous page (implies paging_mode=cursor)",
+    )
+    total_mode: TotalMode = Field(
+        default="exact",
+        description='"exact" (COUNT) | "estimate" (planner estimate) | "none" (no total, chỉ has_next)',
+    )
 
-    MAX_PAGE_SIZE: ClassVar[int] = 200
+    # Schema con chỉ được hạ thấp (PageParams / CursorParams chặn ở PAGE_SIZE_LIMIT)
+    MAX_PAGE_SIZE: ClassVar[int] = PAGE_SIZE_LIMIT
+
+    @property
+    def is_cursor_mode(self) -> bool:
+        return self.paging_mode == "cursor"
+
+    def to_page_params(self) -> PageParams | CursorParams:
+        if self.is_cursor_mode:
+            return CursorParams(page_size=self.page_size, cursor=self.cursor)
+        return PageParams(page=self.page, page_size=self.page_size, total_mode=self.total_mode)
 
     @field_validator("page", mode="before")
     @classmethod
@@ -60,10 +87,38 @@ class PagedSortParams(BaseModel):
     @classmethod
     def enforce_page_size_limit(cls, v: int) -> int:
         # Enforce limit in one place, but configurable per schema via class attr
-        if v > int(getattr(cls, "MAX_PAGE_SIZE", 200)):
-            raise ValueError(f">>>>> page_size must be <= {int(getattr(cls, 'MAX_PAGE_SIZE', 200))}")
+        # BusinessException (không phải ValueError) => 400 thay vì ValidationError (500) trong Depends()
+        limit = min(int(getattr(cls, "MAX_PAGE_SIZE", PAGE_SIZE_LIMIT)), PAGE_SIZE_LIMIT)
+        if v > limit:
+            raise InvalidPageSizeException(page_size=v, max_page_size=limit)
         return v
 
+    @field_validator("cursor", mode="before")
+    @classmethod
+    def normalize_cursor(cls, v: Any) -> str | None:
+        if v is None:
+            return None
+        s = str(v).strip()
+        return s or None
+
+    @model_validator(mode="after")
+    def infer_paging_mode(self):
+        # Có cursor => chắc chắn là cursor mode (client chỉ cần gửi lại next_cursor)
+        if self.cursor:
+            self.paging_mode = "cursor"
+        return self
+
+
+class ExportParams(BaseModel):
+    """
+    Params cho endpoint /export (stream toàn bộ kết quả filter, không paging / COUNT)
+    """
+    format: ExportFormat = Field(default="ndjson", description='"ndjson" | "csv"')
+    sort: str | None = Field(
+        default=None,
+        description='Sort spec, e.g. "created_at,-id" (comma-separated)',
+    )
+
 
 class StrictSortParams(BaseModel):
     """
@@ -89,23 +144,53 @@ class StrictSortParams(BaseModel):
             return self
 
         allowed = set(getattr(self.__class__, "ALLOWED_SORT_FIELDS", set()))
+        # Lỗi cấu hình schema (server) => giữ ValueError (500); lỗi input client => InvalidSortException (400)
         if not allowed:
             raise ValueError(">>>>> ALLOWED_SORT_FIELDS is not configured for strict sort validation")
 
         parts = [p.strip() for p in s.split(",")]
         if any(not p for p in parts):
-            raise ValueError('>>>>> Invalid sort format. Example: "created_at,-id"')
+            raise InvalidSortException(reason='invalid sort format, example: "created_at,-id"')
 
         for p in parts:
             field = p[1:] if p.startswith("-") else p
             if field not in allowed:
-                raise ValueError(f">>>>> Invalid sort field '{field}'. Allowed: {sorted(allowed)}")
+                raise InvalidSortException(reason=f"invalid sort field '{field}', allowed: {sorted(allowed)}")
 
         # write-back normalized value
         setattr(self, sort_field, s)
         return self
 
 
+class RelevanceSortParams(BaseModel):
+    """
+    Sort "relevance" (mức độ khớp keyword) - schema con có thể override:
+      - KEYWORD_FIELD_NAME: tên field keyword trong schema (default: 'q')
+
+    Chỉ hợp lệ khi:
+      - có keyword (không có keyword => không có gì để xếp hạng)
+      - offset paging (relevance là biểu thức, không encode được vào cursor keyset)
+    """
+    KEYWORD_FIELD_NAME: ClassVar[str] = "q"
+
+    @model_validator(mode="after")
+    def validate_relevance_sort(self):
+        raw = getattr(self, str(getattr(self.__class__, "SORT_FIELD_NAME", "sort")), None)
+        if not raw:
+            return self
+
+        fields = {p.strip().lstrip("-") for p in str(raw).split(",")}
+        if RELEVANCE_SORT_FIELD not in fields:
+            return self
+
+        keyword_field = str(getattr(self.__class__, "KEYWORD_FIELD_NAME", "q"))
+        if not getattr(self, keyword_field, None):
+            raise InvalidSortException(reason=f"sort '{RELEVANCE_SORT_FIELD}' requires '{keyword_field}'")
+        if getattr(self, "paging_mode", None) == "cursor" or getattr(self, "cursor", None):
+            raise InvalidSortException(reason=f"sort '{RELEVANCE_SORT_FIELD}' is not supported in cursor paging mode")
+        return self
+
+
 class CreatedRangeParams(BaseModel):
     created_from: datetime | None = Field(default=None, description="created_at >= created_from (ISO 8601)")
     created_to: datetime | None = Field(default=None, description="created_at <= created_to (ISO 8601)")
@@ -1,5 +1,16 @@
+import re
 from datetime import datetime
-from pydantic import BaseModel, EmailStr
+from typing import Any, ClassVar
+from pydantic import BaseModel, EmailStr, Field, field_validator
+
+from core.search.constants import MAX_KEYWORD_LENGTH, RELEVANCE_SORT_FIELD
+from schemas.request.search_common import (
+    CreatedRangeParams,
+    ExportParams,
+    PagedSortParams,
+    RelevanceSortParams,
+    StrictSortParams,
+)
 
 
 class StudentCreate(BaseModel):
@@ -13,6 +24,52 @@ class StudentUpdate(BaseModel):
     age: int | None = None
 
 
+class StudentFilterParams(CreatedRangeParams):
+    """
+    Filters + sort allowlist dùng chung cho search / export (StudentRepository._apply_filters)
+    """
+    ALLOWED_SORT_FIELDS: ClassVar[set[str]] = {
+        "id", "full_name", "age", "email", "created_at", "updated_at", RELEVANCE_SORT_FIELD,
+    }
+    KEYWORD_FIELD_NAME: ClassVar[str] = "keyword"
+
+    # ===== Filters =====
+    keyword: str | None = Field(
+        default=None,
+        description='Keyword search (full_name contains); sort="-relevance" => khớp nhất trước',
+        min_length=1,
+    )
+    min_age: int | None = Field(default=None, description="age >= min_age")
+    max_age: int | None = Field(default=None, description="age <= max_age")
+
+    @field_validator("keyword", mode="before")
+    @classmethod
+    def normalize_keyword(cls, v: Any) -> str | None:
+        if v is None:
+            return None
+        s = str(v).strip()
+        if not s:
+            return None
+
+        # collapse whitespace -> protect performance/log size
+        s = re.sub(r"\s+", " ", s)
+        return s[:MAX_KEYWORD_LENGTH]
+
+
+class StudentSearchParams(StudentFilterParams, PagedSortParams, StrictSortParams, RelevanceSortParams):
+    """
+    Search: filters + paging (offset | cursor) + sort
+    """
+
+    MAX_PAGE_SIZE: ClassVar[int] = 100
+
+
+class StudentExportParams(StudentFilterParams, ExportParams, StrictSortParams, RelevanceSortParams):
+    """
+    Export (stream NDJSON / CSV): cùng filters + sort allowlist với search, không paging
+    """
+
+
 class StudentOut(BaseModel):
     id: int
     full_name: str
@@ -22,4 +79,4 @@ class StudentOut(BaseModel):
     updated_at: datetime
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
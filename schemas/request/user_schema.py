@@ -2,8 +2,14 @@ import re
 from typing import Any, ClassVar
 from pydantic import BaseModel, EmailStr, Field, field_validator
 
-from core.search.constants import MAX_KEYWORD_LENGTH
-from schemas.request.search_common import CreatedRangeParams, PagedSortParams, StrictSortParams
+from core.search.constants import MAX_KEYWORD_LENGTH, RELEVANCE_SORT_FIELD
+from schemas.request.search_common import (
+    CreatedRangeParams,
+    ExportParams,
+    PagedSortParams,
+    RelevanceSortParams,
+    StrictSortParams,
+)
 
 
 class UserCreate(BaseModel):
@@ -12,6 +18,23 @@ class UserCreate(BaseModel):
     is_active: bool = True
 
 
+class UserBatchItem(UserCreate):
+    # Role name (vd: "STAFF"); role không tồn tại => item lỗi ROLE_NOT_FOUND
+    roles: list[str] = Field(default_factory=list, max_length=20)
+
+    @field_validator("roles", mode="after")
+    @classmethod
+    def normalize_roles(cls, v: list[str]) -> list[str]:
+        # strip + upper, bỏ trống / trùng (giữ thứ tự)
+        return list(dict.fromkeys(r.strip().upper() for r in v if r and r.strip()))
+
+
+class UserBatchCreate(BaseModel):
+    MAX_ITEMS: ClassVar[int] = 1000
+
+    items: list[UserBatchItem] = Field(min_length=1, max_length=MAX_ITEMS)
+
+
 class UserUpdate(BaseModel):
     # PATCH semantics: field nào None => không update
     email: EmailStr | None = None
@@ -19,8 +42,13 @@ class UserUpdate(BaseModel):
     is_active: bool | None = None
 
 
-class UserSearchParams(PagedSortParams, StrictSortParams, CreatedRangeParams):
-    ALLOWED_SORT_FIELDS: ClassVar[set[str]] = {"id", "email", "is_active", "created_at", "updated_at"}
+class UserFilterParams(CreatedRangeParams):
+    """
+    Filters + sort allowlist dùng chung cho search / export (UserRepository._apply_filters)
+    """
+    ALLOWED_SORT_FIELDS: ClassVar[set[str]] = {
+        "id", "email", "is_active", "created_at", "updated_at", RELEVANCE_SORT_FIELD,
+    }
 
     # ===== Filters =====
     email: EmailStr | None = Field(default=None, description="Exact email")
@@ -28,7 +56,7 @@ class UserSearchParams(PagedSortParams, StrictSortParams, CreatedRangeParams):
 
     q: str | None = Field(
         default=None,
-        description="Keyword search (email contains)",
+        description='Keyword search (email contains); sort="-relevance" => khớp nhất trước',
         min_length=1,
     )
 
@@ -46,3 +74,15 @@ class UserSearchParams(PagedSortParams, StrictSortParams, CreatedRangeParams):
         # collapse whitespace -> protect performance/log size
         s = re.sub(r"\s+", " ", s)
         return s[:MAX_KEYWORD_LENGTH]
+
+
+class UserSearchParams(UserFilterParams, PagedSortParams, StrictSortParams, RelevanceSortParams):
+    """
+    Search: filters + paging (offset | cursor) + sort
+    """
+
+
+class UserExportParams(UserFilterParams, ExportParams, StrictSortParams, RelevanceSortParams):
+    """
+    Export (stream NDJSON / CSV): cùng filters + sort allowlist với search, không paging
+    """
@@ -4,6 +4,8 @@ from typing import Any
 
 from pydantic import BaseModel, ConfigDict, Field
 
+from core.http.pagination import TotalMode
+
 
 class AuditLogOut(BaseModel):
     """
@@ -40,6 +42,11 @@ class AuditLogOut(BaseModel):
 
 class AuditLogListOut(BaseModel):
     items: list[AuditLogOut]
-    total: int
-    page: int
+    # cursor mode: total/page = None, dùng next_cursor để lấy trang kế tiếp
+    total: int | None
+    page: int | None
     page_size: int
+    # exact | estimate (total là ước lượng) | none (không có total)
+    total_mode: TotalMode = "exact"
+    has_next: bool | None = None
+    next_cursor: str | None = None
@@ -1,6 +1,7 @@
 from datetime import datetime
-from pydantic import EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr
 
+from core.http.pagination import TotalMode
 from schemas.response.base import TimestampMixin
 
 
@@ -12,3 +13,36 @@ class StudentOut(TimestampMixin):
     phone_number: str | None = None
     created_at: datetime
     updated_at: datetime
+
+
+class StudentListOut(BaseModel):
+    items: list[StudentOut]
+    # cursor mode: total/page = None, dùng next_cursor để lấy trang kế tiếp
+    total: int | None
+    page: int | None
+    page_size: int
+    # exact | estimate (total là ước lượng) | none (không có total)
+    total_mode: TotalMode = "exact"
+    has_next: bool | None = None
+    next_cursor: str | None = None
+
+
+class StudentImportRowError(BaseModel):
+    # line: số dòng trong file upload (1-based)
+    line: int
+    email: str | None = None
+    # INVALID_ROW | INVALID_STUDENT_AGE | DUPLICATE_EMAIL_IN_FILE | EMAIL_ALREADY_EXISTS
+    error_code: str
+    message: str
+
+
+class StudentImportOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    dry_run: bool = False
+    total_rows: int
+    inserted: int
+    failed: int
+    errors: list[StudentImportRowError]
+    # errors chỉ giữ tối đa N row đầu tiên (failed vẫn đếm đủ)
+    errors_truncated: bool = False
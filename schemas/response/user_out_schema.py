@@ -1,6 +1,7 @@
 from uuid import UUID
 from pydantic import EmailStr, BaseModel
 
+from core.http.pagination import TotalMode
 from schemas.response.base import TimestampMixin
 
 
@@ -10,8 +11,35 @@ class UserOut(TimestampMixin):
     is_active: bool
 
 
+class UserBatchCreatedOut(UserOut):
+    # index: vị trí trong request items (0-based)
+    index: int
+    roles: list[str] = []
+
+
+class UserBatchItemError(BaseModel):
+    index: int
+    email: str | None = None
+    # DUPLICATE_EMAIL_IN_REQUEST | USER_EMAIL_EXISTS | ROLE_NOT_FOUND
+    error_code: str
+    message: str
+
+
+class UserBatchOut(BaseModel):
+    total: int
+    created: int
+    failed: int
+    items: list[UserBatchCreatedOut]
+    errors: list[UserBatchItemError]
+
+
 class UserListOut(BaseModel):
     items: list[UserOut]
-    total: int
-    page: int
+    # cursor mode: total/page = None, dùng next_cursor để lấy trang kế tiếp
+    total: int | None
+    page: int | None
     page_size: int
+    # exact | estimate (total là ước lượng) | none (không có total)
+    total_mode: TotalMode = "exact"
+    has_next: bool | None = None
+    next_cursor: str | None = None
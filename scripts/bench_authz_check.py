@@ -0,0 +1,116 @@
+"""
+Benchmark: check token_version của require_current_user_verified (full authz snapshot)
+vs require_current_user_fresh (chỉ token_version qua PK).
+
+- snapshot: users JOIN user_roles/roles/role_permissions/permissions + aggregate (cache miss)
+- token_version: SELECT token_version, is_active, is_deleted WHERE id = :id (cache miss)
+- */cached: read-through cache hit (không chạm DB)
+
+Chạy (dùng DATABASE_URL trong .env, cần có user active - xem scripts/seed_user_data.py):
+    python -m scripts.bench_authz_check --iterations 2000 --users 100
+
+In ra số statement / check và latency trung bình (µs) / check của từng scenario.
+"""
+import argparse
+import time
+import uuid
+from typing import Callable
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from configs.database import SessionLocal, engine
+from configs.settings.security import AuthzCacheSettings
+from models.user import User
+from repositories.auth_repository import AuthRepository
+from security.authz_cache import AuthzSnapshotCache, TokenVersionCache
+
+
+class _StatementCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, *_args, **_kwargs) -> None:
+        self.count += 1
+
+
+def _load_user_ids(db: Session, limit: int) -> list[uuid.UUID]:
+    stmt = (
+        select(User.id)
+        .where(User.is_active.is_(True), User.is_deleted.is_(False))
+        .limit(limit)
+    )
+    return list(db.execute(stmt).scalars())
+
+
+def _run(
+        name: str,
+        db: Session,
+        user_ids: list[uuid.UUID],
+        iterations: int,
+        check: Callable[[Session, uuid.UUID], object],
+) -> None:
+    # warmup (prepared statement cache, cache fill)
+    for user_id in user_ids:
+        check(db, user_id)
+
+    counter = _StatementCounter()
+    event.listen(engine, "before_cursor_execute", counter)
+    try:
+        start = time.perf_counter()
+        for i in range(iterations):
+            check(db, user_ids[i % len(user_ids)])
+        elapsed = time.perf_counter() - start
+    finally:
+        event.remove(engine, "before_cursor_execute", counter)
+
+    print(
+        f"{name:<22} n={iterations:<6} statements/check={counter.count / iterations:.2f} "
+        f"latency/check={elapsed * 1e6 / iterations:9.1f}µs"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2_000)
+    parser.add_argument("--users", type=int, default=100, help="số user khác nhau (token đồng thời)")
+    args = parser.parse_args()
+
+    repo = AuthRepository()
+    cache_settings = AuthzCacheSettings(ttl_seconds=3600, max_size=max(args.users, 1))
+    snapshot_cache = AuthzSnapshotCache(cache_settings)
+    tv_cache = TokenVersionCache(cache_settings)
+    claim_tvs: dict[uuid.UUID, int] = {}
+
+    def snapshot_cached(db: Session, user_id: uuid.UUID) -> object:
+        cached = snapshot_cache.get(user_id, claim_tvs[user_id])
+        if cached is None:
+            roles, permissions, tv = repo.get_authz_snapshot(db, user_id)
+            snapshot_cache.put(user_id, (tuple(roles), tuple(permissions), tv))
+        return cached
+
+    def token_version_cached(db: Session, user_id: uuid.UUID) -> object:
+        cached = tv_cache.get(user_id)
+        if cached is None:
+            tv_cache.put(user_id, repo.get_token_version(db, user_id))
+        return cached
+
+    db = SessionLocal()
+    try:
+        user_ids = _load_user_ids(db, args.users)
+        if not user_ids:
+            raise SystemExit(">>>>> No active users found (run scripts.seed_user_data first)")
+        # token_version trong access token của từng user (key của AuthzSnapshotCache)
+        claim_tvs.update({user_id: repo.get_token_version(db, user_id) for user_id in user_ids})
+
+        _run("snapshot", db, user_ids, args.iterations, repo.get_authz_snapshot)
+        _run("token_version", db, user_ids, args.iterations, repo.get_token_version)
+        _run("snapshot/cached", db, user_ids, args.iterations, snapshot_cached)
+        _run("token_version/cached", db, user_ids, args.iterations, token_version_cached)
+    finally:
+        db.rollback()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
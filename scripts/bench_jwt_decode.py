@@ -0,0 +1,71 @@
+"""
+Micro-benchmark: verify access token bằng jose.jwt.decode (cũ) vs JwtVerifier (fast path).
+
+- jose: decode generic trên mỗi request (parse header, resolve alg, get_secret_value)
+- verifier/cold: key prepare sẵn, tắt LRU (đo riêng chi phí verify chữ ký + claims)
+- verifier/cached: token đã verify nằm trong LRU (hot path của request có cùng token)
+
+Chạy (cần .env như khi chạy app, không cần DB):
+    python -m scripts.bench_jwt_decode --iterations 20000 --tokens 100
+
+In ra µs / decode và decode / s của từng cách.
+"""
+import argparse
+import time
+import uuid
+from typing import Callable
+
+from jose import jwt
+
+from configs.env import settings_config
+from security.jwt_service import JwtService
+from security.jwt_verifier import JwtVerifier
+
+
+def _jose_decode(settings) -> Callable[[str], object]:
+    def decode(token: str) -> object:
+        return jwt.decode(
+            token,
+            settings.secret_key.get_secret_value(),
+            algorithms=[settings.algorithm],
+            audience=settings.audience,
+            issuer=settings.issuer,
+            options={"require_aud": True, "require_iss": True},
+        )
+
+    return decode
+
+
+def _run(name: str, decode: Callable[[str], object], tokens: list[str], iterations: int) -> None:
+    # warmup
+    for token in tokens:
+        decode(token)
+
+    start = time.perf_counter()
+    for i in range(iterations):
+        decode(tokens[i % len(tokens)])
+    elapsed = time.perf_counter() - start
+
+    print(f"{name:<16} n={iterations:<7} {elapsed * 1e6 / iterations:8.2f}µs/decode {iterations / elapsed:12,.0f}/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20_000)
+    parser.add_argument("--tokens", type=int, default=100, help="số token khác nhau (user đồng thời)")
+    args = parser.parse_args()
+
+    settings = settings_config().security.jwt
+    service = JwtService(settings)
+    tokens = [service.create_access_token(subject=str(uuid.uuid4())) for _ in range(args.tokens)]
+
+    cold = JwtVerifier(settings.model_copy(update={"verify_cache_max_size": 0}))
+    cached = JwtVerifier(settings)
+
+    _run("jose", _jose_decode(settings), tokens, args.iterations)
+    _run("verifier/cold", cold.verify, tokens, args.iterations)
+    _run("verifier/cached", cached.verify, tokens, args.iterations)
+
+
+if __name__ == "__main__":
+    main()
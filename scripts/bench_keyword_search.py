@@ -0,0 +1,136 @@
+"""
+Benchmark keyword search students.full_name (Postgres + pg_trgm):
+- seq_scan: ILIKE '%kw%' khi tắt index scan (hành vi trước khi có ix_students_full_name_trgm)
+- trgm: ILIKE '%kw%' qua GIN index gin_trgm_ops
+- trgm+relevance: ILIKE + ORDER BY similarity(full_name, kw) DESC LIMIT page_size
+
+Seed (idempotent, email dạng bench-kw-<n>@example.com) bằng generate_series - không qua ORM:
+    python -m scripts.bench_keyword_search --rows 1000000
+    python -m scripts.bench_keyword_search --rows 1000000 --keywords "nguyen van,thi b,xyzq"
+    python -m scripts.bench_keyword_search --cleanup    # xóa row benchmark
+
+In ra plan node chính + execution time trung bình (EXPLAIN ANALYZE) của từng scenario.
+"""
+import argparse
+import statistics
+
+from sqlalchemy import Select, func, select, text
+from sqlalchemy.orm import Session
+
+from configs.database import SessionLocal, engine
+from core.search.keyword import keyword_filter, keyword_similarity
+from models.student import Student
+
+_BENCH_EMAIL_PREFIX = "bench-kw-"
+
+# Họ / đệm / tên phổ biến => full_name lặp nhiều (giống dữ liệu thật, keyword khớp không đều)
+_SEED_SQL = """
+INSERT INTO students (full_name, age, email)
+SELECT
+    (ARRAY['Nguyen','Tran','Le','Pham','Hoang','Huynh','Phan','Vu','Vo','Dang','Bui','Do','Ho','Ngo','Duong'])[1 + (g * 7) % 15]
+    || ' ' || (ARRAY['Van','Thi','Minh','Ngoc','Duc','Thanh','Quang','Hong','Gia','Bao'])[1 + (g * 13) % 10]
+    || ' ' || (ARRAY['An','Binh','Chi','Dung','Giang','Hai','Khanh','Linh','Mai','Nam','Phuc','Quan','Son','Trang','Uyen','Vy'])[1 + (g * 31) % 16]
+    || ' ' || g::text,
+    18 + g % 10,
+    :prefix || g::text || '@example.com'
+FROM generate_series(:start, :stop) AS g
+ON CONFLICT (email) DO NOTHING
+"""
+
+
+def _bench_count(db: Session) -> int:
+    stmt = select(func.count()).select_from(Student).where(Student.email.like(f"{_BENCH_EMAIL_PREFIX}%"))
+    return int(db.execute(stmt).scalar_one())
+
+
+def _seed(db: Session, rows: int, chunk: int) -> None:
+    existing = _bench_count(db)
+    if existing >= rows:
+        print(f"seed: {existing:,} bench rows present, skip")
+        return
+
+    for start in range(existing + 1, rows + 1, chunk):
+        stop = min(start + chunk - 1, rows)
+        db.execute(text(_SEED_SQL), {"prefix": _BENCH_EMAIL_PREFIX, "start": start, "stop": stop})
+        db.commit()
+        print(f"seed: {stop:,}/{rows:,}", flush=True)
+
+    # planner statistics cho bảng vừa thay đổi lớn
+    db.execute(text("ANALYZE students"))
+    db.commit()
+
+
+def _cleanup(db: Session) -> None:
+    result = db.execute(text("DELETE FROM students WHERE email LIKE :pattern"), {"pattern": f"{_BENCH_EMAIL_PREFIX}%"})
+    db.commit()
+    print(f"cleanup: deleted {result.rowcount:,} rows")
+
+
+def _search_stmt(keyword: str, *, relevance: bool, page_size: int) -> Select:
+    stmt = select(Student).where(keyword_filter(Student.full_name, keyword))
+    if relevance:
+        stmt = stmt.order_by(keyword_similarity(Student.full_name, keyword).desc(), Student.id)
+    return stmt.limit(page_size)
+
+
+def _explain(db: Session, stmt: Select) -> tuple[str, float, float]:
+    """
+    :return: tuple[plan node (node đầu tiên đụng tới bảng students), execution ms, rows trả về]
+    """
+    sql = str(stmt.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True}))
+    plan = db.execute(text("EXPLAIN (ANALYZE, FORMAT JSON) " + sql)).scalar_one()[0]
+
+    node = plan["Plan"]
+    while node.get("Plans") and node.get("Relation Name") != "students":
+        node = node["Plans"][0]
+    return node["Node Type"], float(plan["Execution Time"]), float(plan["Plan"]["Actual Rows"])
+
+
+def _run(db: Session, name: str, keyword: str, stmt: Select, iterations: int, *, seq_scan: bool) -> None:
+    db.execute(text("SET LOCAL enable_indexscan = off" if seq_scan else "SET LOCAL enable_indexscan = on"))
+    db.execute(text("SET LOCAL enable_bitmapscan = off" if seq_scan else "SET LOCAL enable_bitmapscan = on"))
+
+    _explain(db, stmt)  # warmup (shared buffers)
+    samples = [_explain(db, stmt) for _ in range(iterations)]
+    node = samples[-1][0]
+    ms = statistics.median(s[1] for s in samples)
+    rows = samples[-1][2]
+
+    print(f"{name:<16} kw={keyword!r:<14} plan={node:<18} rows={rows:<6.0f} median={ms:10.2f}ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--chunk", type=int, default=100_000, help="số row mỗi INSERT lúc seed")
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--keywords", default="nguyen van,linh 12,xyzq", help="comma-separated")
+    parser.add_argument("--cleanup", action="store_true")
+    args = parser.parse_args()
+
+    if engine.dialect.name != "postgresql":
+        raise SystemExit(">>>>> bench_keyword_search requires PostgreSQL (pg_trgm)")
+
+    db = SessionLocal()
+    try:
+        if args.cleanup:
+            _cleanup(db)
+            return
+
+        _seed(db, args.rows, args.chunk)
+
+        for keyword in [k.strip() for k in args.keywords.split(",") if k.strip()]:
+            plain = _search_stmt(keyword, relevance=False, page_size=args.page_size)
+            ranked = _search_stmt(keyword, relevance=True, page_size=args.page_size)
+            _run(db, "seq_scan", keyword, plain, args.iterations, seq_scan=True)
+            _run(db, "trgm", keyword, plain, args.iterations, seq_scan=False)
+            _run(db, "trgm+relevance", keyword, ranked, args.iterations, seq_scan=False)
+            db.rollback()  # reset SET LOCAL
+    finally:
+        db.rollback()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+"""
+Micro-benchmark: middleware stack cũ (BaseHTTPMiddleware) vs pure ASGI trên route /health.
+
+Chạy (cần .env như khi chạy app, không cần DB thật - session không bao giờ connect):
+    python -m scripts.bench_middleware_stack --requests 5000 --concurrency 16
+
+In ra p50 / p99 latency (ms) và req/s của từng stack.
+"""
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+import uuid
+
+import httpx
+from fastapi import FastAPI, Request
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import Response
+
+from controllers.health_controller import health_router
+from core.exceptions.base import BusinessException
+from core.exceptions.exception_handlers import business_exception_handler, unhandled_exception_handler
+from core.http.request_state_keys import RequestStateKeys
+from core.middlewares.db_session import DBSessionMiddleware
+from core.middlewares.request_id import RequestIdMiddleware
+from core.middlewares.request_logging import RequestLoggingMiddleware
+from core.middlewares.token_context import TokenContextMiddleware, _extract_token
+from core.middlewares.trace_id import TraceIdMiddleware
+from core.trace import trace_id_ctx
+from security.principals import CurrentUser
+from security.providers import get_jwt_service
+
+
+# =========================
+# Legacy stack (BaseHTTPMiddleware) - giữ nguyên logic dispatch cũ để so sánh
+# =========================
+
+class LegacyDBSessionMiddleware(BaseHTTPMiddleware):
+    def __init__(self, app, session_factory: sessionmaker):
+        super().__init__(app)
+        self.session_factory = session_factory
+
+    async def dispatch(self, request: Request, call_next) -> Response:
+        db = self.session_factory()
+        request.state.db = db
+        try:
+            response = await call_next(request)
+            db.commit()
+            return response
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+
+class LegacyTokenContextMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next) -> Response:
+        request.state.token_claims = None
+        request.state.token_error = None
+        request.state.current_user = None
+
+        token = _extract_token(request)
+        if token:
+            claims, err = get_jwt_service().decode_access_token(token)
+            request.state.token_claims = claims
+            request.state.token_error = err
+            if claims and err is None and isinstance(claims, dict):
+                request.state.current_user = CurrentUser.from_claims(claims)
+
+        return await call_next(request)
+
+
+class LegacyRequestLoggingMiddleware(BaseHTTPMiddleware):
+    def __init__(self, app):
+        super().__init__(app)
+        # Dùng lại helpers của middleware mới => cùng chi phí format/log
+        self.impl = RequestLoggingMiddleware(app)
+
+    async def dispatch(self, request: Request, call_next) -> Response:
+        skip = self.impl._should_skip(request.url.path)
+        start_perf = time.perf_counter()
+        base_extra = self.impl._build_base_extra(request)
+        if not skip:
+            self.impl._log_start(base_extra)
+
+        response: Response | None = None
+        exc: BaseException | None = None
+        try:
+            response = await call_next(request)
+            return response
+        except BaseException as e:
+            exc = e
+            raise
+        finally:
+            status_code = getattr(response, "status_code", 500)
+            if (not skip) or exc is not None or status_code >= 400:
+                self.impl._log_end(
+                    base_extra=base_extra,
+                    start_perf=start_perf,
+                    status_code=status_code,
+                    exc=exc,
+                )
+
+
+class LegacyTraceIdMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next) -> Response:
+        trace_id = request.headers.get("X-Trace-Id") or uuid.uuid4().hex
+        setattr(request.state, RequestStateKeys.TRACE_ID, trace_id)
+        token = trace_id_ctx.set(trace_id)
+        try:
+            response = await call_next(request)
+            response.headers["X-Trace-Id"] = trace_id
+            return response
+        finally:
+            trace_id_ctx.reset(token)
+
+
+class LegacyRequestIdMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next) -> Response:
+        request_id = request.headers.get("X-Request-Id") or uuid.uuid4().hex
+        setattr(request.state, RequestStateKeys.REQUEST_ID, request_id)
+        response = await call_next(request)
+        response.headers["X-Request-Id"] = request_id
+        return response
+
+
+# =========================
+# App builders
+# =========================
+
+def _base_app() -> FastAPI:
+    app = FastAPI()
+    app.include_router(health_router)
+    app.add_exception_handler(BusinessException, business_exception_handler)
+    app.add_exception_handler(Exception, unhandled_exception_handler)
+    return app
+
+
+def build_legacy_app(session_factory: sessionmaker) -> FastAPI:
+    app = _base_app()
+    app.add_middleware(LegacyDBSessionMiddleware, session_factory=session_factory)
+    app.add_middleware(LegacyTokenContextMiddleware)
+    app.add_middleware(LegacyRequestLoggingMiddleware)
+    app.add_middleware(LegacyTraceIdMiddleware)
+    app.add_middleware(LegacyRequestIdMiddleware)
+    return app
+
+
+def build_asgi_app(session_factory: sessionmaker) -> FastAPI:
+    app = _base_app()
+    app.add_middleware(DBSessionMiddleware, session_factory=session_factory)
+    app.add_middleware(TokenContextMiddleware)
+    app.add_middleware(RequestLoggingMiddleware)
+    app.add_middleware(TraceIdMiddleware)
+    app.add_middleware(RequestIdMiddleware)
+    return app
+
+
+# =========================
+# Runner
+# =========================
+
+async def _run(app: FastAPI, *, requests: int, concurrency: int, warmup: int) -> tuple[list[float], float]:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(warmup):
+            await client.get("/health")
+
+        latencies: list[float] = []
+        remaining = requests
+
+        async def worker() -> None:
+            nonlocal remaining
+            while remaining > 0:
+                remaining -= 1
+                start = time.perf_counter()
+                resp = await client.get("/health")
+                latencies.append((time.perf_counter() - start) * 1000.0)
+                if resp.status_code != 200:
+                    raise RuntimeError(f"unexpected status {resp.status_code}")
+
+        start_all = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start_all
+
+    return latencies, elapsed
+
+
+def _report(name: str, latencies: list[float], elapsed: float) -> None:
+    ordered = sorted(latencies)
+    p50 = statistics.median(ordered)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    print(
+        f"{name:<8} n={len(ordered):<7} p50={p50:.3f}ms p99={p99:.3f}ms "
+        f"req/s={len(ordered) / elapsed:,.0f}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--warmup", type=int, default=200)
+    args = parser.parse_args()
+
+    # Không đo chi phí I/O của log handler
+    logging.getLogger("access").setLevel(logging.WARNING)
+
+    # Session không bao giờ được dùng trên /health => không connect
+    session_factory = sessionmaker(bind=create_engine("sqlite://"), autoflush=False, expire_on_commit=False)
+
+    for name, builder in (("legacy", build_legacy_app), ("asgi", build_asgi_app)):
+        latencies, elapsed = asyncio.run(
+            _run(
+                builder(session_factory),
+                requests=args.requests,
+                concurrency=args.concurrency,
+                warmup=args.warmup,
+            )
+        )
+        _report(name, latencies, elapsed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark: số round-trip / latency của write path, có và không có refresh() sau flush.
+
+- refresh: hành vi cũ (INSERT ... RETURNING + SELECT refresh)
+- returning: chỉ INSERT ... RETURNING (eager_defaults), không refresh
+
+Chạy (dùng DATABASE_URL trong .env, mọi thay đổi đều được ROLLBACK):
+    python -m scripts.bench_write_roundtrips --rows 500
+
+In ra số statement / row và latency trung bình (ms) / row của từng scenario.
+"""
+import argparse
+import time
+import uuid
+from typing import Callable
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from configs.database import SessionLocal, engine
+from models.audit_log import AuditLog
+from models.user import User
+from repositories.audit_log_repository import AuditLogRepository
+from repositories.user_repository import UserRepository
+
+
+class _StatementCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, *_args, **_kwargs) -> None:
+        self.count += 1
+
+
+def _audit_row(i: int) -> AuditLog:
+    return AuditLog(
+        action="SYSTEM_JOB",
+        entity_type="Bench",
+        entity_id=str(i),
+        message="bench_write_roundtrips",
+    )
+
+
+def _user_row(i: int) -> User:
+    return User(
+        email=f"bench-{uuid.uuid4().hex[:12]}-{i}@bench.local",
+        hashed_password="x",
+        is_active=True,
+        is_deleted=False,
+    )
+
+
+def _run(rows: int, write: Callable[[Session, int], None]) -> tuple[float, float]:
+    counter = _StatementCounter()
+    event.listen(engine, "before_cursor_execute", counter)
+    db = SessionLocal()
+    try:
+        start = time.perf_counter()
+        for i in range(rows):
+            write(db, i)
+        elapsed = time.perf_counter() - start
+    finally:
+        db.rollback()
+        db.close()
+        event.remove(engine, "before_cursor_execute", counter)
+
+    return counter.count / rows, elapsed * 1000.0 / rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=500)
+    args = parser.parse_args()
+
+    audit_repo = AuditLogRepository()
+    user_repo = UserRepository()
+
+    scenarios: list[tuple[str, Callable[[Session, int], None]]] = [
+        ("audit/refresh", lambda db, i: audit_repo.create(db, _audit_row(i), refresh=True)),
+        ("audit/returning", lambda db, i: audit_repo.create(db, _audit_row(i), refresh=False)),
+        ("user/refresh", lambda db, i: user_repo.create(db, _user_row(i), refresh=True)),
+        ("user/returning", lambda db, i: user_repo.create(db, _user_row(i), refresh=False)),
+    ]
+
+    for name, write in scenarios:
+        statements, latency_ms = _run(args.rows, write)
+        print(f"{name:<16} rows={args.rows:<6} statements/row={statements:.2f} latency/row={latency_ms:.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
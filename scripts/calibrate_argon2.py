@@ -0,0 +1,105 @@
+"""
+Calibrate argon2id cost params cho host hiện tại theo latency verify mục tiêu.
+
+Thuật toán:
+- Giữ parallelism, bắt đầu từ memory_cost lớn nhất (memory-hard ưu tiên hơn time_cost)
+- Tăng time_cost tới khi median verify vượt target => lấy time_cost lớn nhất còn <= target
+- time_cost=1 đã vượt target => giảm 1/2 memory_cost rồi thử lại (không thấp hơn --min-memory-kib)
+
+Chạy:
+    python -m scripts.calibrate_argon2 --target-ms 250 --memory-kib 65536 --parallelism 4
+
+In ra các dòng env (ARGON2_PROFILE=custom ...) để đưa vào .env của deployment.
+Hash cũ sẽ tự upgrade khi user login thành công (ARGON2_REHASH_ON_LOGIN=true).
+"""
+import argparse
+import statistics
+import time
+
+from security.password import build_password_context
+
+_SAMPLE_PASSWORD = "Calibrate-argon2-Passw0rd!"
+
+
+def measure_verify_ms(*, time_cost: int, memory_cost_kib: int, parallelism: int, samples: int) -> float:
+    context = build_password_context(
+        time_cost=time_cost,
+        memory_cost_kib=memory_cost_kib,
+        parallelism=parallelism,
+    )
+    hashed = context.hash(_SAMPLE_PASSWORD)
+
+    timings: list[float] = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        context.verify(_SAMPLE_PASSWORD, hashed)
+        timings.append((time.perf_counter() - start) * 1000.0)
+    return statistics.median(timings)
+
+
+def calibrate(
+        *,
+        target_ms: float,
+        memory_cost_kib: int,
+        min_memory_kib: int,
+        parallelism: int,
+        max_time_cost: int,
+        samples: int,
+) -> tuple[int, int, float] | None:
+    memory = memory_cost_kib
+    while memory >= min_memory_kib:
+        best: tuple[int, int, float] | None = None
+        for time_cost in range(1, max_time_cost + 1):
+            latency = measure_verify_ms(
+                time_cost=time_cost,
+                memory_cost_kib=memory,
+                parallelism=parallelism,
+                samples=samples,
+            )
+            print(f"  t={time_cost:<3} m={memory:<8} p={parallelism:<3} verify_p50={latency:8.2f}ms")
+            if latency > target_ms:
+                break
+            best = (time_cost, memory, latency)
+
+        if best is not None:
+            return best
+        memory //= 2
+
+    return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target-ms", type=float, default=250.0)
+    parser.add_argument("--memory-kib", type=int, default=64 * 1024)
+    parser.add_argument("--min-memory-kib", type=int, default=19 * 1024)
+    parser.add_argument("--parallelism", type=int, default=4)
+    parser.add_argument("--max-time-cost", type=int, default=10)
+    parser.add_argument("--samples", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"Calibrating argon2id: target verify <= {args.target_ms:.0f}ms")
+    result = calibrate(
+        target_ms=args.target_ms,
+        memory_cost_kib=args.memory_kib,
+        min_memory_kib=args.min_memory_kib,
+        parallelism=args.parallelism,
+        max_time_cost=args.max_time_cost,
+        samples=args.samples,
+    )
+    if result is None:
+        raise SystemExit(
+            f">>>>> Cannot reach {args.target_ms:.0f}ms with memory >= {args.min_memory_kib} KiB, "
+            "raise --target-ms or lower --min-memory-kib"
+        )
+
+    time_cost, memory_cost_kib, latency = result
+    print(f"\nSelected (verify_p50={latency:.2f}ms):")
+    print("ARGON2_PROFILE=custom")
+    print(f"ARGON2_TIME_COST={time_cost}")
+    print(f"ARGON2_MEMORY_COST_KIB={memory_cost_kib}")
+    print(f"ARGON2_PARALLELISM={args.parallelism}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Sinh JWT signing key mới (RS256 / EdDSA) và thêm vào key ring (JWT_KEYS_DIR/keyring.json).
+
+Rotate theo lịch (không downtime):
+1. Sinh key mới với --activate-in-hours >= JWKS_MAX_AGE_SECONDS => downstream kịp cache JWKS có key mới
+2. --retire-current: key đang ký ngừng ký tại thời điểm key mới active
+   (vẫn verify + publish JWKS thêm 1 access token TTL)
+3. Deploy JWT_KEYS_DIR (mọi worker đọc cùng keyring.json), không cần đổi env
+
+Chạy:
+    python -m scripts.generate_jwt_key --dir ./keys --alg EdDSA --activate-in-hours 24 --retire-current
+"""
+import argparse
+import json
+import os
+import secrets
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+
+from security.jwt_keys import KEYRING_MANIFEST
+
+
+def _generate_private_pem(alg: str, rsa_bits: int) -> bytes:
+    if alg == "EdDSA":
+        private_key = ed25519.Ed25519PrivateKey.generate()
+    else:
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=rsa_bits)
+    return private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    )
+
+
+def _load_manifest(path: Path) -> dict:
+    if not path.exists():
+        return {"keys": []}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dir", required=True, help="JWT_KEYS_DIR")
+    parser.add_argument("--alg", choices=["RS256", "EdDSA"], default="EdDSA")
+    parser.add_argument("--rsa-bits", type=int, default=3072)
+    parser.add_argument("--activate-in-hours", type=float, default=0.0)
+    parser.add_argument("--retire-current", action="store_true",
+                        help="key đang active (chưa có retire_at) ngừng ký khi key mới active")
+    args = parser.parse_args()
+
+    keys_dir = Path(args.dir)
+    keys_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = keys_dir / KEYRING_MANIFEST
+    manifest = _load_manifest(manifest_path)
+
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    activate_at = now + timedelta(hours=args.activate_in_hours)
+    kid = f"{now:%Y%m%d}-{secrets.token_hex(4)}"
+
+    key_file = keys_dir / f"{kid}.pem"
+    fd = os.open(key_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(_generate_private_pem(args.alg, args.rsa_bits))
+
+    if args.retire_current:
+        for entry in manifest["keys"]:
+            if not entry.get("retire_at"):
+                entry["retire_at"] = activate_at.isoformat()
+
+    manifest["keys"].append(
+        {
+            "kid": kid,
+            "alg": args.alg,
+            "file": key_file.name,
+            "activate_at": activate_at.isoformat(),
+            "retire_at": None,
+        }
+    )
+
+    tmp_path = manifest_path.with_suffix(".json.tmp")
+    tmp_path.write_text(json.dumps(manifest, indent=2) + "\n", encoding="utf-8")
+    tmp_path.replace(manifest_path)
+
+    print(f"kid={kid} alg={args.alg} activate_at={activate_at.isoformat()}")
+    print(f"key file: {key_file}")
+    print(f"manifest: {manifest_path} ({len(manifest['keys'])} keys)")
+
+
+if __name__ == "__main__":
+    main()
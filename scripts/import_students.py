@@ -0,0 +1,70 @@
+"""
+Bulk import students từ file CSV (header: full_name,age,email) / NDJSON.
+
+- Đọc streaming theo batch: validate + kiểm tra trùng email (1 query / batch) + multi-row INSERT ON CONFLICT
+- Mỗi batch COMMIT riêng (file lớn không giữ 1 transaction dài); --dry-run: chỉ validate, không ghi
+- Row lỗi ghi ra --errors (NDJSON: line, email, error_code, message)
+
+Chạy (dùng DATABASE_URL trong .env):
+    python -m scripts.import_students students.csv
+    python -m scripts.import_students students.ndjson --batch-size 5000 --errors import-errors.ndjson
+    python -m scripts.import_students students.csv --dry-run
+"""
+import argparse
+import sys
+import time
+
+from configs.database import SessionLocal
+from services.student_service import MAX_IMPORT_ERRORS, StudentImportReport, StudentService
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=["csv", "ndjson"], default=None, help="mặc định: theo đuôi file")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--dry-run", action="store_true")
+    parser.add_argument("--errors", default=None, help="ghi row lỗi ra file NDJSON")
+    parser.add_argument("--quiet", action="store_true", help="chỉ in tổng kết")
+    args = parser.parse_args()
+
+    service = StudentService()
+    started = time.perf_counter()
+
+    with SessionLocal() as db, open(args.path, "rb") as f:
+        def _on_batch(report: StudentImportReport) -> None:
+            if not report.dry_run:
+                db.commit()
+            if not args.quiet:
+                elapsed = time.perf_counter() - started
+                print(
+                    f"batch={report.batches:<6} rows={report.total_rows:<10} inserted={report.inserted:<10} "
+                    f"failed={report.failed:<8} rows/s={report.total_rows / elapsed if elapsed else 0:10,.0f}",
+                    flush=True,
+                )
+
+        result = service.import_students(
+            db,
+            f,
+            fmt=args.format,
+            filename=args.path,
+            dry_run=args.dry_run,
+            batch_size=args.batch_size,
+            on_batch=_on_batch,
+        )
+
+    if args.errors:
+        with open(args.errors, "w", encoding="utf-8") as out:
+            for err in result.errors:
+                out.write(err.model_dump_json() + "\n")
+
+    print(
+        f"done: rows={result.total_rows} inserted={result.inserted} failed={result.failed} "
+        f"dry_run={result.dry_run} elapsed={time.perf_counter() - started:.2f}s"
+    )
+    if result.errors_truncated:
+        print(f"(error report truncated to first {MAX_IMPORT_ERRORS} rows)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Purge refresh session hết hạn theo batch (cron / k8s CronJob).
+
+- Mỗi batch: DELETE tối đa --batch-size row + COMMIT (lock ngắn, không load id vào RAM)
+- In tiến độ sau mỗi batch: số row đã xóa, latency batch, rows/s
+
+Chạy (dùng DATABASE_URL trong .env):
+    python -m scripts.purge_refresh_sessions --batch-size 5000 --pause-ms 50
+    python -m scripts.purge_refresh_sessions --max-batches 100   # giới hạn thời gian chạy mỗi lần
+"""
+import argparse
+from datetime import datetime
+
+from configs.database import SessionLocal
+from repositories.refresh_session_repository import RefreshSessionRepository
+from services.refresh_session_purge_service import PurgeMetrics, RefreshSessionPurgeService
+
+
+def _print_progress(metrics: PurgeMetrics) -> None:
+    print(
+        f"batch={metrics.batches:<6} deleted={metrics.last_batch_deleted:<7} total={metrics.deleted:<10} "
+        f"batch_ms={metrics.last_batch_ms:8.1f} rows/s={metrics.rows_per_second:10,.0f}",
+        flush=True,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--max-batches", type=int, default=None)
+    parser.add_argument("--pause-ms", type=float, default=0.0, help="nghỉ giữa các batch")
+    parser.add_argument("--before", type=datetime.fromisoformat, default=None,
+                        help="ISO datetime (có timezone), mặc định: now")
+    parser.add_argument("--quiet", action="store_true", help="chỉ in tổng kết")
+    args = parser.parse_args()
+
+    service = RefreshSessionPurgeService(
+        refresh_repo=RefreshSessionRepository(),
+        session_factory=SessionLocal,
+    )
+    metrics = service.purge_expired(
+        before=args.before,
+        batch_size=args.batch_size,
+        max_batches=args.max_batches,
+        pause_seconds=args.pause_ms / 1000.0,
+        on_batch=None if args.quiet else _print_progress,
+    )
+
+    print(
+        f"done: batches={metrics.batches} deleted={metrics.deleted} "
+        f"elapsed={metrics.elapsed_seconds:.2f}s rows/s={metrics.rows_per_second:,.0f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+import logging
+import uuid
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from configs.settings.security import AuthzCacheSettings
+from core.utils.ttl_lru_cache import TtlLruCache
+
+logger = logging.getLogger(__name__)
+
+# (roles, permissions, token_version) - cùng shape với AuthRepository.get_authz_snapshot
+AuthzSnapshot = tuple[tuple[str, ...], tuple[str, ...], int]
+
+
+class AuthzSnapshotCache:
+    """
+    In-process cache cho authz snapshot của require_current_user_verified.
+
+    - Key: (user_id, token_version) => token bị revoke (tv mới) không bao giờ match entry cũ
+    - TTL + LRU: giới hạn độ "stale" của roles/permissions và bộ nhớ
+    - Chỉ cache snapshot hợp lệ (token_version >= 1), không cache user not found/disabled
+
+    Invalidation (explicit):
+    - invalidate_user(): xóa mọi entry của 1 user (update/delete user, logout-all, đổi role)
+    - invalidate_all(): xóa toàn bộ (thay đổi role -> permission mapping)
+    - *_on_commit(): xóa ngay + xóa lại sau khi transaction commit để tránh
+      request song song nạp lại snapshot cũ trước khi commit
+    """
+
+    def __init__(self, settings: AuthzCacheSettings):
+        self._enabled = settings.enabled
+        self._cache: TtlLruCache[tuple[uuid.UUID, int], AuthzSnapshot] = TtlLruCache(
+            max_size=settings.max_size,
+            ttl_seconds=settings.ttl_seconds,
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    # ===== Read-through =====
+    def get(self, user_id: uuid.UUID, token_version: int) -> AuthzSnapshot | None:
+        if not self._enabled:
+            return None
+        return self._cache.get((user_id, int(token_version)))
+
+    def put(self, user_id: uuid.UUID, snapshot: AuthzSnapshot) -> None:
+        if not self._enabled:
+            return
+
+        token_version = int(snapshot[2])
+        if token_version <= 0:
+            return
+        self._cache.put((user_id, token_version), snapshot)
+
+    # ===== Invalidation hooks =====
+    def invalidate_user(self, user_id: uuid.UUID) -> None:
+        if not self._enabled:
+            return
+        removed = self._cache.pop_where(lambda key: key[0] == user_id)
+        if removed:
+            logger.debug("authz_cache.invalidate_user", extra={"user_id": user_id, "removed": removed})
+
+    def invalidate_all(self) -> None:
+        if not self._enabled:
+            return
+        self._cache.clear()
+        logger.debug("authz_cache.invalidate_all")
+
+    def invalidate_user_on_commit(self, db: Session, user_id: uuid.UUID) -> None:
+        self.invalidate_user(user_id)
+        if self._enabled:
+            event.listen(db, "after_commit", lambda _s: self.invalidate_user(user_id), once=True)
+
+    def invalidate_all_on_commit(self, db: Session) -> None:
+        self.invalidate_all()
+        if self._enabled:
+            event.listen(db, "after_commit", lambda _s: self.invalidate_all(), once=True)
+
+
+class TokenVersionCache:
+    """
+    In-process cache cho require_current_user_fresh (chỉ cần token_version, không cần roles/permissions).
+
+    - Key: user_id => value: token_version hiện tại trong DB (user active, chưa xóa)
+    - Không cache user not found/disabled (token_version=0) => disable/xóa user có hiệu lực ngay
+    - Dùng chung TTL / max_size với AuthzSnapshotCache, invalidate qua AuthzInvalidator
+    """
+
+    def __init__(self, settings: AuthzCacheSettings):
+        self._enabled = settings.enabled
+        self._cache: TtlLruCache[uuid.UUID, int] = TtlLruCache(
+            max_size=settings.max_size,
+            ttl_seconds=settings.ttl_seconds,
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    # ===== Read-through =====
+    def get(self, user_id: uuid.UUID) -> int | None:
+        if not self._enabled:
+            return None
+        return self._cache.get(user_id)
+
+    def put(self, user_id: uuid.UUID, token_version: int) -> None:
+        if not self._enabled or token_version <= 0:
+            return
+        self._cache.put(user_id, int(token_version))
+
+    # ===== Invalidation hooks =====
+    def invalidate_user(self, user_id: uuid.UUID) -> None:
+        if not self._enabled:
+            return
+        self._cache.pop(user_id)
+
+    def invalidate_all(self) -> None:
+        if not self._enabled:
+            return
+        self._cache.clear()
+
+    def invalidate_user_on_commit(self, db: Session, user_id: uuid.UUID) -> None:
+        self.invalidate_user(user_id)
+        if self._enabled:
+            event.listen(db, "after_commit", lambda _s: self.invalidate_user(user_id), once=True)
+
+    def invalidate_all_on_commit(self, db: Session) -> None:
+        self.invalidate_all()
+        if self._enabled:
+            event.listen(db, "after_commit", lambda _s: self.invalidate_all(), once=True)
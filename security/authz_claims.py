@@ -0,0 +1,130 @@
+import logging
+import time
+import uuid
+from typing import Any, Callable, Iterable
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from configs.settings.security import JwtSettings
+from core.security.permission_registry import PERMISSION_REGISTRY, PermissionRegistry
+from core.utils.ttl_lru_cache import TtlLruCache
+from security.jwt_claims import JwtClaims
+from security.principals import CurrentUser
+
+logger = logging.getLogger(__name__)
+
+_NUMERIC = (int, float)
+
+
+class ClaimsAuthzPolicy:
+    """
+    Authorize từ access token claims (JWT_EMBED_AUTHZ=true), không query DB:
+    - encode(): roles + permission bitset + registry version + RBAC epoch => extra claims lúc login/refresh
+    - principal_from_claims(): CurrentUser có roles/permissions từ claims, None => guards fallback DB snapshot
+
+    Revocation levers (claims cũ => fallback DB, DB quyết định token_version / active / roles):
+    - rbac_epoch (RBAC_EPOCH): đổi role -> permission mapping => tăng epoch khi deploy
+    - invalidate_user(): user đổi role / token_version / bị disable => token của user phát hành trước đó
+      fallback DB tới exp (nhận qua AuthzInvalidator, kể cả từ worker khác)
+    - invalidate_all(): mọi token phát hành trước thời điểm này fallback DB
+    - Process mới start cũng coi như invalidate_all: không biết event đã bỏ lỡ trước khi start
+    """
+
+    def __init__(
+            self,
+            settings: JwtSettings,
+            *,
+            registry: PermissionRegistry = PERMISSION_REGISTRY,
+            max_revoked_users: int = 100_000,
+            clock: Callable[[], float] = time.time,
+    ):
+        self._enabled = settings.embed_authz
+        self._rbac_epoch = settings.rbac_epoch
+        self._registry = registry
+        self._clock = clock
+
+        self._not_before = clock()
+        self._max_revoked_users = max_revoked_users
+        # user_id -> thời điểm invalidate; chỉ cần giữ tới khi token cũ nhất hết hạn
+        self._revoked_at: TtlLruCache[uuid.UUID, float] = TtlLruCache(
+            max_size=max_revoked_users,
+            ttl_seconds=settings.access_token_ttl_minutes * 60,
+            clock=clock,
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    def encode(self, *, roles: Iterable[str], permissions: Iterable[str]) -> dict[str, Any] | None:
+        """
+        :return: None nếu tắt hoặc có permission ngoài registry (token không nhúng => guards đọc DB)
+        """
+        if not self._enabled:
+            return None
+
+        permission_bits = self._registry.encode(permissions)
+        if permission_bits is None:
+            return None
+
+        return {
+            JwtClaims.ROLES: sorted(set(roles)),
+            JwtClaims.PERMISSION_BITS: permission_bits,
+            JwtClaims.PERMISSION_REGISTRY: self._registry.version,
+            JwtClaims.RBAC_EPOCH: self._rbac_epoch,
+        }
+
+    def principal_from_claims(self, user: CurrentUser, claims: dict[str, Any] | None) -> CurrentUser | None:
+        if not self._enabled or not claims:
+            return None
+
+        if claims.get(JwtClaims.RBAC_EPOCH) != self._rbac_epoch:
+            return None
+        if claims.get(JwtClaims.PERMISSION_REGISTRY) != self._registry.version:
+            return None
+
+        # iat là giây nguyên: token phát hành cùng giây với invalidate => fallback DB (an toàn)
+        issued_at = claims.get(JwtClaims.ISSUED_AT)
+        if not isinstance(issued_at, _NUMERIC) or issued_at <= self._not_before:
+            return None
+        revoked_at = self._revoked_at.get(user.user_id)
+        if revoked_at is not None and issued_at <= revoked_at:
+            return None
+
+        roles = claims.get(JwtClaims.ROLES)
+        permission_bits = claims.get(JwtClaims.PERMISSION_BITS)
+        if not isinstance(roles, list) or not isinstance(permission_bits, str):
+            return None
+        permissions = self._registry.decode(permission_bits)
+        if permissions is None:
+            return None
+
+        return user.model_copy(update={"roles": [str(r) for r in roles], "permissions": set(permissions)})
+
+    # ===== Invalidation hooks (InvalidatableCache) =====
+    def invalidate_user(self, user_id: uuid.UUID) -> None:
+        if not self._enabled:
+            return
+        if len(self._revoked_at) >= self._max_revoked_users:
+            # Không evict revocation (LRU) => mất revoke; chuyển sang invalidate toàn bộ
+            self.invalidate_all()
+            return
+        self._revoked_at.put(user_id, self._clock())
+
+    def invalidate_all(self) -> None:
+        if not self._enabled:
+            return
+        self._not_before = self._clock()
+        self._revoked_at.clear()
+        logger.debug("claims_authz.invalidate_all")
+
+    def invalidate_user_on_commit(self, db: Session, user_id: uuid.UUID) -> None:
+        self.invalidate_user(user_id)
+        if self._enabled:
+            event.listen(db, "after_commit", lambda _s: self.invalidate_user(user_id), once=True)
+
+    def invalidate_all_on_commit(self, db: Session) -> None:
+        self.invalidate_all()
+        if self._enabled:
+            event.listen(db, "after_commit", lambda _s: self.invalidate_all(), once=True)
@@ -0,0 +1,335 @@
+import json
+import logging
+import os
+import re
+import select
+import socket
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Protocol
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+logger = logging.getLogger(__name__)
+
+_PG_CHANNEL_RE = re.compile(r"^[a-z_][a-z0-9_]{0,62}$")
+
+
+@dataclass(frozen=True)
+class AuthzInvalidationEvent:
+    """
+    Event phát đi khi authz state của user thay đổi:
+    - user_id=None => invalidate toàn bộ (vd: đổi role -> permission mapping)
+    - token_version: token_version mới (None nếu không đổi / không biết)
+    """
+    user_id: uuid.UUID | None
+    token_version: int | None = None
+
+    def to_payload(self) -> str:
+        return json.dumps(
+            {
+                "u": str(self.user_id) if self.user_id else None,
+                "tv": self.token_version,
+            },
+            separators=(",", ":"),
+        )
+
+    @classmethod
+    def from_payload(cls, payload: str | bytes) -> AuthzInvalidationEvent:
+        data = json.loads(payload)
+        raw_user_id = data.get("u")
+        raw_tv = data.get("tv")
+        return cls(
+            user_id=uuid.UUID(raw_user_id) if raw_user_id else None,
+            token_version=int(raw_tv) if raw_tv is not None else None,
+        )
+
+
+InvalidationHandler = Callable[[AuthzInvalidationEvent], None]
+
+
+class AuthzInvalidationChannel(ABC):
+    """
+    Pluggable channel để broadcast invalidation giữa các worker process.
+
+    - publish(): gắn vào transaction hiện tại, chỉ phát sau khi commit thành công
+    - subscribe(): đăng ký handler (mỗi worker drop cache local)
+    - start()/stop(): vòng đời listener (gọi từ app lifespan)
+    """
+
+    def __init__(self):
+        self._handlers: list[InvalidationHandler] = []
+
+    def subscribe(self, handler: InvalidationHandler) -> None:
+        if handler not in self._handlers:
+            self._handlers.append(handler)
+
+    def publish(self, db: Session, evt: AuthzInvalidationEvent) -> None:
+        # Default: gửi sau commit (rollback => không phát event sai)
+        event.listen(db, "after_commit", lambda _s: self._safe_send(evt), once=True)
+
+    def start(self) -> None:
+        return None
+
+    def stop(self) -> None:
+        return None
+
+    @abstractmethod
+    def _send(self, evt: AuthzInvalidationEvent) -> None:
+        raise NotImplementedError
+
+    def _safe_send(self, evt: AuthzInvalidationEvent) -> None:
+        try:
+            self._send(evt)
+        except Exception:
+            # Không làm fail request đã commit; cache TTL là lưới an toàn cuối cùng
+            logger.exception("authz_invalidation.publish_failed")
+
+    def _dispatch(self, evt: AuthzInvalidationEvent) -> None:
+        for handler in list(self._handlers):
+            try:
+                handler(evt)
+            except Exception:
+                logger.exception("authz_invalidation.handler_failed")
+
+
+class NoopInvalidationChannel(AuthzInvalidationChannel):
+    """
+    Single-worker deployment: chỉ invalidate cache local, không broadcast
+    """
+
+    def publish(self, db: Session, evt: AuthzInvalidationEvent) -> None:
+        return None
+
+    def _send(self, evt: AuthzInvalidationEvent) -> None:
+        return None
+
+
+class InMemoryInvalidationChannel(AuthzInvalidationChannel):
+    """
+    In-process channel (tests / single process): dispatch trực tiếp cho subscribers
+    """
+
+    def _send(self, evt: AuthzInvalidationEvent) -> None:
+        self._dispatch(evt)
+
+
+class UnixSocketInvalidationChannel(AuthzInvalidationChannel):
+    """
+    Local multi-process channel (tests / 1 host, không cần Postgres):
+    - Mỗi worker bind 1 datagram socket trong socket_dir
+    - publish = gửi datagram tới mọi socket *.sock trong socket_dir (gồm cả chính nó)
+    """
+
+    def __init__(self, socket_dir: str, *, recv_timeout_seconds: float = 0.5):
+        super().__init__()
+        self._dir = Path(socket_dir)
+        self._recv_timeout = recv_timeout_seconds
+        self._path = self._dir / f"authz-{os.getpid()}-{uuid.uuid4().hex[:8]}.sock"
+        self._sock: socket.socket | None = None
+        self._thread: threading.Thread | None = None
+        self._stopping = threading.Event()
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+
+        self._dir.mkdir(parents=True, exist_ok=True)
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        sock.bind(str(self._path))
+        sock.settimeout(self._recv_timeout)
+        self._sock = sock
+
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._recv_loop, name="authz-invalidation-unix", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self._recv_timeout * 2)
+            self._thread = None
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+        self._path.unlink(missing_ok=True)
+
+    def _send(self, evt: AuthzInvalidationEvent) -> None:
+        payload = evt.to_payload().encode("utf-8")
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as out:
+            for peer in self._dir.glob("authz-*.sock"):
+                try:
+                    out.sendto(payload, str(peer))
+                except (ConnectionRefusedError, FileNotFoundError):
+                    # socket của worker đã chết -> bỏ qua
+                    continue
+
+    def _recv_loop(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                data = self._sock.recv(4096) if self._sock else b""
+            except socket.timeout:
+                continue
+            except OSError:
+                if self._stopping.is_set():
+                    return
+                logger.exception("authz_invalidation.unix_recv_failed")
+                continue
+
+            if data:
+                try:
+                    self._dispatch(AuthzInvalidationEvent.from_payload(data))
+                except (ValueError, TypeError):
+                    logger.warning("authz_invalidation.bad_payload")
+
+
+class PostgresNotifyInvalidationChannel(AuthzInvalidationChannel):
+    """
+    Multi-worker / multi-host channel dùng Postgres LISTEN/NOTIFY:
+    - publish: pg_notify() chạy TRONG transaction của request => Postgres chỉ deliver sau COMMIT
+    - listen: 1 connection riêng (autocommit, NullPool) + background thread
+    - Reconnect: sau khi mất kết nối có thể đã miss event => invalidate toàn bộ cache local
+    """
+
+    def __init__(
+            self,
+            database_url: str,
+            *,
+            channel: str = "authz_invalidation",
+            poll_interval_seconds: float = 1.0,
+            reconnect_backoff_seconds: float = 2.0,
+    ):
+        super().__init__()
+        if not _PG_CHANNEL_RE.match(channel):
+            raise ValueError(f">>>>> Invalid Postgres NOTIFY channel name: {channel!r}")
+
+        self._database_url = database_url
+        self._channel = channel
+        self._poll_interval = poll_interval_seconds
+        self._reconnect_backoff = reconnect_backoff_seconds
+        self._thread: threading.Thread | None = None
+        self._stopping = threading.Event()
+
+    def publish(self, db: Session, evt: AuthzInvalidationEvent) -> None:
+        db.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": self._channel, "payload": evt.to_payload()},
+        )
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._listen_loop, name="authz-invalidation-pg", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self._poll_interval * 2)
+            self._thread = None
+
+    def _send(self, evt: AuthzInvalidationEvent) -> None:
+        # publish() đã gửi qua pg_notify trong transaction
+        return None
+
+    def _listen_loop(self) -> None:
+        engine = create_engine(self._database_url, poolclass=NullPool)
+        first_connect = True
+
+        while not self._stopping.is_set():
+            raw = None
+            try:
+                raw = engine.raw_connection()
+                conn = raw.driver_connection
+                conn.autocommit = True
+                with conn.cursor() as cur:
+                    cur.execute(f"LISTEN {self._channel}")
+
+                if not first_connect:
+                    # Có thể đã miss notification trong lúc disconnect
+                    self._dispatch(AuthzInvalidationEvent(user_id=None))
+                first_connect = False
+
+                while not self._stopping.is_set():
+                    readable, _, _ = select.select([conn], [], [], self._poll_interval)
+                    if not readable:
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        notify = conn.notifies.pop(0)
+                        try:
+                            self._dispatch(AuthzInvalidationEvent.from_payload(notify.payload))
+                        except (ValueError, TypeError):
+                            logger.warning("authz_invalidation.bad_payload")
+            except Exception:
+                logger.exception("authz_invalidation.pg_listen_failed")
+                time.sleep(self._reconnect_backoff)
+            finally:
+                if raw is not None:
+                    try:
+                        raw.close()
+                    except Exception:
+                        pass
+
+        engine.dispose()
+
+
+class InvalidatableCache(Protocol):
+    def invalidate_user(self, user_id: uuid.UUID) -> None: ...
+
+    def invalidate_all(self) -> None: ...
+
+    def invalidate_user_on_commit(self, db: Session, user_id: uuid.UUID) -> None: ...
+
+    def invalidate_all_on_commit(self, db: Session) -> None: ...
+
+
+class AuthzInvalidator:
+    """
+    Facade cho services:
+    - Drop cache local (ngay + sau commit)
+    - Broadcast event qua channel để worker khác drop cache của họ
+    - handle(): subscriber nhận event từ channel -> drop cache local
+    """
+
+    def __init__(self, *, caches: list[InvalidatableCache], channel: AuthzInvalidationChannel):
+        self._caches = list(caches)
+        self._channel = channel
+        self._started = False
+
+    def start(self) -> None:
+        if self._started:
+            return
+        self._channel.subscribe(self.handle)
+        self._channel.start()
+        self._started = True
+
+    def stop(self) -> None:
+        if not self._started:
+            return
+        self._channel.stop()
+        self._started = False
+
+    def user_changed(self, db: Session, user_id: uuid.UUID, *, token_version: int | None = None) -> None:
+        for cache in self._caches:
+            cache.invalidate_user_on_commit(db, user_id)
+        self._channel.publish(db, AuthzInvalidationEvent(user_id=user_id, token_version=token_version))
+
+    def all_changed(self, db: Session) -> None:
+        for cache in self._caches:
+            cache.invalidate_all_on_commit(db)
+        self._channel.publish(db, AuthzInvalidationEvent(user_id=None))
+
+    def handle(self, evt: AuthzInvalidationEvent) -> None:
+        for cache in self._caches:
+            if evt.user_id is None:
+                cache.invalidate_all()
+            else:
+                cache.invalidate_user(evt.user_id)
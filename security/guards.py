@@ -1,15 +1,21 @@
 import logging
-from typing import Callable
+import uuid
+from typing import Awaitable, Callable
 
 from fastapi import Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from core.exceptions.auth_exceptions import InvalidTokenException, UserNotFoundOrDisabledException, ForbiddenException
 from core.security.types import TokenType
-from security.dependencies import require_current_user
+from dependencies.providers import get_authz_snapshot_cache, get_claims_authz_policy, get_token_version_cache
+from security.authz_cache import AuthzSnapshotCache, AuthzSnapshot, TokenVersionCache
+from security.authz_claims import ClaimsAuthzPolicy
+from security.dependencies import get_token_claims, require_current_user
 from security.principals import CurrentUser
+from repositories.async_auth_repository import AsyncAuthRepository
 from repositories.auth_repository import AuthRepository
-from dependencies.db import get_db
+from dependencies.db import get_async_db, get_db
 
 logger = logging.getLogger(__name__)
 
@@ -18,22 +24,121 @@ def get_auth_repository() -> AuthRepository:
     return AuthRepository()
 
 
+def get_async_auth_repository() -> AsyncAuthRepository:
+    return AsyncAuthRepository()
+
+
 def require_current_user_verified(
         request: Request,
         db: Session = Depends(get_db),
         user: CurrentUser = Depends(require_current_user),
         auth_repo: AuthRepository = Depends(get_auth_repository),
+        authz_cache: AuthzSnapshotCache = Depends(get_authz_snapshot_cache),
+        claims_authz: ClaimsAuthzPolicy = Depends(get_claims_authz_policy),
 ) -> CurrentUser:
     """
     Verified principal (enterprise):
     - Input: CurrentUser lấy từ claims (require_current_user)
-    - DB snapshot: (roles, permissions, token_version)
+    - JWT_EMBED_AUTHZ: claims có roles/permissions còn hiệu lực (epoch, chưa bị revoke) => không chạm DB
+    - DB snapshot: (roles, permissions, token_version) - read-through AuthzSnapshotCache
     - Verify token_version: claim_tv phải == db_tv
     - Return CurrentUser "fresh" (roles/permissions lấy theo DB)
     """
+    principal = claims_authz.principal_from_claims(user, get_token_claims(request))
+    if principal is not None:
+        return principal
+
+    user_id = _parse_user_id(request, user)
+    claim_tv = int(getattr(user, "token_version", 1))
+
+    # DB snapshot (roles/perms/token_version), cache key = (user_id, claim_tv)
+    snapshot = _load_authz_snapshot(
+        db, user_id=user_id, claim_tv=claim_tv, auth_repo=auth_repo, authz_cache=authz_cache,
+    )
+    return _verified_principal(request, user, user_id=user_id, claim_tv=claim_tv, snapshot=snapshot)
+
+
+async def require_current_user_verified_async(
+        request: Request,
+        db: AsyncSession = Depends(get_async_db),
+        user: CurrentUser = Depends(require_current_user),
+        auth_repo: AsyncAuthRepository = Depends(get_async_auth_repository),
+        authz_cache: AuthzSnapshotCache = Depends(get_authz_snapshot_cache),
+        claims_authz: ClaimsAuthzPolicy = Depends(get_claims_authz_policy),
+) -> CurrentUser:
+    """
+    Async variant của require_current_user_verified (async stack):
+    - Claims authz / cache hit => không chạm DB (AsyncSession chỉ connect khi execute)
+    - Miss => 1 query qua AsyncAuthRepository
+    """
+    principal = claims_authz.principal_from_claims(user, get_token_claims(request))
+    if principal is not None:
+        return principal
+
+    user_id = _parse_user_id(request, user)
+    claim_tv = int(getattr(user, "token_version", 1))
+
+    snapshot = authz_cache.get(user_id, claim_tv)
+    if snapshot is None:
+        roles, permissions, db_token_version = await auth_repo.get_authz_snapshot(db, user_id)
+        snapshot = (tuple(roles), tuple(permissions), int(db_token_version or 0))
+        authz_cache.put(user_id, snapshot)
+
+    return _verified_principal(request, user, user_id=user_id, claim_tv=claim_tv, snapshot=snapshot)
+
+
+def require_current_user_fresh(
+        request: Request,
+        db: Session = Depends(get_db),
+        user: CurrentUser = Depends(require_current_user),
+        auth_repo: AuthRepository = Depends(get_auth_repository),
+        tv_cache: TokenVersionCache = Depends(get_token_version_cache),
+) -> CurrentUser:
+    """
+    Fresh principal (nhẹ hơn require_current_user_verified):
+    - Chỉ verify token_version + user active/chưa xóa (revoke-all, disable user có hiệu lực)
+    - DB: 1 query qua PK (token_version, is_active, is_deleted) - read-through TokenVersionCache
+    - roles/permissions vẫn lấy từ claims => KHÔNG dùng cho route cần check permission
+      (dùng require_permissions / require_roles)
+    """
+    user_id = _parse_user_id(request, user)
+    claim_tv = int(getattr(user, "token_version", 1))
+
+    db_token_version = tv_cache.get(user_id)
+    if db_token_version is None:
+        db_token_version = auth_repo.get_token_version(db, user_id)
+        tv_cache.put(user_id, db_token_version)
+
+    _ensure_token_version(request, user_id=user_id, claim_tv=claim_tv, db_token_version=db_token_version)
+    return user
+
+
+async def require_current_user_fresh_async(
+        request: Request,
+        db: AsyncSession = Depends(get_async_db),
+        user: CurrentUser = Depends(require_current_user),
+        auth_repo: AsyncAuthRepository = Depends(get_async_auth_repository),
+        tv_cache: TokenVersionCache = Depends(get_token_version_cache),
+) -> CurrentUser:
+    """
+    Async variant của require_current_user_fresh
+    """
+    user_id = _parse_user_id(request, user)
+    claim_tv = int(getattr(user, "token_version", 1))
+
+    db_token_version = tv_cache.get(user_id)
+    if db_token_version is None:
+        db_token_version = await auth_repo.get_token_version(db, user_id)
+        tv_cache.put(user_id, db_token_version)
+
+    _ensure_token_version(request, user_id=user_id, claim_tv=claim_tv, db_token_version=db_token_version)
+    return user
+
+
+def _parse_user_id(request: Request, user: CurrentUser) -> uuid.UUID:
     # Parse user_id từ principal (sub)
     try:
-        user_id = user.user_id
+        return user.user_id
     except (TypeError, ValueError):
         logger.warning(
             "auth.invalid_subject",
@@ -46,9 +151,35 @@ def require_current_user_verified(
         # Access token đã decode được nhưng claim sub sai format -> invalid access token
         raise InvalidTokenException(TokenType.ACCESS, reason="invalid_subject")
 
-    # DB snapshot (roles/perms/token_version)
-    roles, permissions, db_token_version = auth_repo.get_authz_snapshot(db, user_id)
 
+def _verified_principal(
+        request: Request,
+        user: CurrentUser,
+        *,
+        user_id: uuid.UUID,
+        claim_tv: int,
+        snapshot: AuthzSnapshot,
+) -> CurrentUser:
+    roles, permissions, db_token_version = snapshot
+    _ensure_token_version(request, user_id=user_id, claim_tv=claim_tv, db_token_version=db_token_version)
+
+    # Return principal fresh theo DB (roles/perms có thể đã thay đổi)
+    return CurrentUser(
+        user_id=user_id,
+        roles=list(roles),
+        permissions=set(permissions),
+        token_version=int(db_token_version),
+        tenant_id=getattr(user, "tenant_id", None),
+    )
+
+
+def _ensure_token_version(
+        request: Request,
+        *,
+        user_id: uuid.UUID,
+        claim_tv: int,
+        db_token_version: int,
+) -> None:
     # user not found/disabled/deleted (repo return token_version=0 để báo invalid)
     if not db_token_version:
         logger.warning(
@@ -62,7 +193,6 @@ def require_current_user_verified(
         raise UserNotFoundOrDisabledException(user_id)
 
     # token_version check (revoke-all)
-    claim_tv = int(getattr(user, "token_version", 1))
     if claim_tv != int(db_token_version):
         # token bị revoke: coi như token invalid
         logger.info(  # đây không phải system error, thường log INFO là đủ (token bị revoke là event hợp lệ)
@@ -77,14 +207,28 @@ def require_current_user_verified(
         )
         raise InvalidTokenException(TokenType.ACCESS, reason="token_revoked")
 
-    # Return principal fresh theo DB (roles/perms có thể đã thay đổi)
-    return CurrentUser(
-        user_id=user_id,
-        roles=list(roles),
-        permissions=set(permissions),
-        token_version=int(db_token_version),
-        tenant_id=getattr(user, "tenant_id", None),
-    )
+
+def _load_authz_snapshot(
+        db: Session,
+        *,
+        user_id: uuid.UUID,
+        claim_tv: int,
+        auth_repo: AuthRepository,
+        authz_cache: AuthzSnapshotCache,
+) -> AuthzSnapshot:
+    """
+    Read-through cache:
+    - Hit: snapshot đã verify với đúng token_version của token -> không query DB
+    - Miss: query DB, chỉ cache khi snapshot hợp lệ (token_version >= 1)
+    """
+    cached = authz_cache.get(user_id, claim_tv)
+    if cached is not None:
+        return cached
+
+    roles, permissions, db_token_version = auth_repo.get_authz_snapshot(db, user_id)
+    snapshot: AuthzSnapshot = (tuple(roles), tuple(permissions), int(db_token_version or 0))
+    authz_cache.put(user_id, snapshot)
+    return snapshot
 
 
 def require_permissions(*required: str) -> Callable[[CurrentUser], CurrentUser]:
@@ -95,13 +239,7 @@ def require_permissions(*required: str) -> Callable[[CurrentUser], CurrentUser]:
     required_set = set(required)
 
     def _dep(user: CurrentUser = Depends(require_current_user_verified)) -> CurrentUser:
-        # Các permission được yêu cầu nhưng user không có
-        # dùng toán tử '-' với set
-        missing = sorted(required_set - user.permissions)
-
-        if missing:
-            raise ForbiddenException(required=missing)
-        return user
+        return _ensure_permissions(user, required_set)
 
     return _dep
 
@@ -114,12 +252,50 @@ def require_roles(*required: str) -> Callable[[CurrentUser], CurrentUser]:
     required_set = set(required)
 
     def _dep(user: CurrentUser = Depends(require_current_user_verified)) -> CurrentUser:
-        user_roles = set(user.roles)
+        return _ensure_roles(user, required_set)
+
+    return _dep
+
 
-        # user phải có ÍT NHẤT 1 role trong required
-        if user_roles.isdisjoint(required_set):
-            raise ForbiddenException(required=[f"role:{r}" for r in sorted(required_set)])
+def require_permissions_async(*required: str) -> Callable[[CurrentUser], Awaitable[CurrentUser]]:
+    """
+    Async variant của require_permissions (dựa trên require_current_user_verified_async)
+    """
+    required_set = set(required)
 
-        return user
+    async def _dep(user: CurrentUser = Depends(require_current_user_verified_async)) -> CurrentUser:
+        return _ensure_permissions(user, required_set)
 
     return _dep
+
+
+def require_roles_async(*required: str) -> Callable[[CurrentUser], Awaitable[CurrentUser]]:
+    """
+    Async variant của require_roles (dựa trên require_current_user_verified_async)
+    """
+    required_set = set(required)
+
+    async def _dep(user: CurrentUser = Depends(require_current_user_verified_async)) -> CurrentUser:
+        return _ensure_roles(user, required_set)
+
+    return _dep
+
+
+def _ensure_permissions(user: CurrentUser, required_set: set[str]) -> CurrentUser:
+    # Các permission được yêu cầu nhưng user không có
+    # dùng toán tử '-' với set
+    missing = sorted(required_set - user.permissions)
+
+    if missing:
+        raise ForbiddenException(required=missing)
+    return user
+
+
+def _ensure_roles(user: CurrentUser, required_set: set[str]) -> CurrentUser:
+    user_roles = set(user.roles)
+
+    # user phải có ÍT NHẤT 1 role trong required
+    if user_roles.isdisjoint(required_set):
+        raise ForbiddenException(required=[f"role:{r}" for r in sorted(required_set)])
+
+    return user
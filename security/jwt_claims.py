@@ -10,3 +10,9 @@ class JwtClaims:
     # ===== Custom / domain =====
     TOKEN_VERSION = "tv" # token_version (revoke-all)
     TENANT_ID = "tid" # multi-tenant
+
+    # ===== Embedded authz (JWT_EMBED_AUTHZ) =====
+    ROLES = "rol"
+    PERMISSION_BITS = "pb" # bitset theo PermissionRegistry (base64url)
+    PERMISSION_REGISTRY = "pr" # version của registry dùng để encode
+    RBAC_EPOCH = "re"
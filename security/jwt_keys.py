@@ -0,0 +1,335 @@
+import base64
+import hashlib
+import hmac
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable
+
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519, padding, rsa
+
+from configs.settings.security import JwtSettings
+
+KEYRING_MANIFEST = "keyring.json"
+
+
+def b64url_encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _int_to_b64url(value: int) -> str:
+    return b64url_encode(value.to_bytes((value.bit_length() + 7) // 8, "big"))
+
+
+class JwtKey(ABC):
+    """
+    Key material đã parse sẵn 1 lần (không decode secret / PEM trên mỗi request).
+
+    Lịch rotate (epoch seconds, None = không giới hạn):
+    - activate_at: từ thời điểm này key được dùng để KÝ (key mới nhất đang active thắng)
+    - retire_at: ngừng ký; vẫn verify + publish JWKS thêm 1 access token TTL
+    """
+    alg: str
+
+    def __init__(self, *, kid: str | None, activate_at: float | None = None, retire_at: float | None = None):
+        self.kid = kid
+        self.activate_at = activate_at
+        self.retire_at = retire_at
+
+    @property
+    @abstractmethod
+    def can_sign(self) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    def sign(self, signing_input: bytes) -> bytes:
+        raise NotImplementedError
+
+    @abstractmethod
+    def verify(self, signing_input: bytes, signature: bytes) -> bool:
+        raise NotImplementedError
+
+    def to_jwk(self) -> dict[str, str] | None:
+        # Symmetric key KHÔNG bao giờ publish
+        return None
+
+    def is_signing_at(self, now: float) -> bool:
+        if not self.can_sign:
+            return False
+        if self.activate_at is not None and now < self.activate_at:
+            return False
+        return self.retire_at is None or now < self.retire_at
+
+    def is_verifiable_at(self, now: float, *, grace_seconds: float) -> bool:
+        # Publish / verify trước cả activate_at: downstream kịp cache JWKS trước token đầu tiên
+        return self.retire_at is None or now < self.retire_at + grace_seconds
+
+
+class HmacJwtKey(JwtKey):
+    alg = "HS256"
+
+    def __init__(self, secret: str, **kwargs: Any):
+        super().__init__(**kwargs)
+        self._secret = secret.encode("utf-8")
+
+    @property
+    def can_sign(self) -> bool:
+        return True
+
+    def sign(self, signing_input: bytes) -> bytes:
+        return hmac.new(self._secret, signing_input, hashlib.sha256).digest()
+
+    def verify(self, signing_input: bytes, signature: bytes) -> bool:
+        return hmac.compare_digest(self.sign(signing_input), signature)
+
+
+class RsaJwtKey(JwtKey):
+    alg = "RS256"
+
+    def __init__(
+            self,
+            *,
+            public_key: rsa.RSAPublicKey,
+            private_key: rsa.RSAPrivateKey | None = None,
+            **kwargs: Any,
+    ):
+        super().__init__(**kwargs)
+        self._public_key = public_key
+        self._private_key = private_key
+
+    @property
+    def can_sign(self) -> bool:
+        return self._private_key is not None
+
+    def sign(self, signing_input: bytes) -> bytes:
+        if self._private_key is None:
+            raise RuntimeError(f">>>>> JWT key {self.kid!r} is verify-only")
+        return self._private_key.sign(signing_input, padding.PKCS1v15(), hashes.SHA256())
+
+    def verify(self, signing_input: bytes, signature: bytes) -> bool:
+        try:
+            self._public_key.verify(signature, signing_input, padding.PKCS1v15(), hashes.SHA256())
+            return True
+        except InvalidSignature:
+            return False
+
+    def to_jwk(self) -> dict[str, str] | None:
+        numbers = self._public_key.public_numbers()
+        return {
+            "kty": "RSA",
+            "use": "sig",
+            "alg": self.alg,
+            "kid": self.kid or "",
+            "n": _int_to_b64url(numbers.n),
+            "e": _int_to_b64url(numbers.e),
+        }
+
+
+class Ed25519JwtKey(JwtKey):
+    alg = "EdDSA"
+
+    def __init__(
+            self,
+            *,
+            public_key: ed25519.Ed25519PublicKey,
+            private_key: ed25519.Ed25519PrivateKey | None = None,
+            **kwargs: Any,
+    ):
+        super().__init__(**kwargs)
+        self._public_key = public_key
+        self._private_key = private_key
+
+    @property
+    def can_sign(self) -> bool:
+        return self._private_key is not None
+
+    def sign(self, signing_input: bytes) -> bytes:
+        if self._private_key is None:
+            raise RuntimeError(f">>>>> JWT key {self.kid!r} is verify-only")
+        return self._private_key.sign(signing_input)
+
+    def verify(self, signing_input: bytes, signature: bytes) -> bool:
+        try:
+            self._public_key.verify(signature, signing_input)
+            return True
+        except InvalidSignature:
+            return False
+
+    def to_jwk(self) -> dict[str, str] | None:
+        raw = self._public_key.public_bytes(
+            encoding=serialization.Encoding.Raw,
+            format=serialization.PublicFormat.Raw,
+        )
+        return {
+            "kty": "OKP",
+            "crv": "Ed25519",
+            "use": "sig",
+            "alg": self.alg,
+            "kid": self.kid or "",
+            "x": b64url_encode(raw),
+        }
+
+
+def load_jwt_key(
+        algorithm: str,
+        material: str,
+        *,
+        kid: str | None,
+        activate_at: float | None = None,
+        retire_at: float | None = None,
+) -> JwtKey:
+    """
+    - HS256: material = shared secret
+    - RS256 / EdDSA: material = PEM (private key => ký + verify, public key => verify-only)
+    """
+    schedule: dict[str, Any] = {"kid": kid, "activate_at": activate_at, "retire_at": retire_at}
+    if algorithm == "HS256":
+        return HmacJwtKey(material, **schedule)
+
+    data = material.encode("utf-8")
+    private_key = serialization.load_pem_private_key(data, password=None) if b"PRIVATE KEY" in data else None
+    public_key = private_key.public_key() if private_key is not None else serialization.load_pem_public_key(data)
+
+    if algorithm == "RS256":
+        if not isinstance(public_key, rsa.RSAPublicKey):
+            raise ValueError(f">>>>> Invalid JWT key {kid!r}: RS256 requires an RSA key")
+        return RsaJwtKey(public_key=public_key, private_key=private_key, **schedule)
+    if algorithm == "EdDSA":
+        if not isinstance(public_key, ed25519.Ed25519PublicKey):
+            raise ValueError(f">>>>> Invalid JWT key {kid!r}: EdDSA requires an Ed25519 key")
+        return Ed25519JwtKey(public_key=public_key, private_key=private_key, **schedule)
+    raise ValueError(f">>>>> Unsupported JWT algorithm: {algorithm}")
+
+
+@dataclass(frozen=True)
+class JwksDocument:
+    body: bytes
+    etag: str
+
+
+class JwtKeyRing:
+    """
+    Tập key ký / verify access token:
+    - signing_key(): key active mới nhất (theo activate_at) => rotate theo lịch, không cần restart
+    - verify_key(kid): mọi key chưa retire quá grace (token ký trước khi retire vẫn hợp lệ tới exp)
+    - jwks(): public keys (RS256 / EdDSA) cho downstream verify local, render + ETag 1 lần / key set
+    """
+
+    def __init__(
+            self,
+            keys: list[JwtKey],
+            *,
+            verify_grace_seconds: float,
+            clock: Callable[[], float] = time.time,
+    ):
+        if not keys:
+            raise ValueError(">>>>> Invalid JWT config: key ring is empty")
+        kids = [k.kid for k in keys]
+        if len(set(kids)) != len(kids):
+            raise ValueError(">>>>> Invalid JWT config: duplicate kid in key ring")
+
+        self._keys = list(keys)
+        self._by_kid: dict[str | None, JwtKey] = {k.kid: k for k in keys}
+        self._grace = verify_grace_seconds
+        self._clock = clock
+
+        self._jwks_lock = threading.Lock()
+        self._jwks_cache: tuple[tuple[str | None, ...], JwksDocument] | None = None
+
+    @property
+    def keys(self) -> list[JwtKey]:
+        return list(self._keys)
+
+    def signing_key(self) -> JwtKey:
+        now = self._clock()
+        active = [k for k in self._keys if k.is_signing_at(now)]
+        if not active:
+            raise RuntimeError(">>>>> No active JWT signing key (check keyring activate_at / retire_at)")
+        return max(active, key=lambda k: k.activate_at or 0.0)
+
+    def verify_key(self, kid: str | None) -> JwtKey | None:
+        key = self._by_kid.get(kid)
+        if key is None or not key.is_verifiable_at(self._clock(), grace_seconds=self._grace):
+            return None
+        return key
+
+    def jwks(self) -> JwksDocument:
+        now = self._clock()
+        published = [k for k in self._keys if k.is_verifiable_at(now, grace_seconds=self._grace) and k.to_jwk()]
+        signature = tuple(k.kid for k in published)
+
+        cached = self._jwks_cache
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        body = json.dumps({"keys": [k.to_jwk() for k in published]}, separators=(",", ":")).encode("utf-8")
+        document = JwksDocument(body=body, etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"')
+        with self._jwks_lock:
+            self._jwks_cache = (signature, document)
+        return document
+
+
+def build_key_ring(settings: JwtSettings) -> JwtKeyRing:
+    """
+    - keys_dir: đọc keyring.json (RS256 / EdDSA, có lịch rotate) - xem scripts/generate_jwt_key.py
+    - Không có keys_dir: secret_key (HS256 secret hoặc PEM) với kid=key_id + previous_keys (verify-only)
+    """
+    grace = settings.access_token_ttl_minutes * 60
+
+    if settings.keys_dir:
+        keys = load_keyring_manifest(settings.keys_dir, default_alg=settings.algorithm)
+        return JwtKeyRing(keys, verify_grace_seconds=grace)
+
+    if settings.secret_key is None:
+        raise ValueError(">>>>> Invalid JWT config: JWT_SECRET_KEY or JWT_KEYS_DIR is required")
+
+    keys = [load_jwt_key(settings.algorithm, settings.secret_key.get_secret_value(), kid=settings.key_id)]
+    # Previous keys: retire_at=0 => không bao giờ ký; grace vô hạn => verify tới khi bị bỏ khỏi JWT_PREVIOUS_KEYS
+    keys += [
+        load_jwt_key(settings.algorithm, material.get_secret_value(), kid=kid, retire_at=0.0)
+        for kid, material in settings.previous_keys.items()
+    ]
+    return JwtKeyRing(keys, verify_grace_seconds=float("inf"))
+
+
+def load_keyring_manifest(keys_dir: str, *, default_alg: str) -> list[JwtKey]:
+    """
+    keyring.json:
+        {"keys": [{"kid": "...", "alg": "EdDSA", "file": "<kid>.pem",
+                   "activate_at": "2026-01-01T00:00:00+00:00", "retire_at": null}]}
+    """
+    base = Path(keys_dir)
+    manifest_path = base / KEYRING_MANIFEST
+    try:
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        raise ValueError(f">>>>> Invalid JWT config: cannot read {manifest_path}: {e}") from e
+
+    keys: list[JwtKey] = []
+    for entry in manifest.get("keys", []):
+        kid = entry.get("kid")
+        if not kid:
+            raise ValueError(f">>>>> Invalid JWT config: keyring entry without kid in {manifest_path}")
+        material = (base / entry.get("file", f"{kid}.pem")).read_text(encoding="utf-8")
+        keys.append(
+            load_jwt_key(
+                entry.get("alg", default_alg),
+                material,
+                kid=kid,
+                activate_at=_parse_timestamp(entry.get("activate_at")),
+                retire_at=_parse_timestamp(entry.get("retire_at")),
+            )
+        )
+    return keys
+
+
+def _parse_timestamp(value: str | None) -> float | None:
+    if not value:
+        return None
+    return datetime.fromisoformat(value).timestamp()
@@ -1,24 +1,49 @@
+import json
 from datetime import datetime, timedelta, timezone
-from typing import Any
-from jose import jwt
-from jose.exceptions import ExpiredSignatureError, JWTError
+from typing import Any, Iterable
 
 from configs.settings.security import JwtSettings
+from security.authz_claims import ClaimsAuthzPolicy
 from security.jwt_claims import JwtClaims
-from core.security.types import TokenError
+from security.jwt_keys import JwtKeyRing, b64url_encode, build_key_ring
+from security.jwt_verifier import JwtVerifier
 
 
 class JwtService:
-    def __init__(self, settings: JwtSettings):
+    def __init__(
+            self,
+            settings: JwtSettings,
+            *,
+            key_ring: JwtKeyRing | None = None,
+            claims_authz: ClaimsAuthzPolicy | None = None,
+    ):
         self._settings = settings
+        self._key_ring = key_ring or build_key_ring(settings)
+        self._claims_authz = claims_authz or ClaimsAuthzPolicy(settings)
+        self._verifier = JwtVerifier(settings, key_ring=self._key_ring)
+
+    @property
+    def key_ring(self) -> JwtKeyRing:
+        return self._key_ring
+
+    @property
+    def embeds_authz(self) -> bool:
+        # True => create_access_token cần roles/permissions (JWT_EMBED_AUTHZ)
+        return self._claims_authz.enabled
 
     def create_access_token(
         self,
         *,
         subject: str,
         token_version: int = 1,
+        roles: Iterable[str] | None = None,
+        permissions: Iterable[str] | None = None,
         extra_claims: dict[str, Any] | None = None,
     ) -> str:
+        """
+        roles / permissions: authz snapshot lúc phát hành, chỉ nhúng khi JWT_EMBED_AUTHZ=true
+        (roles + permission bitset + registry version + RBAC epoch, xem ClaimsAuthzPolicy)
+        """
         now = datetime.now(timezone.utc)
 
         payload: dict[str, Any] = {
@@ -30,30 +55,31 @@ class JwtService:
                 minutes=self._settings.access_token_ttl_minutes)).timestamp()),
             JwtClaims.TOKEN_VERSION: token_version,
         }
+        if roles is not None and permissions is not None:
+            authz_claims = self._claims_authz.encode(roles=roles, permissions=permissions)
+            if authz_claims:
+                payload.update(authz_claims)
         if extra_claims:
             payload.update(extra_claims)
 
-        return jwt.encode(
-            payload,
-            self._settings.secret_key.get_secret_value(),
-            algorithm=self._settings.algorithm,
-        )
+        return self._encode(payload)
 
     def decode_access_token(self, token: str) -> tuple[dict[str, Any] | None, str | None]:
-        try:
-            claims = jwt.decode(
-                token,
-                self._settings.secret_key.get_secret_value(),
-                algorithms=[self._settings.algorithm],
-                audience=self._settings.audience,
-                issuer=self._settings.issuer,
-                options={
-                    "require_aud": True,
-                    "require_iss": True,
-                },
-            )
-            return claims, None
-        except ExpiredSignatureError:
-            return None, TokenError.EXPIRED
-        except JWTError:
-            return None, TokenError.INVALID
+        # Fast path: key prepare sẵn + LRU token đã verify (xem JwtVerifier)
+        return self._verifier.verify(token)
+
+    # ===== Private helpers =====
+    def _encode(self, payload: dict[str, Any]) -> str:
+        # Ký bằng key active hiện tại của key ring (HS256 / RS256 / EdDSA), kid trong header
+        key = self._key_ring.signing_key()
+        header: dict[str, Any] = {"alg": key.alg, "typ": "JWT"}
+        if key.kid:
+            header["kid"] = key.kid
+
+        signing_input = f"{_json_segment(header)}.{_json_segment(payload)}"
+        signature = key.sign(signing_input.encode("ascii"))
+        return f"{signing_input}.{b64url_encode(signature)}"
+
+
+def _json_segment(data: dict[str, Any]) -> str:
+    return b64url_encode(json.dumps(data, separators=(",", ":")).encode("utf-8"))
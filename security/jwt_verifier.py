@@ -0,0 +1,170 @@
+import base64
+import binascii
+import hashlib
+import json
+import re
+import time
+from typing import Any, Callable
+
+from configs.settings.security import JwtSettings
+from core.security.types import TokenError
+from core.utils.ttl_lru_cache import TtlLruCache
+from security.jwt_claims import JwtClaims
+from security.jwt_keys import JwtKey, JwtKeyRing, build_key_ring
+
+# Claims đã verify: cache theo digest của token (không giữ token gốc trong RAM)
+Claims = dict[str, Any]
+
+_NUMERIC = (int, float)
+# base64url không padding (JWS compact serialization)
+_B64URL_SEGMENT = re.compile(r"[A-Za-z0-9_-]*")
+_B64URL_TO_STD = str.maketrans("-_", "+/")
+
+
+class _InvalidToken(Exception):
+    pass
+
+
+class _ExpiredToken(Exception):
+    pass
+
+
+class JwtVerifier:
+    """
+    Fast path verify access token (thay cho jose.jwt.decode trên mỗi request):
+    - Key đã prepare sẵn theo kid (JwtKeyRing: rotation theo lịch / previous keys)
+    - alg phải khớp alg của key (header alg khác => invalid, chống alg confusion / "none")
+    - iss / aud / exp / iat / nbf so với expectation tính sẵn
+    - Token hợp lệ vào LRU (key = blake2b(token)) tới exp => request sau không verify lại chữ ký
+    """
+
+    def __init__(
+            self,
+            settings: JwtSettings,
+            *,
+            key_ring: JwtKeyRing | None = None,
+            leeway_seconds: int = 0,
+            clock: Callable[[], float] = time.time,
+    ):
+        self._key_ring = key_ring or build_key_ring(settings)
+        self._issuer = settings.issuer
+        self._audience = settings.audience
+        self._leeway = leeway_seconds
+        self._clock = clock
+
+        self._cache: TtlLruCache[bytes, Claims] | None = None
+        if settings.verify_cache_max_size > 0:
+            self._cache = TtlLruCache(
+                max_size=settings.verify_cache_max_size,
+                ttl_seconds=settings.access_token_ttl_minutes * 60,
+            )
+
+    @property
+    def cache(self) -> TtlLruCache[bytes, Claims] | None:
+        return self._cache
+
+    def verify(self, token: str) -> tuple[Claims | None, TokenError | None]:
+        digest = hashlib.blake2b(token.encode("utf-8"), digest_size=16).digest()
+        now = self._clock()
+
+        if self._cache is not None:
+            cached = self._cache.get(digest)
+            # exp được check lại: TTL của cache đo bằng monotonic, exp theo wall clock
+            if cached is not None and now < cached[JwtClaims.EXPIRES_AT] + self._leeway:
+                return dict(cached), None
+
+        try:
+            claims = self._verify_uncached(token, now=now)
+        except _ExpiredToken:
+            return None, TokenError.EXPIRED
+        except _InvalidToken:
+            return None, TokenError.INVALID
+
+        if self._cache is not None:
+            self._cache.put(digest, claims, ttl_seconds=claims[JwtClaims.EXPIRES_AT] - now)
+        return dict(claims), None
+
+    # ===== Private helpers =====
+    def _verify_uncached(self, token: str, *, now: float) -> Claims:
+        parts = token.split(".")
+        if len(parts) != 3:
+            raise _InvalidToken()
+        header_b64, payload_b64, signature_b64 = parts
+
+        header = _decode_json_segment(header_b64)
+        key = self._resolve_key(header.get("kid"))
+        if header.get("alg") != key.alg:
+            raise _InvalidToken()
+
+        try:
+            signing_input = f"{header_b64}.{payload_b64}".encode("ascii")
+        except UnicodeEncodeError:
+            raise _InvalidToken()
+        if not key.verify(signing_input, _b64url_decode(signature_b64)):
+            raise _InvalidToken()
+
+        claims = _decode_json_segment(payload_b64)
+        self._validate_claims(claims, now=now)
+        return claims
+
+    def _resolve_key(self, kid: Any) -> JwtKey:
+        if kid is not None and not isinstance(kid, str):
+            raise _InvalidToken()
+        key = self._key_ring.verify_key(kid)
+        if key is None:
+            raise _InvalidToken()
+        return key
+
+    def _validate_claims(self, claims: Claims, *, now: float) -> None:
+        # Thứ tự giống jose: iat -> nbf -> exp -> aud -> iss (token hết hạn luôn => EXPIRED)
+        iat = claims.get(JwtClaims.ISSUED_AT)
+        if iat is not None and not isinstance(iat, _NUMERIC):
+            raise _InvalidToken()
+
+        nbf = claims.get("nbf")
+        if nbf is not None and (not isinstance(nbf, _NUMERIC) or now + self._leeway < nbf):
+            raise _InvalidToken()
+
+        # exp bắt buộc: cache cần biết token sống tới khi nào
+        exp = claims.get(JwtClaims.EXPIRES_AT)
+        if not isinstance(exp, _NUMERIC) or isinstance(exp, bool):
+            raise _InvalidToken()
+        if now >= exp + self._leeway:
+            raise _ExpiredToken()
+
+        aud = claims.get(JwtClaims.AUDIENCE)
+        if isinstance(aud, str):
+            if aud != self._audience:
+                raise _InvalidToken()
+        elif not (isinstance(aud, list) and self._audience in aud):
+            raise _InvalidToken()
+
+        if claims.get(JwtClaims.ISSUER) != self._issuer:
+            raise _InvalidToken()
+
+
+def _b64url_decode(segment: str) -> bytes:
+    """
+    Chỉ nhận base64url canonical, không padding (RFC 7515): 1 chuỗi duy nhất cho mỗi dãy bytes
+    => token viết khác nhau (ký tự lạ, '=', bit thừa ở ký tự cuối) không thể chung bytes đã verify
+    nhưng khác cache key
+    """
+    if not _B64URL_SEGMENT.fullmatch(segment):
+        raise _InvalidToken()
+    try:
+        data = binascii.a2b_base64(segment.translate(_B64URL_TO_STD) + "=" * (-len(segment) % 4), strict_mode=True)
+    except (binascii.Error, ValueError):
+        raise _InvalidToken()
+    if base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii") != segment:
+        raise _InvalidToken()
+    return data
+
+
+def _decode_json_segment(segment: str) -> Claims:
+    try:
+        data = json.loads(_b64url_decode(segment))
+    except (ValueError, UnicodeDecodeError):
+        raise _InvalidToken()
+    if not isinstance(data, dict):
+        raise _InvalidToken()
+    return data
@@ -0,0 +1,149 @@
+import hashlib
+import logging
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from typing import Callable
+
+from configs.settings.security import LoginRateLimitSettings
+from core.exceptions.auth_exceptions import LoginRateLimitedException
+
+logger = logging.getLogger(__name__)
+
+
+class LoginAttemptStore(ABC):
+    """
+    Pluggable store cho sliding window (in-memory / Redis / ... dùng chung giữa các worker).
+    Timestamp do limiter truyền vào (clock của limiter) => store không tự đọc giờ.
+    """
+
+    @abstractmethod
+    def window(self, key: str, *, window_seconds: float, now: float) -> tuple[int, float]:
+        """
+        :return: (số attempt trong window, số giây tới khi attempt cũ nhất hết hạn)
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def add(self, key: str, *, now: float) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def reset(self, key: str) -> None:
+        raise NotImplementedError
+
+
+class InMemoryLoginAttemptStore(LoginAttemptStore):
+    """
+    Sliding window log trong process (thread-safe):
+    - Mỗi key giữ deque timestamp, prune lazy khi đọc
+    - LRU theo key (max_keys) => attacker xoay vòng IP/email không làm phình RAM
+    """
+
+    def __init__(self, *, max_keys: int):
+        if max_keys <= 0:
+            raise ValueError(">>>>> max_keys must be > 0")
+        self._max_keys = max_keys
+        self._data: OrderedDict[str, deque[float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def window(self, key: str, *, window_seconds: float, now: float) -> tuple[int, float]:
+        with self._lock:
+            hits = self._data.get(key)
+            if not hits:
+                return 0, 0.0
+
+            cutoff = now - window_seconds
+            while hits and hits[0] <= cutoff:
+                hits.popleft()
+            if not hits:
+                del self._data[key]
+                return 0, 0.0
+
+            return len(hits), hits[0] + window_seconds - now
+
+    def add(self, key: str, *, now: float) -> None:
+        with self._lock:
+            hits = self._data.get(key)
+            if hits is None:
+                hits = deque()
+                self._data[key] = hits
+            else:
+                self._data.move_to_end(key)
+            hits.append(now)
+
+            while len(self._data) > self._max_keys:
+                self._data.popitem(last=False)
+
+    def reset(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+
+class LoginRateLimiter:
+    """
+    Giới hạn login attempt TRƯỚC khi chạm DB / argon2 (credential stuffing):
+    - check(): mọi attempt tính vào window của IP; email đã quá số lần sai => 429
+    - record_failure(): attempt sai tính vào window của email
+    - record_success(): reset window của email
+
+    Email không lưu plaintext: key = sha256(email đã normalize).
+    """
+
+    def __init__(
+            self,
+            settings: LoginRateLimitSettings,
+            *,
+            store: LoginAttemptStore | None = None,
+            clock: Callable[[], float] = time.monotonic,
+    ):
+        self.settings = settings
+        self.store = store or InMemoryLoginAttemptStore(max_keys=settings.max_keys)
+        self._clock = clock
+
+    def check(self, *, ip: str | None, email: str) -> None:
+        if not self.settings.enabled:
+            return
+
+        now = self._clock()
+        if ip:
+            ip_key = self._ip_key(ip)
+            self._ensure_below(ip_key, limit=self.settings.max_attempts_per_ip, scope="ip", now=now)
+            self.store.add(ip_key, now=now)
+
+        self._ensure_below(
+            self._email_key(email),
+            limit=self.settings.max_failures_per_email,
+            scope="email",
+            now=now,
+        )
+
+    def record_failure(self, *, email: str) -> None:
+        if not self.settings.enabled:
+            return
+        self.store.add(self._email_key(email), now=self._clock())
+
+    def record_success(self, *, email: str) -> None:
+        if not self.settings.enabled:
+            return
+        self.store.reset(self._email_key(email))
+
+    # ===== Private helpers =====
+    def _ensure_below(self, key: str, *, limit: int, scope: str, now: float) -> None:
+        count, retry_after = self.store.window(key, window_seconds=self.settings.window_seconds, now=now)
+        if count < limit:
+            return
+
+        logger.warning("auth.login_rate_limited", extra={"scope": scope})
+        raise LoginRateLimitedException(scope=scope, retry_after_seconds=max(1, math.ceil(retry_after)))
+
+    @staticmethod
+    def _ip_key(ip: str) -> str:
+        return f"ip:{ip}"
+
+    @staticmethod
+    def _email_key(email: str) -> str:
+        digest = hashlib.sha256(email.strip().lower().encode("utf-8")).hexdigest()
+        return f"email:{digest}"
@@ -1,21 +1,42 @@
 from passlib.context import CryptContext
 
-_pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
 
+def build_password_context(
+        *,
+        time_cost: int | None = None,
+        memory_cost_kib: int | None = None,
+        parallelism: int | None = None,
+) -> CryptContext:
+    """
+    argon2id context với cost params tùy chọn (None => default của passlib / argon2-cffi).
+    Hash có params khác context hiện tại => needs_update() = True.
+    """
+    options: dict[str, int] = {}
+    if time_cost is not None:
+        options["argon2__time_cost"] = time_cost
+    if memory_cost_kib is not None:
+        options["argon2__memory_cost"] = memory_cost_kib
+    if parallelism is not None:
+        options["argon2__parallelism"] = parallelism
+    return CryptContext(schemes=["argon2"], deprecated="auto", **options)
 
-def hash_password(plain_password: str) -> str:
+
+_pwd_context = build_password_context()
+
+
+def hash_password(plain_password: str, *, context: CryptContext | None = None) -> str:
     if not plain_password or plain_password.strip() == "":
         raise ValueError(">>>>> Password must not be empty")  # Tầng service sẽ xử lý
-    return _pwd_context.hash(plain_password)
+    return (context or _pwd_context).hash(plain_password)
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+def verify_password(plain_password: str, hashed_password: str, *, context: CryptContext | None = None) -> bool:
     if not plain_password or not hashed_password:
         return False
-    return _pwd_context.verify(plain_password, hashed_password)
+    return (context or _pwd_context).verify(plain_password, hashed_password)
 
 
-def needs_rehash(hashed_password: str) -> bool:
+def needs_rehash(hashed_password: str, *, context: CryptContext | None = None) -> bool:
     if not hashed_password:
         return False
-    return _pwd_context.needs_update(hashed_password)
+    return (context or _pwd_context).needs_update(hashed_password)
@@ -0,0 +1,238 @@
+import logging
+import secrets
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from dataclasses import asdict, dataclass
+from functools import partial
+from typing import Callable, Sequence, TypeVar
+
+from configs.settings.security import PasswordHashingSettings
+from core.exceptions.auth_exceptions import PasswordHashingBusyException
+from security.password import build_password_context, hash_password, needs_rehash, verify_password
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass
+class PasswordHashingMetrics:
+    submitted: int = 0
+    completed: int = 0
+    # load-shedding: executor đầy (admission) hoặc chờ quá wait_timeout
+    rejected: int = 0
+    timed_out: int = 0
+    # rehash-on-login chạy nền (bị bỏ qua khi pool bận => thử lại ở lần login sau)
+    background_submitted: int = 0
+    background_skipped: int = 0
+    in_flight: int = 0
+    queue_wait_ms_total: float = 0.0
+    queue_wait_ms_max: float = 0.0
+    hash_ms_total: float = 0.0
+    hash_ms_max: float = 0.0
+
+
+class PasswordHasherPool:
+    """
+    Bounded executor cho argon2 hash/verify:
+    - Tách khỏi threadpool của request => login burst không chiếm hết slot của endpoint khác
+    - argon2-cffi nhả GIL khi hash => thread pool chạy song song thật trên nhiều core
+    - Admission: tối đa max_concurrency đang chạy + queue_max_size đang chờ, vượt => 429 ngay
+    - Metrics: thời gian chờ queue + thời gian hash (ms)
+    - Argon2 cost params lấy từ settings.argon2 (profile / explicit)
+    """
+
+    def __init__(self, settings: PasswordHashingSettings):
+        self.settings = settings
+        self.metrics = PasswordHashingMetrics()
+
+        argon2 = settings.argon2
+        self._context = build_password_context(
+            time_cost=argon2.time_cost,
+            memory_cost_kib=argon2.memory_cost_kib,
+            parallelism=argon2.parallelism,
+        )
+
+        self._slots = threading.BoundedSemaphore(settings.max_concurrency + settings.queue_max_size)
+        self._metrics_lock = threading.Lock()
+        self._executor_lock = threading.Lock()
+        self._executor: ThreadPoolExecutor | None = None
+        self._dummy_hash: str | None = None
+
+    # ===== Public API =====
+    def hash(self, plain_password: str) -> str:
+        return self._run(partial(hash_password, context=self._context), plain_password)
+
+    def hash_many(self, plain_passwords: Sequence[str], *, max_in_flight: int | None = None) -> list[str]:
+        """
+        Hash nhiều password song song trên cùng executor (bulk provisioning), giữ thứ tự input:
+        - Tối đa max_in_flight task cùng lúc (mặc định max_concurrency) => phần queue còn lại
+          vẫn dành cho login / create_user đơn lẻ
+        - Chờ slot quá wait_timeout_seconds => PasswordHashingBusyException (hủy các task chưa chạy)
+        """
+        window = threading.BoundedSemaphore(max(1, max_in_flight or self.settings.max_concurrency))
+        fn = partial(hash_password, context=self._context)
+        futures: list[Future[str]] = []
+
+        def on_done(_f: Future[str]) -> None:
+            self._release_slot()
+            window.release()
+
+        try:
+            for plain_password in plain_passwords:
+                # Task của chính batch luôn kết thúc => chờ window không cần timeout
+                window.acquire()
+                if not self._slots.acquire(timeout=self.settings.wait_timeout_seconds):
+                    window.release()
+                    self._incr_rejected()
+                    logger.warning("password_hashing.rejected", extra={"reason": "bulk_wait_timeout"})
+                    raise PasswordHashingBusyException()
+
+                enqueued_at = time.perf_counter()
+                with self._metrics_lock:
+                    self.metrics.submitted += 1
+                    self.metrics.in_flight += 1
+
+                try:
+                    future: Future[str] = self._get_executor().submit(self._timed, fn, enqueued_at, plain_password)
+                except BaseException:
+                    self._release_slot()
+                    window.release()
+                    raise
+                future.add_done_callback(on_done)
+                futures.append(future)
+
+            return [f.result() for f in futures]
+        except BaseException:
+            for f in futures:
+                f.cancel()
+            raise
+
+    def verify(self, plain_password: str, hashed_password: str) -> bool:
+        if not plain_password or not hashed_password:
+            return False
+        return self._run(partial(verify_password, context=self._context), plain_password, hashed_password)
+
+    def verify_dummy(self, plain_password: str) -> bool:
+        """
+        Verify với hash giả cùng argon2 params hiện tại (email không tồn tại):
+        cùng chi phí / latency với verify thật => không lộ email có tồn tại hay không qua timing.
+        """
+        return self._run(self._verify_dummy_sync, plain_password or "x")
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        # Chỉ parse params trong hash string, không tốn CPU => không qua executor
+        return needs_rehash(hashed_password, context=self._context)
+
+    def hash_in_background(self, plain_password: str, on_hashed: Callable[[str], None]) -> bool:
+        """
+        Fire-and-forget: hash rồi gọi on_hashed(new_hash) trên worker thread.
+        Pool đang bận => bỏ qua (return False), không bao giờ làm chậm / 429 request hiện tại.
+        """
+        if not self._slots.acquire(blocking=False):
+            with self._metrics_lock:
+                self.metrics.background_skipped += 1
+            return False
+
+        with self._metrics_lock:
+            self.metrics.background_submitted += 1
+            self.metrics.in_flight += 1
+
+        enqueued_at = time.perf_counter()
+
+        def task() -> None:
+            new_hash = self._timed(partial(hash_password, context=self._context), enqueued_at, plain_password)
+            on_hashed(new_hash)
+
+        try:
+            future = self._get_executor().submit(task)
+        except BaseException:
+            self._release_slot()
+            raise
+        future.add_done_callback(self._on_background_done)
+        return True
+
+    def stop(self) -> None:
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+        logger.info("password_hashing.stopped", extra={"metrics": asdict(self.metrics)})
+
+    # ===== Internal =====
+    def _run(self, fn: Callable[..., T], *args: str) -> T:
+        if not self._slots.acquire(blocking=False):
+            self._incr_rejected()
+            logger.warning("password_hashing.rejected", extra={"reason": "saturated"})
+            raise PasswordHashingBusyException()
+
+        enqueued_at = time.perf_counter()
+        with self._metrics_lock:
+            self.metrics.submitted += 1
+            self.metrics.in_flight += 1
+
+        try:
+            future: Future[T] = self._get_executor().submit(self._timed, fn, enqueued_at, *args)
+        except BaseException:
+            self._release_slot()
+            raise
+        # Slot chỉ trả lại khi task xong/hủy => timeout không làm vượt max_concurrency
+        future.add_done_callback(lambda _f: self._release_slot())
+
+        try:
+            return future.result(timeout=self.settings.wait_timeout_seconds)
+        except FutureTimeoutError:
+            future.cancel()
+            with self._metrics_lock:
+                self.metrics.timed_out += 1
+            logger.warning("password_hashing.rejected", extra={"reason": "wait_timeout"})
+            raise PasswordHashingBusyException()
+
+    def _verify_dummy_sync(self, plain_password: str) -> bool:
+        if self._dummy_hash is None:
+            # Race giữa 2 thread chỉ tốn thêm 1 hash, kết quả tương đương
+            self._dummy_hash = hash_password(secrets.token_urlsafe(16), context=self._context)
+        verify_password(plain_password, self._dummy_hash, context=self._context)
+        return False
+
+    def _on_background_done(self, future: Future[None]) -> None:
+        self._release_slot()
+        if not future.cancelled() and future.exception() is not None:
+            logger.error("password_hashing.background_failed", exc_info=future.exception())
+
+    def _release_slot(self) -> None:
+        with self._metrics_lock:
+            self.metrics.in_flight -= 1
+        self._slots.release()
+
+    def _timed(self, fn: Callable[..., T], enqueued_at: float, *args: str) -> T:
+        started_at = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            finished_at = time.perf_counter()
+            wait_ms = (started_at - enqueued_at) * 1000.0
+            hash_ms = (finished_at - started_at) * 1000.0
+            with self._metrics_lock:
+                self.metrics.completed += 1
+                self.metrics.queue_wait_ms_total += wait_ms
+                self.metrics.queue_wait_ms_max = max(self.metrics.queue_wait_ms_max, wait_ms)
+                self.metrics.hash_ms_total += hash_ms
+                self.metrics.hash_ms_max = max(self.metrics.hash_ms_max, hash_ms)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        executor = self._executor
+        if executor is not None:
+            return executor
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.settings.max_concurrency,
+                    thread_name_prefix="password-hasher",
+                )
+            return self._executor
+
+    def _incr_rejected(self) -> None:
+        with self._metrics_lock:
+            self.metrics.rejected += 1
@@ -40,7 +40,7 @@ class CurrentUser(BaseModel):
         return cls(
             user_id=user_uuid,
 
-            # always empty for access token
+            # always empty: roles/permissions chỉ tin sau khi verify (guards: DB snapshot / ClaimsAuthzPolicy)
             roles=[],
             permissions=set(),
 
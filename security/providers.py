@@ -1,11 +1,18 @@
 from functools import lru_cache
 
+from configs.database import SessionLocal
 from configs.env import settings_config
-from dependencies.providers import get_audit_log_service
+from dependencies.providers import (
+    get_audit_log_service,
+    get_authz_invalidator,
+    get_claims_authz_policy,
+    get_password_hasher,
+)
 from repositories.auth_repository import AuthRepository
 from repositories.refresh_session_repository import RefreshSessionRepository
 from security.cookie_policy import RefreshCookiePolicy
 from security.jwt_service import JwtService
+from security.login_rate_limiter import LoginRateLimiter
 from services.auth_service import AuthService
 
 
@@ -18,7 +25,7 @@ def get_refresh_cookie_policy() -> RefreshCookiePolicy:
 @lru_cache
 def get_jwt_service() -> JwtService:
     settings = settings_config()
-    return JwtService(settings.security.jwt)
+    return JwtService(settings.security.jwt, claims_authz=get_claims_authz_policy())
 
 
 @lru_cache
@@ -33,6 +40,13 @@ def get_refresh_session_repository() -> RefreshSessionRepository:
     return RefreshSessionRepository()
 
 
+@lru_cache
+def get_login_rate_limiter() -> LoginRateLimiter:
+    # Singleton: giữ sliding window in-memory của process
+    settings = settings_config()
+    return LoginRateLimiter(settings.security.login_rate_limit)
+
+
 @lru_cache
 def get_auth_service() -> AuthService:
     settings = settings_config()
@@ -43,4 +57,8 @@ def get_auth_service() -> AuthService:
         security_settings=settings.security,
         jwt_service=get_jwt_service(),
         audit_log_service=get_audit_log_service(),
+        authz_invalidator=get_authz_invalidator(),
+        password_hasher=get_password_hasher(),
+        session_factory=SessionLocal,
+        login_limiter=get_login_rate_limiter(),
     )
@@ -0,0 +1,47 @@
+import uuid
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.exceptions.user_exception import UserNotFoundException
+from core.http.pagination import PageMeta
+from models.user import User
+from repositories.async_user_repository import AsyncUserRepository
+from schemas.request.user_schema import UserSearchParams
+
+
+class AsyncUserService:
+    """
+    Async read paths của UserService (opt-in: DB_ASYNC_ENABLED=true).
+    Write paths (create/update/delete: audit, argon2, authz invalidation) vẫn dùng UserService (sync).
+    """
+
+    def __init__(self, user_repo: AsyncUserRepository | None = None):
+        self.user_repo = user_repo or AsyncUserRepository()
+
+    # ========= READ =========
+    async def get_user_or_404(self, db: AsyncSession, *, user_id: uuid.UUID) -> User:
+        user = await self.user_repo.get_alive_by_id(db, user_id)
+        if not user:
+            raise UserNotFoundException(user_id=user_id)
+        return user
+
+    async def get_user_by_email(self, db: AsyncSession, *, email: str) -> User:
+        user = await self.user_repo.get_by_email(db, email=str(email).strip().lower())
+        if not user:
+            raise UserNotFoundException()
+        return user
+
+    async def search_users(
+            self, db: AsyncSession, *, params: UserSearchParams
+    ) -> tuple[list[User], int | None, PageMeta]:
+        """
+        Async variant của UserService.search_users
+
+        :return: tuple[items, total, meta]
+        """
+        return await self.user_repo.search(db, params=params)
+
+    async def list_users(
+            self, db: AsyncSession, *, offset: int = 0, limit: int = 100
+    ) -> list[User]:
+        return list(await self.user_repo.list_active(db, offset=offset, limit=limit))
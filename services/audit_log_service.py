@@ -1,18 +1,31 @@
 import uuid
-from typing import Any, Mapping
+from dataclasses import dataclass
+from typing import Any, Mapping, Sequence
 
 from sqlalchemy.orm import Session
 
 from core.audit.audit_actions import AuditAction
 from core.audit.audit_mode import AuditMode
+from core.audit.audit_writer import AuditRow, AuditWriter, ImmediateAuditWriter
+from core.http.export import ExportRows
 from core.utils.json_utils import to_json_safe
 from models.audit_log import AuditLog
 from repositories.audit_log_repository import AuditLogRepository
-from schemas.request.audit_log_schema import AuditLogSearchParams
+from schemas.request.audit_log_schema import AuditLogExportParams, AuditLogSearchParams
 from schemas.response.audit_log_out_schema import AuditLogOut, AuditLogListOut
 from security.sensitive_fields import SENSITIVE_FIELDS, MASK_ALL
 
 
+@dataclass(frozen=True)
+class AuditTarget:
+    """
+    1 entity trong audit batch (log_events): id + snapshot before/after (chưa sanitize)
+    """
+    entity_id: str
+    before: Mapping[str, Any] | None = None
+    after: Mapping[str, Any] | None = None
+
+
 class AuditLogService:
     """
     Enterprise audit log service (append-only).
@@ -30,6 +43,7 @@ class AuditLogService:
             AuditAction.AUTH_LOGIN_FAILED,
             AuditAction.AUTH_LOGOUT,
             AuditAction.AUTH_REFRESH_FAILED,
+            AuditAction.AUTH_REFRESH_TOKEN_REUSE,
             AuditAction.AUTH_REVOKE_ALL_SESSIONS,
             # NOTE: "Ko log refresh success" => do not include AUTH_ROTATE_REFRESH
 
@@ -54,9 +68,11 @@ class AuditLogService:
             audit_log_repo: AuditLogRepository | None = None,
             *,
             audit_mode: AuditMode = AuditMode.ON,
+            audit_writer: AuditWriter | None = None,
     ):
         self.repo = audit_log_repo or AuditLogRepository()
         self.audit_mode = audit_mode
+        self.audit_writer = audit_writer or ImmediateAuditWriter(self.repo)
 
     # ======= Write (append-only) =======
     def log_event(
@@ -81,26 +97,68 @@ class AuditLogService:
 
         Notes:
         - before/after are sanitized + normalized to JSON-safe structures.
+        - Returns None when the configured writer defers the insert (buffered / background).
         """
         if not self._should_log(action):
             return None
 
-        event = AuditLog(
+        row = self._build_row(
+            action=action,
+            entity_type=entity_type,
+            entity_id=entity_id,
             actor_user_id=actor_user_id,
-            action=action.value.strip(),
-            entity_type=str(entity_type).strip(),
-            entity_id=str(entity_id).strip(),
-            request_id=(str(request_id).strip() if request_id else None),
-            trace_id=(str(trace_id).strip() if trace_id else None),
+            request_id=request_id,
+            trace_id=trace_id,
             ip=ip,
             user_agent=user_agent,
-            before=self._sanitize_payload(before) if before is not None else None,
-            after=self._sanitize_payload(after) if after is not None else None,
-            message=(str(message) if message else None),
+            before=before,
+            after=after,
+            message=message,
         )
 
-        # append-only insert
-        return self.repo.create_event(db, event=event)
+        # append-only insert (immediate / buffered / background)
+        return self.audit_writer.write(db, row)
+
+    def log_events(
+            self,
+            db: Session,
+            *,
+            action: AuditAction,
+            entity_type: str,
+            targets: Sequence[AuditTarget],
+            actor_user_id: uuid.UUID | None = None,
+            request_id: str | None = None,
+            trace_id: str | None = None,
+            ip: str | None = None,
+            user_agent: str | None = None,
+            message: str | None = None,
+    ) -> int:
+        """
+        Batch variant of log_event: same action / request context for many entities
+        (bulk operations) => 1 writer call (multi-row INSERT) instead of 1 insert per entity.
+
+        :return: number of events handed to the writer (0 when filtered by audit mode)
+        """
+        if not targets or not self._should_log(action):
+            return 0
+
+        rows = [
+            self._build_row(
+                action=action,
+                entity_type=entity_type,
+                entity_id=t.entity_id,
+                actor_user_id=actor_user_id,
+                request_id=request_id,
+                trace_id=trace_id,
+                ip=ip,
+                user_agent=user_agent,
+                before=t.before,
+                after=t.after,
+                message=message,
+            )
+            for t in targets
+        ]
+        return self.audit_writer.write_many(db, rows)
 
     # Convenience helper when having ORM entity objects
     def log_entity_event(
@@ -163,9 +221,47 @@ class AuditLogService:
             total=total,
             page=meta.page,
             page_size=meta.page_size,
+            total_mode=meta.total_mode,
+            has_next=meta.has_next,
+            next_cursor=meta.next_cursor,
         )
 
+    def export(self, db: Session, *, params: AuditLogExportParams) -> ExportRows:
+        """
+        Stream audit logs by AuditLogExportParams (rows are read lazily while the response streams)
+        """
+        return self.repo.export(db, params=params)
+
     # ======= Internal helpers =======
+    def _build_row(
+            self,
+            *,
+            action: AuditAction,
+            entity_type: str,
+            entity_id: str,
+            actor_user_id: uuid.UUID | None,
+            request_id: str | None,
+            trace_id: str | None,
+            ip: str | None,
+            user_agent: str | None,
+            before: Mapping[str, Any] | None,
+            after: Mapping[str, Any] | None,
+            message: str | None,
+    ) -> AuditRow:
+        return dict(
+            actor_user_id=actor_user_id,
+            action=action.value.strip(),
+            entity_type=str(entity_type).strip(),
+            entity_id=str(entity_id).strip(),
+            request_id=(str(request_id).strip() if request_id else None),
+            trace_id=(str(trace_id).strip() if trace_id else None),
+            ip=ip,
+            user_agent=user_agent,
+            before=self._sanitize_payload(before) if before is not None else None,
+            after=self._sanitize_payload(after) if after is not None else None,
+            message=(str(message) if message else None),
+        )
+
     def _should_log(self, action: AuditAction) -> bool:
         if self.audit_mode == AuditMode.OFF:
             return False
@@ -1,10 +1,11 @@
+import logging
 import uuid
 from dataclasses import dataclass
 from datetime import timedelta
 from typing import Any
 
 from fastapi import Request, Response
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, sessionmaker
 
 from configs.settings.security import SecuritySettings
 from core.audit.audit_actions import AuditAction
@@ -17,13 +18,17 @@ from core.exceptions.auth_exceptions import (
 from core.security.types import TokenType
 from core.utils.datetime_utils import utcnow
 from repositories.auth_repository import AuthRepository
-from repositories.refresh_session_repository import RefreshSessionRepository
+from repositories.refresh_session_repository import RefreshSessionRepository, ReusedTokenFamily
+from security.authz_invalidation import AuthzInvalidator
 from security.cookie_policy import RefreshCookiePolicy
 from security.jwt_service import JwtService
-from security.password import verify_password
+from security.login_rate_limiter import LoginRateLimiter
+from security.password_hasher import PasswordHasherPool
 from security.refresh_token import generate_refresh_token, hash_refresh_token
 from services.audit_log_service import AuditLogService
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass(frozen=True)
 class TokenPairOut:
@@ -55,6 +60,10 @@ class AuthService:
             security_settings: SecuritySettings,
             jwt_service: JwtService,
             audit_log_service: AuditLogService,
+            authz_invalidator: AuthzInvalidator,
+            password_hasher: PasswordHasherPool,
+            session_factory: sessionmaker,
+            login_limiter: LoginRateLimiter,
     ):
         self.auth_repo = auth_repo
         self.refresh_repo = refresh_repo
@@ -62,10 +71,16 @@ class AuthService:
         self.security_settings = security_settings
         self.jwt_service = jwt_service
         self.audit_log_service = audit_log_service
+        self.authz_invalidator = authz_invalidator
+        self.password_hasher = password_hasher
+        # Session riêng cho background job (rehash-on-login), không dính transaction của request
+        self.session_factory = session_factory
+        self.login_limiter = login_limiter
 
         self._access_ttl_minutes = int(self.security_settings.jwt.access_token_ttl_minutes)
         self._refresh_ttl_minutes = int(self.security_settings.refresh_session.ttl_minutes)
         self._refresh_absolute_ttl_minutes = int(self.security_settings.refresh_session.absolute_ttl_minutes)
+        self._refresh_reuse_history_size = int(self.security_settings.refresh_session.reuse_history_size)
 
     def login(
             self,
@@ -79,15 +94,20 @@ class AuthService:
     ) -> TokenPairOut:
         """
         Execute:
+        - Rate limit by IP / email (before DB + argon2)
         - Load user credentials by email
-        - Verify password
+        - Verify password (dummy verify for unknown email => same latency)
         - Load authz snapshot (roles, permissions, token_version)
         - Issue access token (JWT)
         - Issue refresh token (opaque) + store hashed session + set cookie
         """
+        self.login_limiter.check(ip=ctx.ip, email=email)
+
         user = self.auth_repo.get_user_credentials_by_email(db, email)
 
         if not user:
+            self.password_hasher.verify_dummy(password)
+            self.login_limiter.record_failure(email=email)
             self._audit_login_failed(db, ctx=ctx, reason="invalid_credentials")
             raise InvalidTokenException(TokenType.ACCESS, reason="invalid_credentials")
 
@@ -95,22 +115,32 @@ class AuthService:
             self._audit_login_failed(db, ctx=ctx, reason="user_disabled")
             raise UserNotFoundOrDisabledException(getattr(user, "id", None))
 
-        if not verify_password(password, getattr(user, "hashed_password", "")):
+        # argon2 verify chạy trong hashing pool (bounded, 429 khi quá tải)
+        hashed_password = getattr(user, "hashed_password", "")
+        if not self.password_hasher.verify(password, hashed_password):
+            self.login_limiter.record_failure(email=email)
             self._audit_login_failed(db, ctx=ctx, reason="invalid_credentials")
             raise InvalidTokenException(TokenType.ACCESS, reason="invalid_credentials")
 
+        self.login_limiter.record_success(email=email)
+
         user_id = getattr(user, "id")
 
-        _, _, token_version = self.auth_repo.get_authz_snapshot(db, user_id)
+        roles, permissions, token_version = self.auth_repo.get_authz_snapshot(db, user_id)
         if not token_version:
             # user not found/disabled snapshot
             self._audit_login_failed(db, ctx=ctx, reason="user_disabled")
             raise UserNotFoundOrDisabledException(user_id)
 
+        # Hash dùng argon2 params cũ => upgrade nền, không chặn login
+        self._schedule_rehash(user_id=user_id, password=password, old_hash=hashed_password)
+
         # Issue access token
         access_token = self.jwt_service.create_access_token(
             subject=str(user_id),
             token_version=int(token_version),
+            roles=roles,
+            permissions=permissions,
         )
 
         # Issue refresh token (opaque) + store hash in DB
@@ -167,8 +197,9 @@ class AuthService:
         """
         Execute:
         - Read refresh token from cookie
-        - Hash -> rotate refresh session
-        - Load authz snapshot (roles, permissions, token_version)
+        - Hash -> rotate refresh session + read token_version (1 statement)
+        - Rotate fail + hash nằm trong ring token cũ của 1 session => reuse => revoke cả family
+        - JWT_EMBED_AUTHZ: load authz snapshot (roles, permissions)
         - Issue new access token
         - Set new refresh cookie (rotated)
         """
@@ -186,30 +217,47 @@ class AuthService:
         now = utcnow()
         new_expires_at = now + timedelta(minutes=self._refresh_ttl_minutes)
 
-        session = self.refresh_repo.rotate_session(
+        rotated = self.refresh_repo.rotate_session(
             db,
             old_token_hash=old_hash,
             new_token_hash=new_hash,
             new_expires_at=new_expires_at,
+            history_size=self._refresh_reuse_history_size,
             now=now,
         )
-        if not session:
+        if not rotated:
+            # Token đã rotate bị dùng lại => revoke cả family (chỉ tốn thêm query ở path thất bại)
+            if self._refresh_reuse_history_size > 0:
+                family = self.refresh_repo.revoke_family_by_reused_hash(db, token_hash=old_hash, now=now)
+                if family is not None:
+                    self._audit_refresh_reuse(db, ctx=ctx, family=family)
+                    raise InvalidTokenException(TokenType.REFRESH, reason="refresh_token_reused")
+
             # revoked/expired/unknown
             self._audit_refresh_failed(db, ctx=ctx, reason="session_not_active")
             raise InvalidTokenException(TokenType.REFRESH, reason="session_not_active")
 
-        user_id = getattr(session, "user_id")
-
-        # Load latest authz snapshot (roles/permissions can change)
-        _, _, token_version = self.auth_repo.get_authz_snapshot(db, user_id)
+        user_id = rotated.user_id
+        token_version = rotated.token_version
         if not token_version:
             self._audit_refresh_failed(db, ctx=ctx, reason="user_disabled")
             raise UserNotFoundOrDisabledException(user_id)
 
+        # Roles/permissions chỉ cần khi nhúng vào access token
+        roles: list[str] | None = None
+        permissions: list[str] | None = None
+        if self.jwt_service.embeds_authz:
+            roles, permissions, token_version = self.auth_repo.get_authz_snapshot(db, user_id)
+            if not token_version:
+                self._audit_refresh_failed(db, ctx=ctx, reason="user_disabled")
+                raise UserNotFoundOrDisabledException(user_id)
+
         # Issue new access token (latest token_version)
         access_token = self.jwt_service.create_access_token(
             subject=str(user_id),
             token_version=int(token_version),
+            roles=roles,
+            permissions=permissions,
         )
 
         # Set rotated refresh cookie
@@ -287,11 +335,15 @@ class AuthService:
         Logout all devices:
         - Revoke all refresh sessions for user
         - Clear cookie
+        - Invalidate cached authz snapshot
         - Return number of revoked sessions
         """
         count = self.refresh_repo.revoke_all_for_user(db, user_id=user_id)
         self.cookie_policy.clear(response)
 
+        # Force re-verify authz từ DB cho request kế tiếp
+        self.authz_invalidator.user_changed(db, user_id)
+
         actor_user_id = ctx.current_user.user_id if ctx.current_user else None
 
         self.audit_log_service.log_event(
@@ -306,6 +358,26 @@ class AuthService:
 
         return int(count)
 
+    # ===== Password rehash =====
+    def _schedule_rehash(self, *, user_id: uuid.UUID, password: str, old_hash: str) -> None:
+        if not self.security_settings.password_hashing.argon2.rehash_on_login:
+            return
+        if not self.password_hasher.needs_rehash(old_hash):
+            return
+
+        def persist(new_hash: str) -> None:
+            with self.session_factory() as db:
+                updated = self.auth_repo.update_password_hash_if_unchanged(
+                    db, user_id=user_id, old_hash=old_hash, new_hash=new_hash,
+                )
+                db.commit()
+            logger.info(
+                "auth.password_rehashed" if updated else "auth.password_rehash_skipped",
+                extra={"user_id": str(user_id)},
+            )
+
+        self.password_hasher.hash_in_background(password, persist)
+
     # ===== Audit helpers =====
     def _audit_ctx_kwargs(self, ctx: RequestContext) -> dict[str, Any]:
         return {
@@ -329,6 +401,24 @@ class AuthService:
             **self._audit_ctx_kwargs(ctx),
         )
 
+    def _audit_refresh_reuse(self, db: Session, *, ctx: RequestContext, family: ReusedTokenFamily) -> None:
+        """
+        Security event: refresh token đã rotate bị dùng lại => family bị revoke
+        """
+        logger.warning(
+            "auth.refresh_token_reuse",
+            extra={"session_id": family.session_id, "user_id": family.user_id, "ip": ctx.ip},
+        )
+        self.audit_log_service.log_event(
+            db,
+            action=AuditAction.AUTH_REFRESH_TOKEN_REUSE,
+            entity_type="RefreshSession",
+            entity_id=str(family.session_id),
+            actor_user_id=None,
+            after={"status": "family_revoked", "user_id": str(family.user_id)},
+            **self._audit_ctx_kwargs(ctx),
+        )
+
     def _audit_refresh_failed(self, db: Session, *, ctx: RequestContext, reason: str) -> None:
         """
         Policy: do NOT log refresh success. Only log refresh failures.
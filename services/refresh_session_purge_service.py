@@ -0,0 +1,92 @@
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable
+
+from sqlalchemy.orm import sessionmaker
+
+from core.utils.datetime_utils import utcnow
+from repositories.refresh_session_repository import RefreshSessionRepository
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PurgeMetrics:
+    """
+    Tiến độ purge (cập nhật sau mỗi batch, truyền cho on_batch)
+    """
+    batches: int = 0
+    deleted: int = 0
+    last_batch_deleted: int = 0
+    last_batch_ms: float = 0.0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.deleted / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+
+class RefreshSessionPurgeService:
+    """
+    Job dọn refresh session hết hạn theo batch:
+    - Mỗi batch 1 transaction riêng (DELETE tối đa batch_size row + COMMIT) => lock ngắn, RAM không phụ thuộc số row
+    - Dừng khi batch cuối < batch_size hoặc đạt max_batches
+    - pause_seconds giữa các batch: giảm áp lực WAL / replication lag
+    """
+
+    def __init__(self, *, refresh_repo: RefreshSessionRepository, session_factory: sessionmaker):
+        self.refresh_repo = refresh_repo
+        self.session_factory = session_factory
+
+    def purge_expired(
+            self,
+            *,
+            before: datetime | None = None,
+            batch_size: int = 1000,
+            max_batches: int | None = None,
+            pause_seconds: float = 0.0,
+            on_batch: Callable[[PurgeMetrics], None] | None = None,
+    ) -> PurgeMetrics:
+        if batch_size <= 0:
+            raise ValueError(">>>>> batch_size must be > 0")
+
+        # Cố định mốc thời gian cho cả job (session hết hạn trong lúc chạy để lần sau)
+        before = before or utcnow()
+        metrics = PurgeMetrics()
+        started = time.perf_counter()
+
+        while max_batches is None or metrics.batches < max_batches:
+            batch_started = time.perf_counter()
+            with self.session_factory() as db:
+                deleted = self.refresh_repo.delete_expired_batch(db, before=before, batch_size=batch_size)
+                db.commit()
+
+            metrics.batches += 1
+            metrics.deleted += deleted
+            metrics.last_batch_deleted = deleted
+            metrics.last_batch_ms = (time.perf_counter() - batch_started) * 1000.0
+            metrics.elapsed_seconds = time.perf_counter() - started
+
+            logger.debug(
+                "refresh_session.purge.batch",
+                extra={"batch": metrics.batches, "deleted": deleted, "batch_ms": round(metrics.last_batch_ms, 1)},
+            )
+            if on_batch is not None:
+                on_batch(metrics)
+
+            if deleted < batch_size:
+                break
+            if pause_seconds > 0:
+                time.sleep(pause_seconds)
+
+        logger.info(
+            "refresh_session.purge.done",
+            extra={
+                "batches": metrics.batches,
+                "deleted": metrics.deleted,
+                "elapsed_seconds": round(metrics.elapsed_seconds, 3),
+            },
+        )
+        return metrics
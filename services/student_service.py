@@ -1,16 +1,55 @@
-from typing import Sequence
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Any, Callable, Iterable
+
+from pydantic import TypeAdapter, ValidationError
 from sqlalchemy.orm import Session
 
+from core.exceptions.base import BusinessException
 from core.exceptions.student_exception import StudentNotFoundException, InvalidStudentSearchAgeRangeException, \
-    StudentEmailAlreadyExistsException, InvalidStudentAgeException
+    StudentEmailAlreadyExistsException, InvalidStudentAgeException, InvalidStudentImportFileException
+from core.http.export import ExportRows
+from core.http.pagination import PageMeta
+from core.utils.record_readers import RecordFormat, RecordFormatError, SourceRecord, detect_format, iter_records
 from models.student import Student
 from repositories.student_repository import StudentRepository
-from schemas.request.student_schema import StudentCreate, StudentUpdate
+from schemas.request.student_schema import StudentCreate, StudentExportParams, StudentFilterParams, StudentSearchParams, \
+    StudentUpdate
+from schemas.response.student_out_schema import StudentImportOut, StudentImportRowError
 
 import logging
 
 logger = logging.getLogger(__name__)
 
+IMPORT_BATCH_SIZE = 1000
+# Giới hạn số row lỗi trả về trong report (failed vẫn đếm đủ)
+MAX_IMPORT_ERRORS = 1000
+
+_STUDENT_BATCH = TypeAdapter(list[StudentCreate])
+_REQUIRED_IMPORT_COLUMNS = tuple(name for name, f in StudentCreate.model_fields.items() if f.is_required())
+
+
+@dataclass
+class StudentImportReport:
+    """
+    Tiến độ / kết quả import (cập nhật sau mỗi batch, truyền cho on_batch)
+    """
+    dry_run: bool = False
+    max_errors: int = MAX_IMPORT_ERRORS
+    batches: int = 0
+    total_rows: int = 0
+    inserted: int = 0
+    failed: int = 0
+    errors: list[StudentImportRowError] = field(default_factory=list)
+    errors_truncated: bool = False
+
+    def add_error(self, *, line: int, error_code: str, message: str, email: str | None = None) -> None:
+        self.failed += 1
+        if len(self.errors) >= self.max_errors:
+            self.errors_truncated = True
+            return
+        self.errors.append(StudentImportRowError(line=line, email=email, error_code=error_code, message=message))
+
 
 class StudentService:
 
@@ -24,33 +63,19 @@ class StudentService:
             raise StudentNotFoundException(student_id)
         return student
 
-    def list_students(
-            self, db: Session, offset: int = 0, limit: int = 100
-    ) -> Sequence[Student]:
-        return self.repo.list(db, offset=offset, limit=limit)
-
     def search_students(
-            self,
-            db: Session,
-            *,
-            keyword: str | None = None,
-            min_age: int | None = None,
-            max_age: int | None = None,
-            offset: int = 0,
-            limit: int = 100,
-    ) -> list[Student]:
-        # Rule nghiệp vụ đơn giản: min_age không được lớn hơn max_age
-        if min_age is not None and max_age is not None and min_age > max_age:
-            raise InvalidStudentSearchAgeRangeException(min_age, max_age)
+            self, db: Session, *, params: StudentSearchParams
+    ) -> tuple[list[Student], int | None, PageMeta]:
+        """
+        :return: tuple[items, total, meta]
+        """
+        self._ensure_valid_age_range(params)
+        return self.repo.search(db, params=params)
 
-        return self.repo.search(
-            db,
-            keyword=keyword,
-            min_age=min_age,
-            max_age=max_age,
-            offset=offset,
-            limit=limit,
-        )
+    def export_students(self, db: Session, *, params: StudentExportParams) -> ExportRows:
+        # Validate trước khi stream (sau khi gửi header không trả 400 được nữa)
+        self._ensure_valid_age_range(params)
+        return self.repo.export(db, params=params)
 
     # -------- WRITE --------
     def create_student(self, db: Session, data: StudentCreate) -> Student:
@@ -66,6 +91,66 @@ class StudentService:
         student = Student(**data.model_dump())
         return self.repo.create(db, student)
 
+    def import_students(
+            self,
+            db: Session,
+            lines: Iterable[bytes],
+            *,
+            fmt: RecordFormat | None = None,
+            filename: str | None = None,
+            content_type: str | None = None,
+            dry_run: bool = False,
+            batch_size: int = IMPORT_BATCH_SIZE,
+            on_batch: Callable[[StudentImportReport], None] | None = None,
+    ) -> StudentImportOut:
+        """
+        Bulk import CSV (header: full_name,age,email) / NDJSON, streaming theo batch:
+        - validate cả batch bằng 1 lần TypeAdapter(list[StudentCreate]) (thay vì model_validate từng row)
+        - rule nghiệp vụ như create_student: age >= 18, email unique (trong file + trong DB)
+        - email đã tồn tại: 1 query set-based / batch
+        - insert: multi-row INSERT ... ON CONFLICT (email) DO NOTHING RETURNING email
+        - row lỗi không chặn row hợp lệ => report lỗi theo dòng
+
+        Lỗi cấp file (format không xác định, CSV thiếu cột) raise trước khi insert bất kỳ row nào
+        """
+        if batch_size <= 0:
+            raise ValueError(">>>>> batch_size must be > 0")
+
+        fmt = fmt or detect_format(filename, content_type)
+        if fmt is None:
+            raise InvalidStudentImportFileException("unknown format (use .csv / .ndjson or format=csv|ndjson)")
+
+        records = iter(iter_records(lines, fmt=fmt, required_columns=_REQUIRED_IMPORT_COLUMNS))
+        report = StudentImportReport(dry_run=dry_run)
+        # Email đã gặp ở các batch trước (trùng trong file => chỉ row đầu tiên được insert)
+        seen_emails: set[str] = set()
+
+        while True:
+            try:
+                batch = list(islice(records, batch_size))
+            except RecordFormatError as ex:
+                raise InvalidStudentImportFileException(str(ex)) from ex
+            if not batch:
+                break
+
+            self._import_batch(db, batch, report=report, seen_emails=seen_emails)
+            report.batches += 1
+            if on_batch is not None:
+                on_batch(report)
+
+        # Trong 1 batch lỗi được ghi theo từng bước kiểm tra => sắp lại theo dòng trong file
+        report.errors.sort(key=lambda e: e.line)
+        logger.info(
+            "student.import.done",
+            extra={
+                "rows": report.total_rows,
+                "inserted": report.inserted,
+                "failed": report.failed,
+                "dry_run": dry_run,
+            },
+        )
+        return StudentImportOut.model_validate(report)
+
     # PATCH
     def update_student(self, db: Session, student_id: int, data: StudentUpdate) -> Student:
         student = self.get_student(db, student_id)
@@ -82,3 +167,110 @@ class StudentService:
     def delete_student(self, db: Session, student_id: int) -> None:
         student = self.get_student(db, student_id)
         self.repo.delete(db, student)
+
+    # -------- Internal helpers --------
+    @staticmethod
+    def _ensure_valid_age_range(params: StudentFilterParams) -> None:
+        # Rule nghiệp vụ đơn giản: min_age không được lớn hơn max_age
+        min_age, max_age = params.min_age, params.max_age
+        if min_age is not None and max_age is not None and min_age > max_age:
+            raise InvalidStudentSearchAgeRangeException(min_age, max_age)
+
+    def _import_batch(
+            self,
+            db: Session,
+            batch: list[SourceRecord],
+            *,
+            report: StudentImportReport,
+            seen_emails: set[str],
+    ) -> None:
+        report.total_rows += len(batch)
+
+        parsed: list[SourceRecord] = []
+        for record in batch:
+            if record.data is None:
+                report.add_error(line=record.line, error_code="INVALID_ROW", message=record.error or "invalid row")
+            else:
+                parsed.append(record)
+
+        # email -> (line, row) của các row hợp lệ, chưa kiểm tra DB (giữ thứ tự file)
+        candidates: dict[str, tuple[int, dict[str, Any]]] = {}
+        for line, data in self._validate_batch(parsed, report=report):
+            email = str(data.email)
+
+            # Rule nghiệp vụ: tuổi hợp lệ
+            if data.age < 18:
+                _add_business_error(report, line=line, email=email, ex=InvalidStudentAgeException(data.age))
+                continue
+
+            if email in seen_emails:
+                report.add_error(
+                    line=line,
+                    email=email,
+                    error_code="DUPLICATE_EMAIL_IN_FILE",
+                    message="Email appears earlier in the file",
+                )
+                continue
+            seen_emails.add(email)
+            candidates[email] = (line, data.model_dump())
+
+        # Rule nghiệp vụ: email unique - 1 query cho cả batch
+        for email in self.repo.existing_emails(db, candidates.keys()):
+            line, _ = candidates.pop(email)
+            _add_business_error(report, line=line, email=email, ex=StudentEmailAlreadyExistsException(email))
+
+        if report.dry_run:
+            report.inserted += len(candidates)
+            return
+
+        inserted = self.repo.insert_many_skip_existing(db, [row for _, row in candidates.values()])
+        report.inserted += len(inserted)
+
+        # Bị request khác insert giữa existing_emails và INSERT (ON CONFLICT DO NOTHING)
+        for email, (line, _) in candidates.items():
+            if email not in inserted:
+                _add_business_error(report, line=line, email=email, ex=StudentEmailAlreadyExistsException(email))
+
+    @staticmethod
+    def _validate_batch(
+            records: list[SourceRecord], *, report: StudentImportReport
+    ) -> list[tuple[int, StudentCreate]]:
+        """
+        Validate cả batch trong 1 lần gọi pydantic-core; có row lỗi => ghi report
+        và validate lại phần còn lại (tối đa 2 lần / batch)
+
+        :return: list[(line, StudentCreate)] của các row hợp lệ
+        """
+        if not records:
+            return []
+
+        payload = [r.data for r in records]
+        try:
+            return [(r.line, data) for r, data in zip(records, _STUDENT_BATCH.validate_python(payload))]
+        except ValidationError as ex:
+            messages: dict[int, list[str]] = {}
+            for err in ex.errors(include_url=False, include_input=False):
+                index, *loc = err["loc"]
+                messages.setdefault(int(index), []).append(
+                    f"{'.'.join(str(x) for x in loc)}: {err['msg']}" if loc else err["msg"]
+                )
+
+        for index, msgs in messages.items():
+            data = records[index].data or {}
+            email = data.get("email")
+            report.add_error(
+                line=records[index].line,
+                email=email if isinstance(email, str) else None,
+                error_code="INVALID_ROW",
+                message="; ".join(msgs),
+            )
+
+        valid = [r for i, r in enumerate(records) if i not in messages]
+        if not valid:
+            return []
+        return [(r.line, data) for r, data in zip(valid, _STUDENT_BATCH.validate_python([r.data for r in valid]))]
+
+
+def _add_business_error(report: StudentImportReport, *, line: int, email: str, ex: BusinessException) -> None:
+    # Dùng lại error_code / message của exception nghiệp vụ tương ứng với create_student
+    report.add_error(line=line, email=email, error_code=ex.error_code, message=ex.message)
@@ -1,3 +1,4 @@
+import logging
 import uuid
 from typing import Any
 
@@ -5,20 +6,29 @@ from sqlalchemy.orm import Session
 
 from core.audit.audit_actions import AuditAction
 from core.audit.diff.user_audit_diff import diff_user_for_audit
-from core.audit.snapshots.user_snapshot import snapshot_user
+from core.audit.snapshots.user_snapshot import snapshot_user, snapshot_user_values
 from core.context.request_context import RequestContext
+from core.exceptions.base import BusinessException
+from core.http.export import ExportRows
 from models.user import User
 from repositories.refresh_session_repository import RefreshSessionRepository
 from repositories.user_repository import UserRepository
-from schemas.request.user_schema import UserCreate, UserUpdate, UserSearchParams
+from schemas.request.user_schema import UserBatchCreate, UserBatchItem, UserCreate, UserExportParams, UserUpdate, \
+    UserSearchParams
+from schemas.response.user_out_schema import UserBatchCreatedOut, UserBatchItemError, UserBatchOut
 from core.exceptions.user_exception import (
     UserNotFoundException,
     UserEmailAlreadyExistsException,
     UserDeleteSelfForbiddenException,
     UserUpdateSelfForbiddenException,
+    RoleNotFoundException,
 )
-from security.password import hash_password
-from services.audit_log_service import AuditLogService
+from configs.settings.security import PasswordHashingSettings
+from security.authz_invalidation import AuthzInvalidator, NoopInvalidationChannel
+from security.password_hasher import PasswordHasherPool
+from services.audit_log_service import AuditLogService, AuditTarget
+
+logger = logging.getLogger(__name__)
 
 
 class UserService:
@@ -28,10 +38,14 @@ class UserService:
             user_repo: UserRepository | None = None,
             refresh_session_repo: RefreshSessionRepository | None = None,
             audit_log_service: AuditLogService | None = None,
+            authz_invalidator: AuthzInvalidator | None = None,
+            password_hasher: PasswordHasherPool | None = None,
     ):
         self.user_repo = user_repo or UserRepository()
         self.refresh_session_repo = refresh_session_repo or RefreshSessionRepository()
         self.audit_log_service = audit_log_service or AuditLogService()
+        self.authz_invalidator = authz_invalidator or AuthzInvalidator(caches=[], channel=NoopInvalidationChannel())
+        self.password_hasher = password_hasher or PasswordHasherPool(PasswordHashingSettings())
 
     # ========= CREATE =========
     def create_user(
@@ -42,7 +56,7 @@ class UserService:
         if existing is not None:
             raise UserEmailAlreadyExistsException(email=email)
 
-        password_hash = hash_password(data.password)
+        password_hash = self.password_hasher.hash(data.password)
         actor_user_id = self._actor_user_id(ctx)
 
         user = User(
@@ -71,6 +85,119 @@ class UserService:
 
         return created
 
+    def create_users_batch(
+            self, db: Session, *, data: UserBatchCreate, ctx: RequestContext,
+    ) -> UserBatchOut:
+        """
+        Bulk provisioning (POST /users:batch) - cùng rule với create_user nhưng set-based:
+        - email trùng trong request / đã tồn tại: 1 query cho cả batch
+        - role theo tên: 1 query
+        - hash password song song trên PasswordHasherPool (chỉ các item hợp lệ)
+        - INSERT users, user_roles, audit events: mỗi loại 1 multi-row INSERT (không hydrate ORM)
+        - item lỗi không chặn item hợp lệ => errors theo index
+
+        Pool hash quá tải => PasswordHashingBusyException (429) trước khi ghi bất kỳ row nào
+        """
+        actor_user_id = self._actor_user_id(ctx)
+        errors: list[UserBatchItemError] = []
+
+        # email -> (index, item) của item chưa lỗi (giữ thứ tự request)
+        candidates: dict[str, tuple[int, UserBatchItem]] = {}
+        for index, item in enumerate(data.items):
+            email = str(item.email).strip().lower()
+            if email in candidates:
+                errors.append(UserBatchItemError(
+                    index=index,
+                    email=email,
+                    error_code="DUPLICATE_EMAIL_IN_REQUEST",
+                    message="Email appears earlier in the request",
+                ))
+                continue
+            candidates[email] = (index, item)
+
+        # Rule nghiệp vụ: email unique - 1 query cho cả batch
+        for email in self.user_repo.existing_emails(db, candidates.keys()):
+            index, _ = candidates.pop(email)
+            _add_batch_error(errors, index=index, email=email, ex=UserEmailAlreadyExistsException(email=email))
+
+        role_ids = self.user_repo.role_ids_by_name(
+            db, {role for _, item in candidates.values() for role in item.roles},
+        )
+        for email, (index, item) in list(candidates.items()):
+            missing = [role for role in item.roles if role not in role_ids]
+            if missing:
+                del candidates[email]
+                _add_batch_error(errors, index=index, email=email, ex=RoleNotFoundException(roles=missing))
+
+        # Hash sau cùng: không tốn argon2 cho item đã lỗi
+        hashes = self.password_hasher.hash_many([item.password for _, item in candidates.values()])
+        rows = [
+            dict(
+                email=email,
+                hashed_password=password_hash,
+                is_active=bool(item.is_active),
+                created_by=actor_user_id,
+                updated_by=actor_user_id,
+            )
+            for (email, (_, item)), password_hash in zip(candidates.items(), hashes)
+        ]
+        inserted = self.user_repo.insert_many_skip_existing(db, rows)
+
+        created: list[UserBatchCreatedOut] = []
+        assignments: list[dict[str, Any]] = []
+        create_targets: list[AuditTarget] = []
+        assign_targets: list[AuditTarget] = []
+        for row, (email, (index, item)) in zip(rows, candidates.items()):
+            returned = inserted.get(email)
+            if returned is None:
+                # Bị request khác insert giữa existing_emails và INSERT (ON CONFLICT DO NOTHING)
+                _add_batch_error(errors, index=index, email=email, ex=UserEmailAlreadyExistsException(email=email))
+                continue
+
+            user_id = returned["id"]
+            created.append(UserBatchCreatedOut(index=index, roles=item.roles, **returned))
+            assignments.extend({"user_id": user_id, "role_id": role_ids[role]} for role in item.roles)
+
+            create_targets.append(AuditTarget(
+                entity_id=str(user_id),
+                after={**snapshot_user_values({**row, **returned}), "roles": item.roles},
+            ))
+            if item.roles:
+                assign_targets.append(AuditTarget(
+                    entity_id=str(user_id), before={"roles": []}, after={"roles": item.roles},
+                ))
+
+        self.user_repo.insert_role_assignments(db, assignments)
+
+        # Audit log (append-only): 1 batch / action
+        audit_context = dict(
+            entity_type=User.__name__,
+            actor_user_id=actor_user_id,
+            request_id=getattr(ctx, "request_id", None),
+            trace_id=getattr(ctx, "trace_id", None),
+            ip=getattr(ctx, "ip", None),
+            user_agent=getattr(ctx, "user_agent", None),
+        )
+        self.audit_log_service.log_events(
+            db, action=AuditAction.USER_CREATE, targets=create_targets, **audit_context,
+        )
+        self.audit_log_service.log_events(
+            db, action=AuditAction.ROLE_ASSIGN, targets=assign_targets, **audit_context,
+        )
+
+        errors.sort(key=lambda e: e.index)
+        logger.info(
+            "user.batch_create.done",
+            extra={"total": len(data.items), "inserted": len(created), "failed": len(errors)},
+        )
+        return UserBatchOut(
+            total=len(data.items),
+            created=len(created),
+            failed=len(errors),
+            items=created,
+            errors=errors,
+        )
+
     # ========= READ =========
     def get_user_or_404(self, db: Session, *, user_id: uuid.UUID) -> User:
         user = self.user_repo.get_alive_by_id(db, user_id)
@@ -106,6 +233,10 @@ class UserService:
         """
         return self.user_repo.search(db, params=params)
 
+    def export_users(self, db: Session, *, params: UserExportParams) -> ExportRows:
+        # Lazy: chỉ query khi StreamingResponse bắt đầu đọc rows
+        return self.user_repo.export(db, params=params)
+
     def list_users(
             self, db: Session, *, offset: int = 0, limit: int = 100
     ) -> list[User]:
@@ -163,6 +294,10 @@ class UserService:
         updated = self.user_repo.update(db, user, update_data)
         after = snapshot_user(updated)
 
+        # is_active/token_version có thể đã đổi -> drop authz snapshot đang cache (mọi worker)
+        # token_version chỉ có trong update_data khi _force_logout_all đã bump
+        self.authz_invalidator.user_changed(db, user_id, token_version=update_data.get("token_version"))
+
         diff = diff_user_for_audit(
             before=before,
             after=after,
@@ -228,6 +363,9 @@ class UserService:
             db.refresh(user)
             after = snapshot_user(user)
 
+        new_token_version = None if hard_delete else int(getattr(user, "token_version", 1))
+        self.authz_invalidator.user_changed(db, user_id, token_version=new_token_version)
+
         self.audit_log_service.log_entity_event(
             db,
             action=AuditAction.USER_DELETE,
@@ -316,7 +454,7 @@ class UserService:
         if not isinstance(new_password, str):
             raise TypeError("password must be a string")
 
-        hashed = hash_password(new_password)
+        hashed = self.password_hasher.hash(new_password)
         if not hashed:
             raise RuntimeError("Password hashing failed")
 
@@ -331,3 +469,8 @@ class UserService:
     ) -> None:
         self._bump_token_version(user=user, update_data=update_data)
         self._revoke_all_refresh_sessions(db, user_id=user.id)
+
+
+def _add_batch_error(errors: list[UserBatchItemError], *, index: int, email: str, ex: BusinessException) -> None:
+    # Dùng lại error_code / message của exception nghiệp vụ tương ứng với create_user
+    errors.append(UserBatchItemError(index=index, email=email, error_code=ex.error_code, message=ex.message))